@@ -12,29 +12,39 @@ written to a google sheet.
         scheduler -m
  """
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+import json
 import logging
 import os
 import sys, getopt
+import time
 
 from scheduler.classes.Configuration import Configuration
+from scheduler.classes.FairnessLedger import FairnessLedger
+from scheduler.classes.MemberTable import MemberTable
+from scheduler.classes.RunContext import RunContext
+from scheduler.classes.RunStore import RunStore
+from scheduler.classes.RunMetrics import RunMetrics
 from scheduler.gform_backend import (
-    members_from_sheet,
+    get_sheet_revision,
+    member_table_from_sheet,
     write_to_sheet,
     delete_spreadsheet,
     list_spreadsheets,
 )
-from scheduler.generate_rides import generate_rides
+from scheduler.generate_rides import generate_rides, count_schedule
+import scheduler.batch as batch
+import scheduler.file_backend as file_backend
+import scheduler.incremental as incremental
+import scheduler.log as log
+import scheduler.snapshot as snapshot
 from scheduler.util import get_version
 
 from scheduler.classes.Rider import Rider
 from scheduler.classes.Driver import Driver
 import scheduler.classes.Day as Day
 
-logging.basicConfig(filename="climbing_carpools.log",
-                    filemode="w",
-                    format="%(name)s - %(levelname)s - %(message)s",
-                    level=logging.DEBUG)
-
 logger = logging.getLogger(__name__)
 
 
@@ -43,24 +53,244 @@ def get_members() -> (list, list):
     
     This function is an abstraction that allows this function to be agnostic of the backend that
     the member data is stored in / collected from (JSON, google forms/ sheets, etc).
+    The backend is selected with the mcc.backend configuration setting.
 
     Returns:
         (riders list, drivers list)
         Returns a tuple of lists- the first containing Rider objects, and the second containing driver objects.
     """
 
-    return members_from_sheet()
+    table = get_member_table()
 
+    return table.riders(), table.drivers()
+
+
+def get_member_table() -> MemberTable:
+    """ Gets the members from the configured backend, or from the snapshot file.
+
+    When mcc.snapshot_file is set, the members are loaded from it as long as the
+    backend's sources and the configuration they are parsed with have not
+    changed since it was saved. Otherwise they are read from the backend and the
+    snapshot is saved again.
+
+    Returns:
+        MemberTable with a row for every rider and every driver
+    """
+
+    backend = get_backend()
+    snapshot_file = Configuration.config("mcc").get("snapshot_file", "")
+
+    if not snapshot_file:
+        return read_member_table(backend)
+
+    metrics = RunMetrics.get_instance()
+
+    with metrics.phase("snapshot"):
+        if backend == "file":
+            source_revision = file_backend.get_file_revision()
+        else:
+            source_revision = get_sheet_revision()
+
+        revision = snapshot.get_revision(
+            backend, source_revision, Configuration.config("mcc.days_enabled"),
+            Configuration.config("gform_backend.columns"),
+            Configuration.config("locations"))
+
+        table = snapshot.load_snapshot(snapshot_file, revision)
+
+    if table is not None:
+        metrics.count("snapshot_hits", 1)
+        return table
+
+    table = read_member_table(backend)
+
+    with metrics.phase("snapshot"):
+        snapshot.save_snapshot(snapshot_file, table, revision)
+
+    return table
+
+
+def read_member_table(backend: str) -> MemberTable:
+    """ Reads and parses the members from a backend, "gform" or "file".
+    """
+
+    if backend == "file":
+        return file_backend.member_table_from_files()
+
+    return member_table_from_sheet()
+
+
+def get_backend() -> str:
+    """ Returns the configured backend, "gform" or "file".
+    """
+
+    backend = Configuration.config("mcc").get("backend", "gform")
+
+    if backend not in ("gform", "file"):
+        raise ValueError("Unknown backend: {}".format(backend))
+
+    return backend
 
-def match() -> None:
-    """ Matches riders to a car, writes the result to the google sheet.
 
+def write_output(schedule, week_start=None, sheet_names: list = None) -> None:
+    """ Writes a schedule with the configured backend.
+
+    Args:
+        schedule:
+            the schedule, an iterable of (Day.DayName, [Car]) tuples
+        week_start:
+            when provided, the output is named after the week, so every week of a
+            batch gets its own spreadsheet or file
+        sheet_names:
+            name of each day of the schedule, the day's name when not provided
     """
-    riders, drivers = get_members()
 
-    schedule = generate_rides(riders, drivers)
+    if get_backend() == "file":
+        filename = Configuration.config("file_backend")["output_file"]
+        if week_start is not None:
+            root, extension = os.path.splitext(filename)
+            filename = "{}_{}{}".format(root, week_start.isoformat(), extension)
+
+        file_backend.write_to_file(schedule, filename, sheet_names)
+        return
+
+    name = None
+    if week_start is not None:
+        name = "{} {}".format(
+            Configuration.config("gform_backend.files")["output_sheet"],
+            week_start.isoformat())
+
+    write_to_sheet(schedule, name, sheet_names)
 
-    write_to_sheet(schedule)
+
+def get_fairness_ledger() -> FairnessLedger:
+    """ Opens the fairness ledger set by mcc.fairness_ledger.
+
+    Returns:
+        A FairnessLedger, or None if the ledger is disabled
+    """
+
+    filename = Configuration.config("mcc").get("fairness_ledger",
+                                               "fairness_ledger.sqlite3")
+
+    if not filename:
+        return None
+
+    return FairnessLedger(filename)
+
+
+def get_run_store() -> RunStore:
+    """ Opens the run store set by mcc.run_store.
+
+    Returns:
+        A RunStore, or None if the store is disabled
+    """
+
+    filename = Configuration.config("mcc").get("run_store", "")
+
+    if not filename:
+        return None
+
+    return RunStore(filename)
+
+
+def get_club_name() -> str:
+    """ Returns the name of the active RunContext, "" outside of a context.
+    """
+
+    context = RunContext.current()
+
+    return context.name if context is not None else ""
+
+
+def match(incremental_run: bool = False, print_metrics: bool = False) -> None:
+    """ Matches riders to a car, writes the result to the google sheet.
+
+    Riders who missed out on rides in previous runs are weighted by the fairness
+    ledger, which is updated with this run's results at the end. The members and
+    schedule are saved to mcc.state_file and recorded in mcc.run_store as the
+    run of the coming week, see Day.get_week_start. A rematch keeps the week of
+    the schedule it updates and replaces its run in the store.
+
+    Every phase of the run is timed and the timings and counts of the run are
+    written to mcc.metrics_report.
+
+    Args:
+        incremental_run:
+            when True, the schedule saved by the previous run is updated with the
+            current responses instead of matching from scratch. The week's
+            earlier entry in the fairness ledger is replaced with the updated one
+        print_metrics:
+            when True, a table of the run metrics is printed at the end
+    """
+    mcc_config = Configuration.config("mcc")
+    metrics = RunMetrics.reset()
+
+    with metrics.phase("ingest"):
+        riders, drivers = get_members()
+
+    state_file = mcc_config.get("state_file", "")
+    state = None
+    if incremental_run:
+        if not state_file:
+            logger.warning("mcc.state_file is not set, matching from scratch")
+        else:
+            state = incremental.load_state(state_file)
+            if state is None:
+                logger.warning("No previous state found, matching from scratch")
+
+    # the outcome the previous run recorded, replaced when it is rematched
+    previous_outcome = state.get("fairness") if state is not None else None
+
+    # a rematch keeps the week of the schedule it updates, so the run store
+    # replaces that week's run
+    week_start = None
+    if state is not None:
+        week_start = incremental.get_week_start(state)
+    if week_start is None:
+        week_start = Day.get_week_start(date.today())
+
+    ledger = get_fairness_ledger()
+    if ledger is not None:
+        with metrics.phase("fairness"):
+            ledger.apply_weights(riders, previous_outcome)
+
+    with metrics.phase("match"):
+        if state is not None:
+            schedule = incremental.rematch(state, riders, drivers,
+                                           mcc_config.get("seed"))
+        else:
+            schedule = generate_rides(riders, drivers)
+
+    for (name, count) in count_schedule(riders, drivers, schedule).items():
+        metrics.count(name, count)
+
+    with metrics.phase("output"):
+        write_output(schedule)
+
+    with metrics.phase("save"):
+        outcome = None
+        if ledger is not None:
+            outcome = ledger.record(riders, schedule, previous_outcome)
+            ledger.close()
+
+        if state_file:
+            incremental.save_state(state_file, riders, drivers, schedule,
+                                   outcome, week_start)
+
+        store = get_run_store()
+        if store is not None:
+            store.record_run(riders,
+                             drivers,
+                             schedule,
+                             club=get_club_name(),
+                             week_start=week_start)
+            store.close()
+
+    metrics_report = mcc_config.get("metrics_report",
+                                    "climbing_carpools_metrics.json")
+    if metrics_report:
+        metrics.write(metrics_report)
 
     print("Summary of rides generated:")
     for day in schedule:
@@ -71,6 +301,242 @@ def match() -> None:
                 print("Rider:\t{}".format(r.name))
             print()
 
+    if print_metrics:
+        print(metrics.summary())
+
+
+def write_weeks(plans: list, batch_output: str) -> None:
+    """ Writes the schedules of a batch with the configured backend.
+
+    Args:
+        plans:
+            list of (week start date, Schedule) tuples from batch.plan_weeks
+        batch_output:
+            "worksheets" to write one spreadsheet with a worksheet per date, or
+            "spreadsheets" to write one spreadsheet per week
+    """
+
+    if batch_output == "worksheets":
+        schedule, sheet_names = batch.merge_weeks(plans)
+        write_output(schedule, sheet_names=sheet_names)
+    elif batch_output == "spreadsheets":
+        for (week_start, schedule) in plans:
+            write_output(schedule, week_start,
+                         batch.get_sheet_names(week_start, schedule))
+    else:
+        raise ValueError("Unknown batch output: {}".format(batch_output))
+
+
+def match_batch(date_range: str, print_metrics: bool = False) -> None:
+    """ Matches riders to cars for every week of a date range.
+
+    The responses are read once and treated as standing responses for every week.
+    The fairness ledger is updated after each week, so riders who missed out are
+    picked earlier the following week. The schedules are written as set by
+    mcc.batch_output. The state file is not written, as it holds a single week.
+    Every week is recorded in mcc.run_store as a run of its own.
+
+    Args:
+        date_range:
+            "YYYY-MM-DD:YYYY-MM-DD" first and last date to plan
+        print_metrics:
+            when True, a table of the run metrics is printed at the end
+    """
+    mcc_config = Configuration.config("mcc")
+    metrics = RunMetrics.reset()
+
+    start, end = batch.parse_date_range(date_range)
+    days_enabled = [Day.from_str(day) for day in mcc_config["days_enabled"]]
+    weeks = batch.get_weeks(start, end, days_enabled)
+
+    with metrics.phase("ingest"):
+        riders, drivers = get_members()
+
+    ledger = get_fairness_ledger()
+
+    with metrics.phase("match"):
+        plans = batch.plan_weeks(riders, drivers, weeks, ledger,
+                                 mcc_config.get("seed"))
+
+    metrics.count("weeks", len(plans))
+    for (_, schedule) in plans:
+        for (name, count) in count_schedule(riders, drivers, schedule).items():
+            metrics.count(name, count)
+
+    with metrics.phase("output"):
+        write_weeks(plans, mcc_config.get("batch_output", "worksheets"))
+
+    with metrics.phase("save"):
+        if ledger is not None:
+            ledger.close()
+
+        store = get_run_store()
+        if store is not None:
+            for (week_start, schedule) in plans:
+                store.record_run(riders,
+                                 drivers,
+                                 schedule,
+                                 club=get_club_name(),
+                                 week_start=week_start)
+            store.close()
+
+    metrics_report = mcc_config.get("metrics_report",
+                                    "climbing_carpools_metrics.json")
+    if metrics_report:
+        metrics.write(metrics_report)
+
+    print("Summary of rides generated:")
+    for (week_start, schedule) in plans:
+        for (day,
+             sheet_name) in zip(schedule,
+                                batch.get_sheet_names(week_start, schedule)):
+            print("Rides for:\t{}".format(sheet_name))
+            for car in day[1]:
+                print("Driver:\t{}".format(car.driver.name))
+                for r in car.riders:
+                    print("Rider:\t{}".format(r.name))
+                print()
+
+    if print_metrics:
+        print(metrics.summary())
+
+
+def match_club(config_file: str,
+               date_range: str = None,
+               print_metrics: bool = False,
+               mcc_overrides: dict = None) -> dict:
+    """ Runs the scheduler for one club in a RunContext of its own.
+
+    Args:
+        config_file:
+            configuration file of the club
+        date_range:
+            when provided, the weeks of the range are planned as with -b
+        print_metrics:
+            when True, a table of the run metrics is printed at the end
+        mcc_overrides:
+            [mcc] settings given on the command line
+
+    Returns:
+        The club's metrics report, or a dictionary with an "error" when the run
+        failed
+    """
+
+    try:
+        context = RunContext(Configuration.load(config_file), name=config_file)
+        context.config["mcc"].update(mcc_overrides or dict())
+
+        with context.activate():
+            if date_range is not None:
+                match_batch(date_range, print_metrics)
+            else:
+                match(print_metrics=print_metrics)
+
+            return RunMetrics.get_instance().report()
+    except Exception as error:
+        logger.exception("Run for %s failed", config_file)
+        return {"error": repr(error)}
+
+
+def match_clubs(config_files: list,
+                date_range: str = None,
+                print_metrics: bool = False,
+                report_file: str = "climbing_carpools_clubs.json",
+                mcc_overrides: dict = None) -> None:
+    """ Runs the scheduler for several clubs in one process.
+
+    Every club runs in a RunContext with its own configuration, location registry
+    and metrics. Up to mcc.club_workers clubs run at the same time in threads,
+    keep it low enough for the Google API quota. The clubs share the authorized
+    client, so the service account is authorized once and spreadsheets used by
+    several clubs (such as a shared dues sheet) are opened once. A club that
+    fails is logged and does not stop the others.
+
+    The metrics of every club are written together to report_file.
+
+    Args:
+        config_files:
+            list of configuration files, one per club
+        date_range:
+            when provided, every club plans the weeks of the range as with -b
+        print_metrics:
+            when True, a table of the run metrics is printed after each club
+        report_file:
+            JSON file the combined run report is written to
+        mcc_overrides:
+            [mcc] settings given on the command line, applied to every club
+    """
+
+    started = datetime.now()
+    start = time.perf_counter()
+
+    workers = max(1, Configuration.config("mcc").get("club_workers", 1))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        reports = executor.map(match_club, config_files,
+                               [date_range] * len(config_files),
+                               [print_metrics] * len(config_files),
+                               [mcc_overrides] * len(config_files))
+        clubs = dict(zip(config_files, reports))
+
+    report = {
+        "started": started.isoformat(),
+        "total_seconds": time.perf_counter() - start,
+        "clubs": clubs,
+    }
+
+    with open(report_file, "w") as report_output:
+        json.dump(report, report_output, indent=2)
+
+    failed = [name for (name, club) in clubs.items() if "error" in club]
+    print("Ran {} clubs, {} failed. Report written to {}".format(
+        len(clubs), len(failed), report_file))
+
+
+def print_history(query: str, since: str = None) -> None:
+    """ Prints a query of the runs recorded in mcc.run_store.
+
+    Args:
+        query:
+            "runs" for the recorded runs, "riders" for the rides each member got,
+            "drivers" for the riders each member carried, or a member's email for
+            every ride they gave or got
+        since:
+            when provided, only rides on or after this YYYY-MM-DD date count
+    """
+
+    store = get_run_store()
+    if store is None:
+        print("No run store configured, set mcc.run_store")
+        return
+
+    if since is not None:
+        since = datetime.strptime(since, "%Y-%m-%d").date()
+
+    try:
+        if query == "runs":
+            print("run\tstarted\tclub\tweek\tmembers\tcars\tseated")
+            rows = store.runs(since)
+        elif query == "riders":
+            print("email\tname\trides")
+            rows = store.rides_per_rider(since)
+        elif query == "drivers":
+            print("email\tname\tdrives\triders carried")
+            rows = store.riders_per_driver(since)
+        else:
+            print("date\tday\trole\tdriver\tdeparture")
+            rows = [
+                row[:4] +
+                (Day.time_to_str(row[4]) if row[4] is not None else "",)
+                for row in store.member_rides(query, since)
+            ]
+
+        for row in rows:
+            print("\t".join(
+                ["" if value is None else str(value) for value in row]))
+    finally:
+        store.close()
+
 
 def print_tab(message: str) -> None:
     """ Print a tab followed by the message string passed in. 
@@ -88,6 +554,31 @@ def usage() -> None:
     print("SYNOPSIS")
     print_tab("-m\t--match\tMatch drivers and riders, publish google sheet")
     print_tab("-c\t--config <filename>\t Provide a path to a config file")
+    print_tab(
+        "-e\t--engine <name>\tMatching engine to use: greedy (default) or flow")
+    print_tab(
+        "\t--backend <name>\tRead and write with gform (default) or local files"
+    )
+    print_tab("-j\t--jobs <n>\tMatch the enabled days with n worker processes")
+    print_tab(
+        "-i\t--incremental\tWith -m, update the previous schedule with new responses"
+    )
+    print_tab(
+        "-b\t--batch <first:last>\tWith -m, plan every week from the first to the"
+    )
+    print_tab("\t\tlast YYYY-MM-DD date with the same responses")
+    print_tab(
+        "\t--clubs <file,file,...>\tWith -m, run every club configuration in one"
+    )
+    print_tab("\t\tprocess and write a combined report")
+    print_tab("\t--metrics\tWith -m, print the timings and counts of the run")
+    print_tab(
+        "\t--history <query>\tPrint the recorded runs: runs, riders, drivers or"
+    )
+    print_tab("\t\ta member's email")
+    print_tab(
+        "\t--since <YYYY-MM-DD>\tWith --history, only count rides from this date"
+    )
     print_tab("-l\t--list\tList all files the service account has access to")
     print_tab(
         "-d\t--delete <sheet name> Delete the specified sheet from google drive"
@@ -116,9 +607,11 @@ def main():
 
     # Extract command line arguments
     try:
-        opts, _ = getopt.getopt(
-            sys.argv[1:], "mlcvh:d:t",
-            ["match", "list", "config=", "delete=", "test", "version", "help"])
+        opts, _ = getopt.getopt(sys.argv[1:], "mlcvh:d:te:j:ib:", [
+            "match", "list", "config=", "delete=", "test", "version", "help",
+            "engine=", "jobs=", "incremental", "metrics", "batch=", "clubs=",
+            "backend=", "history=", "since="
+        ])
     except getopt.GetoptError:
         usage()
         sys.exit(2)
@@ -127,6 +620,15 @@ def main():
     config_file: str = None
     config_provided: bool = False
     is_test: bool = False
+    engine: str = None
+    backend: str = None
+    jobs: int = None
+    incremental_run: bool = False
+    print_metrics: bool = False
+    date_range: str = None
+    club_configs: list = None
+    history_query: str = None
+    since: str = None
 
     if len(opts) == 0:
         usage()
@@ -145,6 +647,24 @@ def main():
         elif opt == "-c" or opt == "--config":
             config_file = arg
             config_provided = True
+        elif opt == "-e" or opt == "--engine":
+            engine = arg
+        elif opt == "--backend":
+            backend = arg
+        elif opt == "-j" or opt == "--jobs":
+            jobs = int(arg)
+        elif opt == "-i" or opt == "--incremental":
+            incremental_run = True
+        elif opt == "-b" or opt == "--batch":
+            date_range = arg
+        elif opt == "--clubs":
+            club_configs = [name for name in arg.split(",") if name]
+        elif opt == "--metrics":
+            print_metrics = True
+        elif opt == "--history":
+            history_query = arg
+        elif opt == "--since":
+            since = arg
         elif opt == "-t" or opt == "--test":
             # do whatever with this, just set up the infrastructure
             is_test = True
@@ -159,8 +679,34 @@ def main():
     if config_provided is False:
         Configuration.config(filename=config_file)
 
-    if matching:
-        match()
+    log.configure_logging()
+
+    # command line engine overrides the configured one
+    mcc_overrides = dict()
+    if engine is not None:
+        mcc_overrides["engine"] = engine
+
+    if backend is not None:
+        mcc_overrides["backend"] = backend
+
+    if jobs is not None:
+        mcc_overrides["workers"] = jobs
+
+    Configuration.config("mcc").update(mcc_overrides)
+
+    if history_query is not None:
+        print_history(history_query, since)
+        sys.exit(0)
+
+    if matching and club_configs:
+        match_clubs(club_configs,
+                    date_range,
+                    print_metrics,
+                    mcc_overrides=mcc_overrides)
+    elif matching and date_range is not None:
+        match_batch(date_range, print_metrics)
+    elif matching:
+        match(incremental_run, print_metrics)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+""" Plans several consecutive weeks in a single run.
+
+The responses are standing responses: every member rides or drives on the same
+days every week. They are read once, and the same Rider and Driver objects (with
+their parsed days, masks and indexes) are matched week after week. Between weeks
+the fairness ledger records the week's outcome and reweights the riders, so riders
+who missed out one week are picked earlier the next week.
+
+Typical Usage:
+    import scheduler.batch as batch
+
+    start, end = batch.parse_date_range("2026-10-19:2026-11-15")
+    weeks = batch.get_weeks(start, end, days_enabled)
+    plans = batch.plan_weeks(riders, drivers, weeks, ledger)
+"""
+
+from datetime import date, datetime, timedelta
+import logging
+import random
+
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.FairnessLedger import FairnessLedger
+from scheduler.classes.RunMetrics import RunMetrics
+from scheduler.generate_rides import generate_rides, start_workers
+import scheduler.classes.Day as Day
+
+logger = logging.getLogger(__name__)
+
+
+def parse_date_range(text: str) -> (date, date):
+    """Parses a "YYYY-MM-DD:YYYY-MM-DD" date range.
+
+    Args:
+        text:
+            first and last date of the range separated by a colon
+
+    Returns:
+        (first date, last date)
+
+    Raises:
+        ValueError if the range is malformed or ends before it starts
+    """
+
+    try:
+        first, last = text.split(":")
+        start = datetime.strptime(first.strip(), "%Y-%m-%d").date()
+        end = datetime.strptime(last.strip(), "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(
+            "Expected a YYYY-MM-DD:YYYY-MM-DD date range, got {}".format(text))
+
+    if end < start:
+        raise ValueError("Date range ends before it starts: {}".format(text))
+
+    return start, end
+
+
+def get_weeks(start: date, end: date, days_enabled: list) -> list:
+    """Returns the weeks of a date range.
+
+    Weeks start on Monday. The first and last week can be partial, only the
+    enabled days that fall inside the range are kept.
+
+    Args:
+        start:
+            first date of the range
+        end:
+            last date of the range
+        days_enabled:
+            list of Day.DayName enums the club runs carpools on
+
+    Returns:
+        list of (week start date, [(Day.DayName, date)]) tuples in date order.
+        Weeks without an enabled day in the range are left out
+    """
+
+    days_enabled = sorted(set(days_enabled), key=lambda day: day.value)
+
+    weeks = list()
+    week_start = start - timedelta(days=start.weekday())
+
+    while week_start <= end:
+        week_days = list()
+        for day in days_enabled:
+            day_date = week_start + timedelta(days=day.value)
+            if start <= day_date <= end:
+                week_days.append((day, day_date))
+
+        if week_days:
+            weeks.append((week_start, week_days))
+
+        week_start += timedelta(weeks=1)
+
+    return weeks
+
+
+def plan_weeks(riders: list,
+               drivers: list,
+               weeks: list,
+               ledger: FairnessLedger = None,
+               seed=None) -> list:
+    """Matches every week of a batch.
+
+    Before each week the riders are weighted from the ledger, and after it the
+    week's schedule is recorded in the ledger. When no ledger is given, an
+    in-memory ledger carries the fairness from week to week.
+
+    The riders and drivers are the same every week, so the pool of worker
+    processes (with mcc.workers greater than 1) is started once for the batch
+    and the driver index of each day is built once and copied every week.
+
+    Args:
+        riders:
+            list of Rider objects, their selection_weight is updated every week
+        drivers:
+            list of Driver objects, not modified
+        weeks:
+            list of weeks from get_weeks
+        ledger:
+            FairnessLedger the weeks are recorded in
+        seed:
+            seed of the batch, mcc.seed (or a random seed) when not provided.
+            Every week is matched with its own seed derived from it
+
+    Returns:
+        list of (week start date, Schedule) tuples, one per week
+    """
+
+    if seed is None:
+        seed = Configuration.config("mcc").get("seed")
+    if seed is None:
+        seed = random.randrange(2**32)
+    logger.info("planning %i weeks with seed %s", len(weeks), seed)
+
+    batch_ledger = ledger if ledger is not None else FairnessLedger(":memory:")
+    metrics = RunMetrics.get_instance()
+
+    workers = min(
+        Configuration.config("mcc").get("workers", 1),
+        max([len(week_days) for (_, week_days) in weeks], default=0))
+    executor = None
+    if workers > 1:
+        executor = start_workers(riders, drivers, workers)
+    indexes = dict()
+
+    plans = list()
+    try:
+        for (week_start, week_days) in weeks:
+            with metrics.phase("week"):
+                batch_ledger.apply_weights(riders)
+
+                schedule = generate_rides(riders,
+                                          drivers,
+                                          [day for (day, _) in week_days],
+                                          "{}:{}".format(
+                                              seed, week_start.isoformat()),
+                                          executor=executor,
+                                          indexes=indexes)
+
+                batch_ledger.record(riders, schedule)
+
+            plans.append((week_start, schedule))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if ledger is None:
+            batch_ledger.close()
+
+    return plans
+
+
+def get_sheet_name(day: Day.DayName, day_date: date) -> str:
+    """Returns the name of the worksheet of a single date.
+    """
+
+    return "{} {}".format(Day.to_str(day), day_date.isoformat())
+
+
+def get_sheet_names(week_start: date, schedule) -> list:
+    """Returns the worksheet names of a week's schedule.
+
+    Args:
+        week_start:
+            Monday of the week
+        schedule:
+            iterable of (Day.DayName, [Car]) tuples of the week
+
+    Returns:
+        list of worksheet names, one per day of the schedule
+    """
+
+    return [
+        get_sheet_name(day, week_start + timedelta(days=day.value))
+        for (day, _) in schedule
+    ]
+
+
+def merge_weeks(plans: list) -> (list, list):
+    """Puts the days of every week of a batch in a single schedule.
+
+    Args:
+        plans:
+            list of (week start date, Schedule) tuples from plan_weeks
+
+    Returns:
+        (list, list)
+        The list in index 0 holds the (Day.DayName, [Car]) tuples of every week
+        in date order. The list in index 1 holds the worksheet name of each entry
+    """
+
+    schedule = list()
+    names = list()
+
+    for (week_start, week_schedule) in plans:
+        schedule.extend(week_schedule)
+        names.extend(get_sheet_names(week_start, week_schedule))
+
+    return schedule, names
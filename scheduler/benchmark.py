@@ -0,0 +1,332 @@
+""" Benchmarks the matching code on synthetic populations.
+
+Every benchmark is run for each population size. The run time, throughput in
+members per second and peak memory (measured with tracemalloc in a separate run,
+so it does not slow down the timed run) are written to a JSON report. When a
+baseline report is given, benchmarks that got slower than the threshold are
+listed and the exit status is 1, so the suite can guard a CI job.
+
+Typical Usage:
+    python -m scheduler.benchmark --sizes 100,1000,10000 --output benchmark.json
+    python -m scheduler.benchmark --baseline benchmark.json --output new.json
+"""
+
+import copy
+import getopt
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+
+from scheduler.classes.CompatibilityMatrix import CompatibilityMatrix
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.RunContext import RunContext
+import scheduler.generate_rides as generate_rides
+import scheduler.synthetic as synthetic
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+# the legacy find_best_match scans every driver for every rider
+LEGACY_MAX_MEMBERS = 10000
+
+REPORT_VERSION = 1
+
+
+def measure(function, repeat: int = 1, trace_memory: bool = True) -> dict:
+    """Times a function and measures its peak memory.
+
+    Args:
+        function:
+            function without arguments to measure
+        repeat:
+            number of timed runs, the fastest is reported
+        trace_memory:
+            True to run the function once more under tracemalloc
+
+    Returns:
+        dictionary with "seconds" and "peak_memory_bytes", None when memory was
+        not traced
+    """
+
+    times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {"seconds": min(times), "peak_memory_bytes": peak}
+
+
+def get_benchmarks(riders: list, drivers: list, seed: int) -> dict:
+    """Returns the benchmarks to run on a population.
+
+    Args:
+        riders:
+            list of Rider objects
+        drivers:
+            list of Driver objects
+        seed:
+            seed of the rider order
+
+    Returns:
+        dictionary mapping benchmark names to functions without arguments
+    """
+
+    day = synthetic.DEFAULT_DAYS[0]
+    benchmarks = dict()
+
+    def legacy_find_best_match():
+        for driver in drivers:
+            driver.seats_remaining = driver.seats
+
+        for rider in riders:
+            if rider.in_day(day):
+                generate_rides.find_best_match(rider, drivers, day)
+
+        for driver in drivers:
+            driver.seats_remaining = driver.seats
+
+    if len(riders) + len(drivers) <= LEGACY_MAX_MEMBERS:
+        benchmarks["find_best_match"] = legacy_find_best_match
+
+    def engine_benchmark(engine, use_numpy, rider_order):
+        return lambda: generate_rides.match_day(riders, drivers, day, seed,
+                                                engine, use_numpy, rider_order)
+
+    for engine in generate_rides.ENGINES:
+        benchmarks["engine:" + engine] = engine_benchmark(
+            engine, False, "random")
+        if CompatibilityMatrix.available():
+            benchmarks["engine:" + engine + "/numpy"] = engine_benchmark(
+                engine, True, "random")
+
+    benchmarks["engine:greedy/constrained"] = engine_benchmark(
+        "greedy", False, "constrained")
+
+    # the full run gets a configuration of its own, the process-wide one is
+    # never changed
+    config = copy.deepcopy(Configuration.config())
+    config["mcc"].update({
+        "engine": "greedy",
+        "rider_order": "random",
+        "use_numpy": False,
+        "workers": 1,
+    })
+    context = RunContext(config, name="benchmark")
+
+    def full_run():
+        generate_rides.generate_rides(riders,
+                                      drivers,
+                                      days=list(synthetic.DEFAULT_DAYS),
+                                      seed=seed,
+                                      context=context)
+
+    benchmarks["generate_rides"] = full_run
+
+    return benchmarks
+
+
+def run_benchmarks(sizes: list,
+                   seed: int = 0,
+                   repeat: int = 1,
+                   trace_memory: bool = True) -> dict:
+    """Runs every benchmark for every population size.
+
+    Args:
+        sizes:
+            list of population sizes, in members
+        seed:
+            seed of the populations and rider orders
+        repeat:
+            number of timed runs per benchmark
+        trace_memory:
+            True to measure peak memory
+
+    Returns:
+        The report dictionary
+    """
+
+    results = list()
+
+    for size in sizes:
+        start = time.perf_counter()
+        riders, drivers = synthetic.generate_population(size, seed=seed)
+        print(
+            "{} members: generated {} riders and {} drivers in {:.2f}s".format(
+                size, len(riders), len(drivers),
+                time.perf_counter() - start))
+
+        for (name, function) in get_benchmarks(riders, drivers, seed).items():
+            result = measure(function, repeat, trace_memory)
+            result.update({
+                "benchmark": name,
+                "members": size,
+                "riders": len(riders),
+                "drivers": len(drivers),
+                "members_per_second": size / max(result["seconds"], 1e-9),
+            })
+            results.append(result)
+
+            print("\t{:<28}{:>10.4f}s{:>14.0f} members/s".format(
+                name, result["seconds"], result["members_per_second"]))
+
+    return {
+        "version": REPORT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def find_regressions(report: dict,
+                     baseline: dict,
+                     threshold: float = 0.2,
+                     memory_threshold: float = 0.2) -> list:
+    """Compares a report with a baseline report.
+
+    Both the time and the peak memory of each benchmark are compared. Memory is
+    skipped when either report did not trace it.
+
+    Args:
+        report:
+            report dictionary from run_benchmarks
+        baseline:
+            report dictionary to compare with
+        threshold:
+            allowed slowdown, 0.2 allows runs up to 20% slower than the baseline
+        memory_threshold:
+            allowed peak memory growth, 0.2 allows runs to use up to 20% more
+            memory than the baseline
+
+    Returns:
+        list of (benchmark, members, measure, baseline value, value) tuples for
+        the benchmarks that got slower or bigger than allowed. measure is
+        "seconds" or "peak_memory_bytes"
+    """
+
+    baseline_results = {
+        (r["benchmark"], r["members"]): r for r in baseline["results"]
+    }
+
+    regressions = list()
+    for result in report["results"]:
+        key = (result["benchmark"], result["members"])
+        if key not in baseline_results:
+            continue
+
+        for (measure, allowed) in (("seconds", threshold), ("peak_memory_bytes",
+                                                            memory_threshold)):
+            before = baseline_results[key].get(measure)
+            after = result.get(measure)
+            if before is None or after is None:
+                continue
+
+            if after > before * (1 + allowed):
+                regressions.append(key + (measure, before, after))
+
+    return regressions
+
+
+def usage() -> None:
+    """ Print benchmark usage.
+    """
+
+    print("python -m scheduler.benchmark [options]")
+    print("\t-s\t--sizes <n,n,...>\tPopulation sizes, default {}".format(
+        ",".join(str(s) for s in DEFAULT_SIZES)))
+    print("\t-o\t--output <filename>\tJSON report, default benchmark.json")
+    print("\t-r\t--repeat <n>\tTimed runs per benchmark, the fastest is kept")
+    print("\t\t--seed <n>\tSeed of the populations, default 0")
+    print("\t-b\t--baseline <filename>\tReport to compare with")
+    print("\t-t\t--threshold <x>\tAllowed slowdown against the baseline, "
+          "default 0.2")
+    print("\t\t--memory-threshold <x>\tAllowed peak memory growth against "
+          "the baseline, default 0.2")
+    print("\t\t--no-memory\tDo not measure peak memory")
+    print("\t-h\t--help\tPrint this message")
+
+
+def main():
+    """ Parses arguments, runs the benchmarks and writes the report.
+    """
+
+    try:
+        opts, _ = getopt.getopt(sys.argv[1:], "s:o:r:b:t:h", [
+            "sizes=", "output=", "repeat=", "seed=", "baseline=", "threshold=",
+            "memory-threshold=", "no-memory", "help"
+        ])
+    except getopt.GetoptError:
+        usage()
+        sys.exit(2)
+
+    sizes = DEFAULT_SIZES
+    output = "benchmark.json"
+    repeat = 1
+    seed = 0
+    baseline_file = None
+    threshold = 0.2
+    memory_threshold = 0.2
+    trace_memory = True
+
+    for opt, arg in opts:
+        if opt in ("-s", "--sizes"):
+            sizes = [int(size) for size in arg.split(",")]
+        elif opt in ("-o", "--output"):
+            output = arg
+        elif opt in ("-r", "--repeat"):
+            repeat = int(arg)
+        elif opt == "--seed":
+            seed = int(arg)
+        elif opt in ("-b", "--baseline"):
+            baseline_file = arg
+        elif opt in ("-t", "--threshold"):
+            threshold = float(arg)
+        elif opt == "--memory-threshold":
+            memory_threshold = float(arg)
+        elif opt == "--no-memory":
+            trace_memory = False
+        elif opt in ("-h", "--help"):
+            usage()
+            sys.exit(0)
+
+    # the matching code logs every unmatched rider
+    logging.disable(logging.WARNING)
+
+    report = run_benchmarks(sizes, seed, repeat, trace_memory)
+
+    with open(output, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+    print("Report written to {}".format(output))
+
+    if baseline_file is not None:
+        with open(baseline_file) as baseline:
+            regressions = find_regressions(report, json.load(baseline),
+                                           threshold, memory_threshold)
+
+        for (name, members, measure, before, after) in regressions:
+            if measure == "seconds":
+                print("REGRESSION {} at {} members: {:.4f}s -> {:.4f}s".format(
+                    name, members, before, after))
+            else:
+                print("REGRESSION {} at {} members: {} -> {} bytes peak "
+                      "memory".format(name, members, before, after))
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
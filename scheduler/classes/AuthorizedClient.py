@@ -1,17 +1,31 @@
+import threading
+
 from oauth2client.service_account import ServiceAccountCredentials
 import gspread
 
+from scheduler.classes.RunContext import RunContext
+
 
 class AuthorizedClient:
     """Get an authorized client able to read/ write to google drive.
 
     Uses the secret.json file that an operator of the program is expected to have
 
+    The client lives as long as the process, so runs for several clubs share its
+    authorization, HTTP session and the spreadsheets opened through open(). A
+    RunContext can carry a client of its own, which get_instance returns while
+    the context is active. Passing a client to the constructor wraps it without
+    authorizing, so a FakeClient can stand in for gspread.
+
     Attributes:
         client:
             Authorized client that can interact with google drive
         credentials:
             credentials of the authorized client
+        _spreadsheets:
+            dictionary mapping spreadsheet name to the opened gspread.Spreadsheet
+        _lock:
+            lock guarding _spreadsheets
         _instance:
             assigned to 'self' attribute of the class
 
@@ -21,6 +35,7 @@ class AuthorizedClient:
     """
 
     _instance = None
+    _instance_lock = threading.Lock()
 
     def _authorize(self) -> (gspread.client.Client, ServiceAccountCredentials):
         """
@@ -38,19 +53,53 @@ class AuthorizedClient:
 
         return gspread.authorize(credentials), credentials
 
-    def __init__(self):
-        if AuthorizedClient._instance is not None:
+    def __init__(self, client=None):
+        if client is not None:
+            # a given client, such as a FakeClient, is used as it is. It is not
+            # the process-wide instance, runs use it through a RunContext
+            self.client, self.credentials = client, None
+        elif AuthorizedClient._instance is not None:
             raise Exception("Authorized client error")
         else:
             self.client, self.credentials = AuthorizedClient._authorize(self)
             AuthorizedClient._instance = self
 
+        self._spreadsheets: dict = dict()
+        self._lock = threading.Lock()
+
     @classmethod
     def get_instance(cls):
         """
         Get instance of this client
         """
 
-        if cls._instance is None:
-            cls()
+        context = RunContext.current()
+        if context is not None and context.client is not None:
+            return context.client
+
+        # runs in several threads may ask for the client at the same time
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls()
         return cls._instance
+
+    def open(self, name: str) -> gspread.models.Spreadsheet:
+        """Opens a spreadsheet by name, once per process.
+
+        Looking a spreadsheet up by name lists the drive, so the opened
+        spreadsheet is kept for later runs. Its contents are still read fresh
+        by every call on it.
+
+            Args:
+                name:
+                    name of the spreadsheet
+
+            Returns:
+                A gspread.models.Spreadsheet object
+        """
+
+        with self._lock:
+            if name not in self._spreadsheets:
+                self._spreadsheets[name] = self.client.open(name)
+
+            return self._spreadsheets[name]
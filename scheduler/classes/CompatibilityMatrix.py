@@ -0,0 +1,382 @@
+import bisect
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from scheduler.classes.Driver import Driver
+from scheduler.classes.Rider import Rider
+import scheduler.classes.Day as Day
+
+
+def _get_bits(masks: list) -> tuple:
+    """Returns the set bits of a list of masks as two arrays.
+
+    Returns:
+        (groups, bits) int64 arrays, one entry per set bit: the index of the mask
+        in masks and the bit. groups is ascending
+    """
+
+    groups = list()
+    bits = list()
+
+    for (g, mask) in enumerate(masks):
+        while mask:
+            low = mask & -mask
+            groups.append(g)
+            bits.append(low.bit_length() - 1)
+            mask ^= low
+
+    return (np.array(groups, dtype=np.int64), np.array(bits, dtype=np.int64))
+
+
+class CompatibilityMatrix:
+    """Rider x driver compatibility and time preference scores for a day.
+
+    Riders with the same locations and times for the day are interchangeable, as
+    are drivers with the same locations and departure times, so members are put
+    in groups and the matrices are computed between groups, not between
+    members. Their size then depends on the number of distinct location/time
+    combinations rather than on the number of members, and the memory cost is
+    linear in the number of members.
+
+    The scores are computed with a few NumPy operations over the groups instead
+    of calling are_location_compatible and time_compatibility once per pair. A
+    pair is time compatible when the driver leaves within the tolerance window
+    around one of the rider's times. Its score is Day.get_time_score of the
+    minutes between the two and the driver's departure time, so a lower score is
+    a better match and drivers are ranked the same way DriverIndex ranks them.
+
+    Riders are grouped in bulk when the matrix is built, and riders it was not
+    built with when they are first looked up, a batch at a time with
+    get_rider_groups. Lookups do not scan the matrix. Every rider group ranks
+    the driver groups it is compatible with once, in tiers of equal score, and
+    skips the tiers whose drivers are all full as seats are taken. Groups only
+    ever fill up during a day, so a lookup costs the number of compatible groups
+    with open seats in the first tier that has any, and NumPy is only used while
+    building.
+
+    This only pays off for the greedy engines. The flow engine already works on
+    groups and scores a few thousand pairs of them, so building the matrix costs
+    more than it saves there. Benchmark before enabling it.
+
+    Requires NumPy. Use CompatibilityMatrix.available() to check for it.
+
+    Attributes:
+        day:
+            Day.DayName enum of the day the matrices were built for
+        drivers:
+            list of Driver objects, in column order
+        tolerance:
+            departure time tolerance window, in minutes
+        seats:
+            seat ledger, dictionary mapping Driver to the seats it has left on the day
+        _rider_groups:
+            dictionary mapping Rider to its rider group
+        _rider_keys:
+            dictionary mapping (location mask, time mask) to its rider group
+        _scores:
+            list with, per rider group, an int32 array of its time scores with
+            every driver group, NO_MATCH where the groups are not compatible
+        _columns:
+            dictionary mapping Driver to its column
+        _driver_groups:
+            list with the driver group of every column
+        _open:
+            list with one ascending list per driver group of the columns of its
+            drivers with open seats
+        _tiers:
+            list with, per rider group, its compatible driver groups as a list of
+            (score, [driver groups]) tiers by ascending score. None until the
+            group is first looked up
+        _next_tier:
+            list with, per rider group, the first of its tiers that may still
+            have a driver with open seats
+
+    Typical Usage:
+        matrix = CompatibilityMatrix(riders, drivers, Day.DayName.TUESDAY, seats)
+        driver = matrix.find_best_match(rider)
+        if driver:
+            matrix.take_seat(driver)
+    """
+
+    NO_MATCH = 2**31 - 1
+
+    def __init__(self,
+                 riders: list,
+                 drivers: list,
+                 day: Day.DayName,
+                 seats: dict = None,
+                 tolerance: int = 0):
+        if seats is None:
+            seats = {driver: driver.seats_remaining for driver in drivers}
+
+        self.day: Day.DayName = day
+        self.tolerance: int = tolerance
+        self.drivers: list = drivers
+        self.seats: dict = seats
+        self._columns: dict = {driver: j for (j, driver) in enumerate(drivers)}
+
+        # group the members by their location and time masks for the day
+        driver_keys = dict()
+        self._driver_groups: list = [
+            driver_keys.setdefault(
+                (driver.get_location_mask(day), driver.get_time_mask(day)),
+                len(driver_keys)) for driver in drivers
+        ]
+        self._driver_keys: list = list(driver_keys)
+
+        # open columns of every driver group, in column order
+        self._open: list = [list() for _ in self._driver_keys]
+        for (j, driver) in enumerate(drivers):
+            if seats.get(driver, 0) > 0:
+                self._open[self._driver_groups[j]].append(j)
+
+        self._rider_groups: dict = dict()
+        self._rider_keys: dict = dict()
+        self._scores: list = list()
+        self._tiers: list = list()
+        self._next_tier: list = list()
+        self.get_rider_groups(riders)
+
+    @classmethod
+    def _score_groups(cls, rider_keys: list, driver_keys: list, tolerance: int):
+        """Returns the rider groups x driver groups array of time scores.
+
+            Args:
+                rider_keys:
+                    list of (location mask, time mask) of every rider group
+                driver_keys:
+                    list of (location mask, time mask) of every driver group
+                tolerance:
+                    departure time tolerance window, in minutes
+        """
+
+        score = np.full((len(rider_keys), len(driver_keys)),
+                        cls.NO_MATCH,
+                        dtype=np.int32)
+        if not rider_keys or not driver_keys:
+            return score
+
+        # locations are shared when the location bit sets intersect
+        (rider_groups, rider_locations) = _get_bits([k[0] for k in rider_keys])
+        (driver_groups,
+         driver_locations) = _get_bits([k[0] for k in driver_keys])
+        locations = np.union1d(rider_locations, driver_locations)
+
+        rider_location_matrix = np.zeros((len(rider_keys), len(locations)),
+                                         dtype=np.int32)
+        rider_location_matrix[rider_groups,
+                              np.searchsorted(locations, rider_locations)] = 1
+        driver_location_matrix = np.zeros((len(driver_keys), len(locations)),
+                                          dtype=np.int32)
+        driver_location_matrix[driver_groups,
+                               np.searchsorted(locations, driver_locations)] = 1
+        location_match = (rider_location_matrix @ driver_location_matrix.T) > 0
+
+        # minutes between every rider group and every departure time
+        (rider_groups, rider_times) = _get_bits([k[1] for k in rider_keys])
+        (driver_groups, driver_times) = _get_bits([k[1] for k in driver_keys])
+        if len(rider_times) == 0 or len(driver_times) == 0:
+            return score
+
+        departures = np.unique(driver_times)
+        pair_deltas = np.abs(rider_times[:, np.newaxis] -
+                             departures[np.newaxis, :])
+
+        # closest rider time of every group, over the group's run of rows
+        (present, starts) = np.unique(rider_groups, return_index=True)
+        deltas = np.full((len(rider_keys), len(departures)),
+                         tolerance + 1,
+                         dtype=np.int64)
+        deltas[present] = np.minimum.reduceat(pair_deltas, starts, axis=0)
+
+        departure_scores = np.where(
+            deltas <= tolerance,
+            deltas * Day.MINUTES_PER_DAY + departures[np.newaxis, :],
+            cls.NO_MATCH)
+
+        # best score over each driver group's departure times
+        (present, starts) = np.unique(driver_groups, return_index=True)
+        score[:, present] = np.minimum.reduceat(
+            departure_scores[:, np.searchsorted(departures, driver_times)],
+            starts,
+            axis=1)
+
+        return np.where(location_match, score, cls.NO_MATCH).astype(np.int32)
+
+    @staticmethod
+    def available() -> bool:
+        """Returns True if NumPy is installed and the matrices can be built.
+        """
+
+        return np is not None
+
+    def get_rider_groups(self, riders: list) -> list:
+        """Returns the rider group of every rider.
+
+        Riders not seen before are grouped, and the new groups are scored
+        against every driver group together.
+
+            Args:
+                riders:
+                    list of Rider objects
+
+            Returns:
+                list of rider groups, in the order of riders
+        """
+
+        day = self.day
+        groups = list()
+        new_keys = list()
+
+        for rider in riders:
+            g = self._rider_groups.get(rider)
+
+            if g is None:
+                key = (rider.get_location_mask(day), rider.get_time_mask(day))
+                g = self._rider_keys.get(key)
+                if g is None:
+                    g = len(self._rider_keys)
+                    self._rider_keys[key] = g
+                    new_keys.append(key)
+                self._rider_groups[rider] = g
+
+            groups.append(g)
+
+        if new_keys:
+            self._scores.extend(
+                self._score_groups(new_keys, self._driver_keys, self.tolerance))
+            self._tiers.extend([None] * len(new_keys))
+            self._next_tier.extend([0] * len(new_keys))
+
+        return groups
+
+    def get_rider_group(self, rider: Rider) -> int:
+        """Returns the rider group of a rider, see get_rider_groups.
+        """
+
+        g = self._rider_groups.get(rider)
+        if g is None:
+            g = self.get_rider_groups([rider])[0]
+
+        return g
+
+    def get_group_scores(self, rider_group: int):
+        """Returns the int32 array of the scores of a rider group with every
+        driver group, NO_MATCH where the groups are not compatible.
+        """
+
+        return self._scores[rider_group]
+
+    def get_driver_group(self, driver: Driver) -> int:
+        """Returns the driver group of a driver of the matrix.
+        """
+
+        return self._driver_groups[self._columns[driver]]
+
+    def get_score(self, rider: Rider, driver: Driver) -> int:
+        """Returns the score of a rider and driver, NO_MATCH if not compatible.
+        """
+
+        return int(self._scores[self.get_rider_group(rider)][
+            self.get_driver_group(driver)])
+
+    def _get_tiers(self, g: int) -> list:
+        """Returns the tiers of rider group g, ranking them on first use.
+        """
+
+        tiers = self._tiers[g]
+        if tiers is not None:
+            return tiers
+
+        scores = self._scores[g]
+        groups = np.nonzero(scores != self.NO_MATCH)[0]
+        groups = groups[np.argsort(scores[groups], kind="stable")]
+
+        tiers = list()
+        for (score, driver_group) in zip(scores[groups].tolist(),
+                                         groups.tolist()):
+            if tiers and tiers[-1][0] == score:
+                tiers[-1][1].append(driver_group)
+            else:
+                tiers.append((score, [driver_group]))
+
+        self._tiers[g] = tiers
+        return tiers
+
+    def find_best_match(self, rider: Rider) -> Driver:
+        """Finds the driver with open seats that best matches the rider.
+
+        The best match is the driver with the lowest score, ties are broken by the
+        order of the drivers list.
+
+            Args:
+                rider:
+                    Rider object
+
+            Returns:
+                The best matching Driver, or None if no driver is compatible
+        """
+
+        g = self.get_rider_group(rider)
+        tiers = self._get_tiers(g)
+        t = self._next_tier[g]
+
+        while t < len(tiers):
+            best = None
+            for driver_group in tiers[t][1]:
+                group = self._open[driver_group]
+                if group and (best is None or group[0] < best):
+                    best = group[0]
+
+            if best is not None:
+                self._next_tier[g] = t
+                return self.drivers[best]
+
+            # every driver of the tier is full, for good
+            t += 1
+
+        self._next_tier[g] = t
+        return None
+
+    def find_candidates(self, rider: Rider) -> list:
+        """Finds every driver with open seats that is compatible with the rider.
+
+            Args:
+                rider:
+                    Rider object
+
+            Returns:
+                list of Driver objects, best match first. Drivers are ordered by
+                score, then by their order in the drivers list
+        """
+
+        candidates = list()
+        for (_, driver_groups) in self._get_tiers(self.get_rider_group(rider)):
+            columns = list()
+            for driver_group in driver_groups:
+                columns.extend(self._open[driver_group])
+
+            candidates.extend([self.drivers[j] for j in sorted(columns)])
+
+        return candidates
+
+    def take_seat(self, driver: Driver) -> None:
+        """Takes one seat in the driver's car, closing the driver once it is full.
+
+            Args:
+                driver:
+                    Driver object
+        """
+
+        self.seats[driver] -= 1
+
+        if self.seats[driver] <= 0:
+            j = self._columns[driver]
+            group = self._open[self._driver_groups[j]]
+
+            k = bisect.bisect_left(group, j)
+            if k < len(group) and group[k] == j:
+                del group[k]
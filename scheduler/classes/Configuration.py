@@ -1,6 +1,8 @@
 import toml
 import logging
 
+from scheduler.classes.RunContext import RunContext
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,6 +15,9 @@ class Configuration:
     A user can also specify a different configuration file
     using the -c|--config <filename> CLI option
 
+    The configuration of the active RunContext is used when there is one, the
+    process-wide configuration otherwise
+
     Attributes:
         _instance:
             instance of this class 
@@ -33,21 +38,28 @@ class Configuration:
     _config: dict = None
 
     @classmethod
-    def _set_config(cls, filename=None) -> None:
-        """Sets the instance configuration
+    def load(cls, filename=None) -> dict:
+        """Returns the defaults overridden by filename, or by user-config.toml
         """
 
         # get default configuration
-        cls._config = toml.load(cls._defaults_filename)
-        user_override = toml.load(cls._override_filename)
+        config = toml.load(cls._defaults_filename)
 
         if filename is not None:
             # override with user provided file
-            override = toml.load(filename)
-            cls._config.update(override)
+            config.update(toml.load(filename))
         else:
             # override with user-config.toml overrides
-            cls._config.update(user_override)
+            config.update(toml.load(cls._override_filename))
+
+        return config
+
+    @classmethod
+    def _set_config(cls, filename=None) -> None:
+        """Sets the instance configuration
+        """
+
+        cls._config = cls.load(filename)
 
     def __init__(self, config_file=None):
         # print("test", __name__)
@@ -64,6 +76,16 @@ class Configuration:
 
             Configuration._instance = self
 
+    @classmethod
+    def reset(cls, filename=None) -> dict:
+        """Replaces the process-wide configuration
+
+        filename: override file, user-config.toml when not provided
+        """
+
+        cls._instance = None
+        return cls.config(filename=filename)
+
     @classmethod
     def config(cls, path=None, filename=None) -> dict:
         """Get instance of this client
@@ -71,17 +93,23 @@ class Configuration:
         path: dot separated path to simplify access to nested tables
         """
 
-        if cls._instance is None:
-            Configuration(filename)
+        context = RunContext.current()
+
+        if context is not None:
+            config = context.config
+        else:
+            if cls._instance is None:
+                Configuration(filename)
+            config = cls._instance._config
 
         # get nested table dictionaries
         if path is not None:
             path = path.split(".")
-            data = cls._instance._config
+            data = config
 
             for p in path:
                 data = data[p]
 
             return data
 
-        return cls._instance._config
+        return config
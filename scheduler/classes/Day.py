@@ -1,3 +1,4 @@
+from datetime import date, timedelta
 import enum
 
 
@@ -57,6 +58,96 @@ def to_str(day_name: DayName) -> str:
     # TODO: defualt return
 
 
+def get_week_start(day: date) -> date:
+    """Returns the Monday of the week a run on the given date schedules.
+
+    Schedules are published ahead of the week they are for, so this is the date
+    itself on a Monday and the following Monday on any other day.
+    """
+
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(hour: int, minute: int = 0) -> int:
+    """Returns the time code of a time of day, the number of minutes since midnight.
+    """
+
+    return hour * 60 + minute
+
+
+def time_to_str(time: int) -> str:
+    """Returns a time code as a hh:mm <AM|PM> string.
+    """
+
+    hour, minute = divmod(time, 60)
+    return "{:02d}:{:02d} {}".format((hour - 1) % 12 + 1, minute,
+                                     "PM" if hour >= 12 else "AM")
+
+
+def _get_mask(bits: list) -> int:
+    """Returns an int with the given bits set.
+    """
+
+    mask = 0
+    for bit in bits:
+        mask |= 1 << bit
+
+    return mask
+
+
+def get_time_mask(times: list) -> int:
+    """Returns the bit set of a list of time codes, bit n is set for minute n.
+    """
+
+    return _get_mask(times)
+
+
+def get_location_mask(locations: list) -> int:
+    """Returns the bit set of a list of location ids, bit n is set for location n.
+    """
+
+    return _get_mask(locations)
+
+
+def earliest_time(mask: int) -> int:
+    """Returns the earliest time code in a time mask, or -1 if the mask is empty.
+    """
+
+    return (mask & -mask).bit_length() - 1
+
+
+def get_time_delta(times: list, time: int) -> int:
+    """Returns the number of minutes between time and the closest of times.
+
+    Returns:
+        The smallest difference in minutes, or -1 if times is empty
+    """
+
+    return min([abs(time - t) for t in times], default=-1)
+
+
+def get_time_score(delta: int, departure: int) -> int:
+    """Returns the score of a departure, lower is better.
+
+    Departures closer to one of the rider's times score better, departures that
+    are as close score better when they are earlier.
+
+    Args:
+        delta:
+            minutes between the departure and the closest of the rider's times
+        departure:
+            time code of the departure
+
+    Returns:
+        delta * MINUTES_PER_DAY + departure
+    """
+
+    return delta * MINUTES_PER_DAY + departure
+
+
 class DayInfo:
     """DayInfo class representing member departure times and locations
     for a given day
@@ -65,18 +156,29 @@ class DayInfo:
         day:
             DayName corresponding the day for which the information is true
         times:
-            list of times the member is willing to leave campus
+            list of times the member is willing to leave campus, as time codes
+            (minutes since midnight)
         locations:
-            list of locations from which the member is willing to depart
+            list of ids of the locations from which the member is willing to
+            depart, see LocationRegistry
+        time_mask:
+            bit set of the times, bit n is set for minute n
+        location_mask:
+            bit set of the locations, bit n is set for location id n
+
+        The masks are computed from times and locations when the DayInfo is
+        created.
 
     Typical Usage:
-        day = DayInfo(DayName.MONDAY, [6], ["NORTH", "CENTRAL"])
+        day = DayInfo(DayName.MONDAY, [to_minutes(18)], [north, central])
     """
 
     def __init__(self, day: DayName, times: list, locations: list):
         self.day: DayName = day
         self.times: list = times
         self.locations: list = locations
+        self.time_mask: int = get_time_mask(times or list())
+        self.location_mask: int = get_location_mask(locations or list())
 
     def __repr__(self):
         """ Return the representation of the object. """
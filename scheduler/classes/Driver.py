@@ -27,9 +27,11 @@ class Driver(Member):
             number of seats remaining in the car. Initialized to same number as seats param
 
     Typical Usage:
-        member = Driver("John Foo", "foo@bar.com", "9876543211", [DayInfo(DayName.MONDAY, [6], ["NORTH", "CENTRAL"])], false, "red toyota", 4)
+        member = Driver("John Foo", "foo@bar.com", "9876543211", [DayInfo(DayName.MONDAY, [1080], [0, 1])], false, "red toyota", 4)
     """
 
+    __slots__ = ("car_type", "seats", "seats_remaining")
+
     def __init__(self, name: str, email: str, phone: str, days: list,
                  is_dues_paying: bool, car_type: str, seats: int):
         super().__init__(name, email, phone, days, is_dues_paying)
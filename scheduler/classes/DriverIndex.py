@@ -0,0 +1,250 @@
+from bisect import bisect_left, bisect_right, insort
+
+from scheduler.classes.Driver import Driver
+from scheduler.classes.Rider import Rider
+import scheduler.classes.Day as Day
+
+
+class DriverIndex:
+    """Index of the drivers with open seats for a single day.
+
+    Drivers are bucketed by (location id, departure time), and for each location
+    the departure times that have a driver with open seats are kept in a sorted
+    list. A rider finds the drivers leaving within the tolerance window around
+    each of its times with a binary search in the lists of its own locations,
+    instead of scanning every driver. A driver leaves all of its buckets as soon
+    as it has no seats left.
+
+    Drivers are ranked by how close they leave to one of the rider's times, then
+    by departure time, then by their order in the drivers list the index was
+    built from. With a tolerance of 0 the driver leaving at the earliest of the
+    rider's times is the best match, the same driver find_best_match picks.
+
+    Seats are tracked in a seat ledger, a dictionary of Driver -> seats left on
+    the day, so the Driver objects themselves are never modified.
+
+    Attributes:
+        day:
+            Day.DayName enum of the day this index was built for
+        seats:
+            seat ledger, dictionary mapping Driver to the seats it has left on the day
+        tolerance:
+            largest number of minutes a driver may leave before or after one of
+            the rider's times
+        _buckets:
+            dictionary mapping (location, time) to a dictionary of Driver -> position
+        _times:
+            dictionary mapping location to the sorted list of times that have a
+            non empty bucket
+        _positions:
+            dictionary mapping Driver to its position in the original drivers list
+
+    Typical Usage:
+        index = DriverIndex(drivers, Day.DayName.TUESDAY, tolerance=15)
+        driver = index.find_best_match(rider)
+        if driver:
+            index.take_seat(driver)
+    """
+
+    def __init__(self,
+                 drivers: list,
+                 day: Day.DayName,
+                 seats: dict = None,
+                 tolerance: int = 0):
+        """Builds the index from a list of drivers.
+
+            Args:
+                drivers:
+                    list of Driver objects
+                day:
+                    Day.DayName enum of the day to index
+                seats:
+                    seat ledger to use, built from each driver's seats_remaining
+                    when not provided
+                tolerance:
+                    departure time tolerance window, in minutes
+        """
+
+        if seats is None:
+            seats = {driver: driver.seats_remaining for driver in drivers}
+
+        self.day: Day.DayName = day
+        self.seats: dict = seats
+        self.tolerance: int = tolerance
+        self._buckets: dict = dict()
+        self._times: dict = dict()
+        self._positions: dict = dict()
+
+        for (position, driver) in enumerate(drivers):
+            if seats.get(driver, 0) > 0:
+                self.add(driver, position)
+
+    def copy(self, seats: dict = None):
+        """Returns a copy of the index with its own seat ledger.
+
+        Copying the buckets is much cheaper than building them again from the
+        drivers' locations and times, so an index built once for a day can be
+        copied for every run that matches that day with the same drivers.
+
+            Args:
+                seats:
+                    seat ledger of the copy, built from each driver's
+                    seats_remaining when not provided. Drivers without seats in
+                    it are left out of the copy
+
+            Returns:
+                DriverIndex over the same drivers, day and tolerance
+        """
+
+        index = DriverIndex.__new__(DriverIndex)
+
+        if seats is None:
+            seats = {
+                driver: driver.seats_remaining for driver in self._positions
+            }
+
+        index.day = self.day
+        index.seats = seats
+        index.tolerance = self.tolerance
+        index._buckets = {
+            key: dict(bucket) for (key, bucket) in self._buckets.items()
+        }
+        index._times = {
+            location: list(times) for (location, times) in self._times.items()
+        }
+        index._positions = dict(self._positions)
+
+        for driver in list(index._positions):
+            if seats.get(driver, 0) <= 0:
+                index.remove(driver)
+
+        return index
+
+    def add(self, driver: Driver, position: int) -> None:
+        """Adds a driver to the buckets for each of its locations and times.
+
+            Args:
+                driver:
+                    Driver object
+                position:
+                    position of the driver in the drivers list, used to break ties
+        """
+
+        self._positions[driver] = position
+
+        for location in driver.get_locations(self.day):
+            for time in driver.get_times(self.day):
+                bucket = self._buckets.setdefault((location, time), dict())
+                if not bucket:
+                    insort(self._times.setdefault(location, list()), time)
+                bucket[driver] = position
+
+    def remove(self, driver: Driver) -> None:
+        """Removes a driver from every bucket it is in.
+
+            Args:
+                driver:
+                    Driver object
+        """
+
+        if self._positions.pop(driver, None) is None:
+            return
+
+        for location in driver.get_locations(self.day):
+            for time in driver.get_times(self.day):
+                bucket = self._buckets.get((location, time))
+                if bucket is None or bucket.pop(driver, None) is None:
+                    continue
+
+                if not bucket:
+                    times = self._times[location]
+                    del times[bisect_left(times, time)]
+
+    def _get_buckets(self, rider: Rider):
+        """Yields (delta, time, bucket) for every bucket in the rider's windows.
+
+        A bucket is yielded once for each of the rider's times it is in the
+        window of, with delta the minutes between the two times.
+        """
+
+        rider_times = rider.get_times(self.day)
+
+        for location in rider.get_locations(self.day):
+            times = self._times.get(location)
+            if not times:
+                continue
+
+            for rider_time in rider_times:
+                start = bisect_left(times, rider_time - self.tolerance)
+                end = bisect_right(times, rider_time + self.tolerance)
+
+                for time in times[start:end]:
+                    yield (abs(time - rider_time), time,
+                           self._buckets[(location, time)])
+
+    def find_best_match(self, rider: Rider) -> Driver:
+        """Finds the driver with open seats that best matches the rider.
+
+        The best match is the driver leaving closest to one of the rider's times
+        from any of the rider's locations, the earliest one if several are as
+        close. Only the buckets in the windows around the rider's own times and
+        at the rider's own locations are examined.
+
+            Args:
+                rider:
+                    Rider object
+
+            Returns:
+                The best matching Driver, or None if no driver is compatible
+        """
+
+        best_driver = None
+        best_key = None
+
+        for (delta, time, bucket) in self._get_buckets(rider):
+            # buckets are insertion ordered, the first driver is the one
+            # listed first in the drivers list
+            driver, position = next(iter(bucket.items()))
+            key = (delta, time, position)
+
+            if best_key is None or key < best_key:
+                best_driver = driver
+                best_key = key
+
+        return best_driver
+
+    def find_candidates(self, rider: Rider) -> list:
+        """Finds every driver with open seats that is compatible with the rider.
+
+            Args:
+                rider:
+                    Rider object
+
+            Returns:
+                list of Driver objects, best match first. Drivers are ordered by
+                how close they leave to one of the rider's times, then by
+                departure time, then by their order in the drivers list
+        """
+
+        candidates = dict()
+
+        for (delta, time, bucket) in self._get_buckets(rider):
+            for (driver, position) in bucket.items():
+                key = (delta, time, position)
+                if driver not in candidates or key < candidates[driver]:
+                    candidates[driver] = key
+
+        return sorted(candidates, key=candidates.__getitem__)
+
+    def take_seat(self, driver: Driver) -> None:
+        """Takes one seat in the driver's car, removing the driver once it is full.
+
+            Args:
+                driver:
+                    Driver object
+        """
+
+        self.seats[driver] -= 1
+
+        if self.seats[driver] <= 0:
+            self.remove(driver)
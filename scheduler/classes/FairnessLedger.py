@@ -0,0 +1,201 @@
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+class FairnessLedger:
+    """Persistent history of how often each member asked for and got a ride.
+
+    The ledger is an SQLite file with one row per member keyed by email, so
+    reading or updating a member is a primary key lookup no matter how many
+    semesters the ledger holds.
+
+    For every run the number of days each rider asked for a ride, got a ride and
+    did not get one are added to the rider's totals. The unmatched streak counts
+    the consecutive runs in which the rider missed out on at least one day; it is
+    reset by a run in which every requested day was matched. A rider's selection
+    weight is 1 + streak, so riders who keep missing out are picked earlier.
+
+    Attributes:
+        filename:
+            path of the SQLite file
+        _connection:
+            sqlite3 connection to the file
+
+    Typical Usage:
+        ledger = FairnessLedger("fairness_ledger.sqlite3")
+        ledger.apply_weights(riders)
+        .
+        .
+        ledger.record(riders, schedule)
+    """
+
+    def __init__(self, filename: str):
+        self.filename: str = filename
+        self._connection = sqlite3.connect(filename)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS ledger (
+                email TEXT PRIMARY KEY,
+                requested INTEGER NOT NULL DEFAULT 0,
+                matched INTEGER NOT NULL DEFAULT 0,
+                unmatched INTEGER NOT NULL DEFAULT 0,
+                unmatched_streak INTEGER NOT NULL DEFAULT 0
+            )""")
+        self._connection.commit()
+
+    @staticmethod
+    def _key(email: str) -> str:
+        """Normalizes an email for use as the ledger key.
+        """
+
+        return (email or "").strip().lower()
+
+    def get(self, email: str) -> (int, int, int, int):
+        """Returns a member's history.
+
+            Args:
+                email:
+                    the member's email
+
+            Returns:
+                (requested, matched, unmatched, unmatched streak), all 0 for a
+                member that is not in the ledger
+        """
+
+        row = self._connection.execute(
+            "SELECT requested, matched, unmatched, unmatched_streak "
+            "FROM ledger WHERE email = ?", (self._key(email),)).fetchone()
+
+        if row is None:
+            return 0, 0, 0, 0
+
+        return row
+
+    def weight(self, email: str) -> float:
+        """Returns the selection weight of a member, 1 + unmatched streak.
+        """
+
+        return 1.0 + self.get(email)[3]
+
+    def apply_weights(self, riders: list, previous: dict = None) -> None:
+        """Sets the selection_weight of every rider from the ledger.
+
+            Args:
+                riders:
+                    list of Rider objects
+                previous:
+                    outcome returned by record() for the run being redone, its
+                    riders get the weight they had before that run
+        """
+
+        previous = previous or dict()
+
+        for rider in riders:
+            key = self._key(rider.email)
+            if key in previous:
+                rider.selection_weight = 1.0 + previous[key][2]
+            else:
+                rider.selection_weight = self.weight(rider.email)
+
+    def _get_streaks(self, keys: list) -> dict:
+        """Returns a dictionary mapping the keys in the ledger to their streak.
+        """
+
+        streaks = dict()
+
+        # stay below SQLite's limit on the number of query parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            streaks.update(
+                self._connection.execute(
+                    "SELECT email, unmatched_streak FROM ledger "
+                    "WHERE email IN ({})".format(",".join("?" * len(chunk))),
+                    chunk).fetchall())
+
+        return streaks
+
+    def record(self, riders: list, schedule, previous: dict = None) -> dict:
+        """Adds the outcome of a run to the ledger.
+
+            Args:
+                riders:
+                    list of Rider objects that took part in the run
+                schedule:
+                    the run's schedule, an iterable of (Day.DayName, [Car]) tuples
+                previous:
+                    outcome returned by record() for an earlier schedule of the
+                    same run, taken out of the ledger before this one is added
+
+            Returns:
+                The outcome recorded, a dictionary mapping the key of each
+                member to [days requested, days matched, unmatched streak before
+                the run]
+        """
+
+        days = list()
+        matched = dict()
+
+        for (day, cars) in schedule:
+            days.append(day)
+            for car in cars:
+                for rider in car.riders:
+                    key = self._key(rider.email)
+                    matched[key] = matched.get(key, 0) + 1
+
+        # riders can have more than one response, totals are kept per email
+        requested = dict()
+        for rider in riders:
+            key = self._key(rider.email)
+            requested[key] = requested.get(key, 0) + sum(
+                [1 for day in days if rider.in_day(day)])
+
+        rows = list()
+        for (key, count) in requested.items():
+            if count == 0:
+                continue
+
+            got = min(matched.get(key, 0), count)
+            rows.append((count, got, count - got, 1 if got < count else 0,
+                         1 if got < count else 0, key))
+
+        previous = previous or dict()
+        outcome = dict()
+
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO ledger (email) VALUES (?)",
+                [(row[-1],) for row in rows])
+
+            self._connection.executemany(
+                "UPDATE ledger SET "
+                "requested = requested - ?, "
+                "matched = matched - ?, "
+                "unmatched = unmatched - ?, "
+                "unmatched_streak = ? "
+                "WHERE email = ?",
+                [(count, got, count - got, streak, key)
+                 for (key, (count, got, streak)) in previous.items()])
+
+            streaks = self._get_streaks([row[-1] for row in rows])
+            for row in rows:
+                outcome[row[-1]] = [row[0], row[1], streaks.get(row[-1], 0)]
+
+            self._connection.executemany(
+                "UPDATE ledger SET "
+                "requested = requested + ?, "
+                "matched = matched + ?, "
+                "unmatched = unmatched + ?, "
+                "unmatched_streak = (unmatched_streak + ?) * ? "
+                "WHERE email = ?", rows)
+
+        logger.info("Recorded %i members in fairness ledger %s", len(rows),
+                    self.filename)
+
+        return outcome
+
+    def close(self) -> None:
+        """Closes the ledger file.
+        """
+
+        self._connection.close()
@@ -0,0 +1,728 @@
+from collections import Counter
+import copy
+import itertools
+import json
+import random
+import threading
+import time
+
+from gspread.exceptions import APIError, SpreadsheetNotFound, WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range, numericise_all
+
+
+class FakeResponse:
+    """HTTP response returned by FakeClient.request and carried by its errors.
+
+    Attributes:
+        status_code:
+            HTTP status code
+        text:
+            body of the response
+    """
+
+    def __init__(self, status_code: int, body: dict):
+        self.status_code: int = status_code
+        self.text: str = json.dumps(body)
+        self._body: dict = body
+
+    def json(self) -> dict:
+        return self._body
+
+
+class FakeClient:
+    """In-process stand-in for a gspread Client, for runs without Google.
+
+    Spreadsheets are kept in memory. The subset of the gspread API the scheduler
+    uses is supported: opening, creating, sharing and deleting spreadsheets,
+    adding, duplicating and deleting worksheets, reading and writing values,
+    batch updates (merges and the formatting requests of gspread_formatting) and
+    the Drive file version request.
+
+    Every method that makes an API call with gspread counts one call here, under
+    the name of the API method, waits latency seconds and may fail with the
+    gspread APIError the API answers when the quota is used up. The counts tell
+    how many calls a run makes, the latency how long it takes against the API.
+
+    Wrap the client in an AuthorizedClient to use it for a run:
+
+        client = FakeClient(latency=0.05)
+        client.add_spreadsheet("responses", rows)
+        context = RunContext(config, client=AuthorizedClient(client))
+
+    Attributes:
+        latency:
+            seconds every API call takes
+        quota_error_rate:
+            probability of an API call failing with a quota error
+        quota_limit:
+            number of API calls allowed per quota_window seconds, calls over
+            the limit fail with a quota error. None for no limit
+        quota_window:
+            length in seconds of the window quota_limit applies to
+        calls:
+            Counter of the API calls made, by API method
+        spreadsheets:
+            dictionary mapping spreadsheet id to FakeSpreadsheet
+        _random:
+            random.Random deciding which calls fail
+        _call_times:
+            times of the API calls made within the last quota_window
+        _ids:
+            iterator of spreadsheet ids
+        _lock:
+            lock guarding the spreadsheets and counters
+    """
+
+    def __init__(self,
+                 latency: float = 0.0,
+                 quota_error_rate: float = 0.0,
+                 quota_limit: int = None,
+                 quota_window: float = 60.0,
+                 seed=None):
+        self.latency: float = latency
+        self.quota_error_rate: float = quota_error_rate
+        self.quota_limit: int = quota_limit
+        self.quota_window: float = quota_window
+        self.calls = Counter()
+        self.spreadsheets: dict = dict()
+
+        self._random = random.Random(seed)
+        self._call_times: list = list()
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    @property
+    def total_calls(self) -> int:
+        """Number of API calls made so far.
+        """
+
+        return sum(self.calls.values())
+
+    def _call(self, method: str) -> None:
+        """Counts an API call, waits for its latency and fails it if over quota.
+        """
+
+        with self._lock:
+            self.calls[method] += 1
+
+            now = time.monotonic()
+            self._call_times = [
+                t for t in self._call_times if now - t < self.quota_window
+            ]
+            self._call_times.append(now)
+
+            over_limit = (self.quota_limit is not None and
+                          len(self._call_times) > self.quota_limit)
+            failed = over_limit or (self.quota_error_rate > 0 and
+                                    self._random.random()
+                                    < self.quota_error_rate)
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if failed:
+            raise APIError(
+                FakeResponse(
+                    429, {
+                        "error": {
+                            "code": 429,
+                            "message": "Quota exceeded for quota metric "
+                                       "'Requests' of service "
+                                       "'sheets.googleapis.com'",
+                            "status": "RESOURCE_EXHAUSTED",
+                        }
+                    }))
+
+    def add_spreadsheet(self,
+                        title: str,
+                        rows: list = None,
+                        folder_id: str = None):
+        """Adds a spreadsheet without making an API call, to set up a run.
+
+            Args:
+                title:
+                    title of the spreadsheet
+                rows:
+                    list of rows of strings for the first worksheet
+                folder_id:
+                    id of the Drive folder holding the spreadsheet
+
+            Returns:
+                The new FakeSpreadsheet
+        """
+
+        with self._lock:
+            spreadsheet = FakeSpreadsheet(self,
+                                          "fake-{}".format(next(self._ids)),
+                                          title, folder_id)
+            spreadsheet._add_sheet({"title": "Sheet1"}, rows=rows)
+            self.spreadsheets[spreadsheet.id] = spreadsheet
+
+            return spreadsheet
+
+    def openall(self, title: str = None) -> list:
+        self._call("files.list")
+
+        with self._lock:
+            return [
+                s for s in self.spreadsheets.values()
+                if title is None or s.title == title
+            ]
+
+    def open(self, title: str):
+        self._call("files.list")
+
+        with self._lock:
+            for spreadsheet in self.spreadsheets.values():
+                if spreadsheet.title == title:
+                    return spreadsheet
+
+        raise SpreadsheetNotFound(title)
+
+    def open_by_key(self, key: str):
+        # gspread opens a spreadsheet by key without an API call
+        with self._lock:
+            if key not in self.spreadsheets:
+                raise SpreadsheetNotFound(key)
+
+            return self.spreadsheets[key]
+
+    def create(self, title: str, folder_id: str = None):
+        self._call("files.create")
+
+        return self.add_spreadsheet(title, folder_id=folder_id)
+
+    def del_spreadsheet(self, file_id: str) -> None:
+        self._call("files.delete")
+
+        with self._lock:
+            self.spreadsheets.pop(file_id, None)
+
+    def request(self,
+                method: str,
+                endpoint: str,
+                params: dict = None,
+                **kwargs) -> FakeResponse:
+        """Answers the Drive files.get request for a spreadsheet's version.
+        """
+
+        self._call("files.get")
+
+        file_id = endpoint.rstrip("/").split("/")[-1]
+
+        with self._lock:
+            if method.lower() != "get" or file_id not in self.spreadsheets:
+                raise APIError(
+                    FakeResponse(
+                        404, {
+                            "error": {
+                                "code": 404,
+                                "message": "File not found: " + file_id
+                            }
+                        }))
+
+            return FakeResponse(200, {
+                "id": file_id,
+                "version": str(self.spreadsheets[file_id].version)
+            })
+
+
+class FakeSpreadsheet:
+    """Spreadsheet kept in memory by a FakeClient.
+
+    Attributes:
+        client:
+            FakeClient holding the spreadsheet
+        id:
+            spreadsheet id
+        title:
+            spreadsheet title
+        folder_id:
+            id of the Drive folder holding the spreadsheet
+        version:
+            Drive version, increased by every change
+        permissions:
+            list of the permissions given with share()
+        requests:
+            list of every batch_update request made on the spreadsheet
+        _sheets:
+            list of the FakeWorksheets, in tab order
+    """
+
+    def __init__(self, client: FakeClient, id: str, title: str, folder_id: str):
+        self.client: FakeClient = client
+        self.id: str = id
+        self.title: str = title
+        self.folder_id: str = folder_id
+        self.version: int = 1
+        self.permissions: list = list()
+        self.requests: list = list()
+
+        self._sheets: list = list()
+
+    def _add_sheet(self, properties: dict, rows: list = None, index=None):
+        """Adds a worksheet with the given properties, returns it.
+        """
+
+        grid = properties.get("gridProperties", dict())
+        rows = [list(row) for row in rows or list()]
+
+        sheet_id = properties.get("sheetId")
+        if sheet_id is None:
+            sheet_id = max([ws.id + 1 for ws in self._sheets] + [0])
+
+        self._check_unique(sheet_id, properties["title"])
+
+        worksheet = FakeWorksheet(
+            self, sheet_id, properties["title"],
+            max(grid.get("rowCount", 1000), len(rows)),
+            max([grid.get("columnCount", 26)] + [len(row) for row in rows]),
+            rows)
+
+        if index is None:
+            index = len(self._sheets)
+        self._sheets.insert(index, worksheet)
+
+        return worksheet
+
+    def _check_unique(self, sheet_id, title: str) -> None:
+        """Fails like the API when a worksheet id or title is already taken.
+        """
+
+        for worksheet in self._sheets:
+            if worksheet.id == sheet_id or worksheet.title == title:
+                raise APIError(
+                    FakeResponse(
+                        400, {
+                            "error": {
+                                "code": 400,
+                                "message":
+                                    "A sheet with the name \"{}\" or id {} "
+                                    "already exists".format(title, sheet_id)
+                            }
+                        }))
+
+    def _get_sheet(self, sheet_id: int):
+        """Returns the worksheet with the given id.
+        """
+
+        for worksheet in self._sheets:
+            if worksheet.id == sheet_id:
+                return worksheet
+
+        raise APIError(
+            FakeResponse(
+                400, {
+                    "error": {
+                        "code": 400,
+                        "message": "No grid with id: {}".format(sheet_id)
+                    }
+                }))
+
+    def _get_range(self, range_name: str):
+        """Returns the worksheet and grid range of a range in A1 notation.
+        """
+
+        title, _, a1 = range_name.rpartition("!")
+        if not title:
+            title, a1 = a1, ""
+
+        title = title.strip("'").replace("''", "'")
+
+        for worksheet in self._sheets:
+            if worksheet.title == title:
+                return worksheet, a1_range_to_grid_range(a1) if a1 else dict()
+
+        raise APIError(
+            FakeResponse(
+                400, {
+                    "error": {
+                        "code": 400,
+                        "message": "Unable to parse range: " + range_name
+                    }
+                }))
+
+    def _metadata(self) -> dict:
+        return {
+            "spreadsheetId":
+                self.id,
+            "properties": {
+                "title": self.title
+            },
+            "sheets": [{
+                "properties": worksheet.properties
+            } for worksheet in self._sheets],
+        }
+
+    def fetch_sheet_metadata(self, params: dict = None) -> dict:
+        self.client._call("spreadsheets.get")
+
+        with self.client._lock:
+            return self._metadata()
+
+    def worksheets(self) -> list:
+        self.client._call("spreadsheets.get")
+
+        with self.client._lock:
+            return list(self._sheets)
+
+    def get_worksheet(self, index: int):
+        self.client._call("spreadsheets.get")
+
+        with self.client._lock:
+            if 0 <= index < len(self._sheets):
+                return self._sheets[index]
+
+            return None
+
+    def worksheet(self, title: str):
+        self.client._call("spreadsheets.get")
+
+        with self.client._lock:
+            for worksheet in self._sheets:
+                if worksheet.title == title:
+                    return worksheet
+
+        raise WorksheetNotFound(title)
+
+    @property
+    def sheet1(self):
+        return self.get_worksheet(0)
+
+    def add_worksheet(self, title: str, rows: int, cols: int, index=None):
+        reply = self.batch_update({
+            "requests": [{
+                "addSheet": {
+                    "properties": {
+                        "title": title,
+                        "index": index,
+                        "gridProperties": {
+                            "rowCount": rows,
+                            "columnCount": cols
+                        },
+                    }
+                }
+            }]
+        })
+
+        return self._get_sheet(
+            reply["replies"][0]["addSheet"]["properties"]["sheetId"])
+
+    def duplicate_sheet(self,
+                        source_sheet_id: int,
+                        insert_sheet_index: int = None,
+                        new_sheet_id: int = None,
+                        new_sheet_name: str = None):
+        reply = self.batch_update({
+            "requests": [{
+                "duplicateSheet": {
+                    "sourceSheetId": source_sheet_id,
+                    "insertSheetIndex": insert_sheet_index,
+                    "newSheetName": new_sheet_name,
+                }
+            }]
+        })
+
+        return self._get_sheet(
+            reply["replies"][0]["duplicateSheet"]["properties"]["sheetId"])
+
+    def del_worksheet(self, worksheet) -> None:
+        self.batch_update(
+            {"requests": [{
+                "deleteSheet": {
+                    "sheetId": worksheet.id
+                }
+            }]})
+
+    def share(self,
+              value: str,
+              perm_type: str,
+              role: str,
+              notify: bool = True,
+              email_message: str = None,
+              with_link: bool = False) -> None:
+        self.client._call("permissions.create")
+
+        with self.client._lock:
+            self.permissions.append({
+                "value": value,
+                "perm_type": perm_type,
+                "role": role
+            })
+
+    def batch_update(self, body: dict) -> dict:
+        """Applies a spreadsheets.batchUpdate request body.
+
+        Sheets are added, duplicated, deleted and renamed and cells merged.
+        Formatting requests are kept in requests but do not change the values.
+        """
+
+        self.client._call("spreadsheets.batchUpdate")
+
+        with self.client._lock:
+            replies = list()
+
+            for request in body.get("requests", list()):
+                self.requests.append(copy.deepcopy(request))
+                replies.append(self._apply(request))
+
+            self.version += 1
+
+            return {"spreadsheetId": self.id, "replies": replies}
+
+    def _apply(self, request: dict) -> dict:
+        """Applies a single batch_update request, returns its reply.
+        """
+
+        if "addSheet" in request:
+            properties = request["addSheet"].get("properties", dict())
+            worksheet = self._add_sheet(properties,
+                                        index=properties.get("index"))
+            return {"addSheet": {"properties": worksheet.properties}}
+
+        if "duplicateSheet" in request:
+            duplicate = request["duplicateSheet"]
+            source = self._get_sheet(duplicate["sourceSheetId"])
+            index = duplicate.get("insertSheetIndex")
+            if index is None:
+                index = self._sheets.index(source) + 1
+
+            worksheet = self._add_sheet(
+                {
+                    "title":
+                        duplicate.get("newSheetName")
+                        or "Copy of " + source.title,
+                    "gridProperties": {
+                        "rowCount": source.row_count,
+                        "columnCount": source.col_count,
+                    },
+                },
+                rows=source._values,
+                index=index)
+            worksheet.merges = list(source.merges)
+
+            return {"duplicateSheet": {"properties": worksheet.properties}}
+
+        if "deleteSheet" in request:
+            self._sheets.remove(
+                self._get_sheet(request["deleteSheet"]["sheetId"]))
+            return dict()
+
+        if "updateSheetProperties" in request:
+            properties = request["updateSheetProperties"]["properties"]
+            worksheet = self._get_sheet(properties.get("sheetId", 0))
+            if "title" in properties and properties["title"] != worksheet.title:
+                self._check_unique(None, properties["title"])
+                worksheet.title = properties["title"]
+            grid = properties.get("gridProperties", dict())
+            worksheet.row_count = grid.get("rowCount", worksheet.row_count)
+            worksheet.col_count = grid.get("columnCount", worksheet.col_count)
+            return dict()
+
+        if "mergeCells" in request:
+            grid_range = request["mergeCells"]["range"]
+            self._get_sheet(grid_range.get("sheetId",
+                                           0)).merges.append(dict(grid_range))
+            return dict()
+
+        return dict()
+
+    def values_get(self, range_name: str, params: dict = None) -> dict:
+        self.client._call("spreadsheets.values.get")
+
+        with self.client._lock:
+            worksheet, grid_range = self._get_range(range_name)
+
+            return {
+                "range": range_name,
+                "majorDimension": "ROWS",
+                "values": worksheet._read(grid_range),
+            }
+
+    def values_batch_update(self,
+                            params: dict = None,
+                            body: dict = None) -> dict:
+        self.client._call("spreadsheets.values.batchUpdate")
+
+        with self.client._lock:
+            updated = 0
+
+            for value_range in body.get("data", list()):
+                worksheet, grid_range = self._get_range(value_range["range"])
+                updated += worksheet._write(grid_range, value_range["values"])
+
+            self.version += 1
+
+            return {"spreadsheetId": self.id, "totalUpdatedCells": updated}
+
+
+class FakeWorksheet:
+    """Worksheet kept in memory by a FakeSpreadsheet.
+
+    Values are stored as strings. Like the API, reads leave out empty cells at
+    the end of a row and empty rows at the end of a range, and reads outside of
+    the grid fail.
+
+    Attributes:
+        spreadsheet:
+            FakeSpreadsheet holding the worksheet
+        id:
+            worksheet id
+        title:
+            worksheet title
+        row_count:
+            number of rows of the grid
+        col_count:
+            number of columns of the grid
+        merges:
+            list of the grid ranges merged with merge_cells
+        _values:
+            list of rows of strings, shorter than the grid where it is empty
+    """
+
+    def __init__(self, spreadsheet: FakeSpreadsheet, id: int, title: str,
+                 row_count: int, col_count: int, values: list):
+        self.spreadsheet: FakeSpreadsheet = spreadsheet
+        self.id: int = id
+        self.title: str = title
+        self.row_count: int = row_count
+        self.col_count: int = col_count
+        self.merges: list = list()
+        self._values: list = [[str(cell) for cell in row] for row in values]
+
+    @property
+    def properties(self) -> dict:
+        return {
+            "sheetId": self.id,
+            "title": self.title,
+            "index": self.spreadsheet._sheets.index(self),
+            "sheetType": "GRID",
+            "gridProperties": {
+                "rowCount": self.row_count,
+                "columnCount": self.col_count,
+            },
+        }
+
+    def _get_bounds(self, grid_range: dict) -> (int, int, int, int):
+        """Returns the 0 based start and end of a grid range, checked against the grid.
+        """
+
+        bounds = (grid_range.get("startRowIndex", 0),
+                  grid_range.get("endRowIndex", self.row_count),
+                  grid_range.get("startColumnIndex", 0),
+                  grid_range.get("endColumnIndex", self.col_count))
+
+        if bounds[1] > self.row_count or bounds[3] > self.col_count:
+            raise APIError(
+                FakeResponse(
+                    400, {
+                        "error": {
+                            "code": 400,
+                            "message": "Range ({}) exceeds grid limits. Max "
+                                       "rows: {}, max columns: {}".format(
+                                           self.title, self.row_count,
+                                           self.col_count)
+                        }
+                    }))
+
+        return bounds
+
+    def _read(self, grid_range: dict) -> list:
+        """Returns the values of a grid range, trimmed like the API trims them.
+        """
+
+        (start_row, end_row, start_col, end_col) = self._get_bounds(grid_range)
+
+        rows = list()
+        for row in self._values[start_row:end_row]:
+            cells = row[start_col:end_col]
+            while cells and cells[-1] == "":
+                cells.pop()
+            rows.append(cells)
+
+        while rows and not rows[-1]:
+            rows.pop()
+
+        return rows
+
+    def _write(self, grid_range: dict, values: list) -> int:
+        """Writes values from the top left of a grid range, returns the cell count.
+
+        The grid grows to fit the values, as it does with the values API.
+        """
+
+        start_row = grid_range.get("startRowIndex", 0)
+        start_col = grid_range.get("startColumnIndex", 0)
+
+        self.row_count = max(self.row_count, start_row + len(values))
+        self.col_count = max([self.col_count] +
+                             [start_col + len(row) for row in values])
+
+        while len(self._values) < start_row + len(values):
+            self._values.append(list())
+
+        for (i, row) in enumerate(values):
+            target = self._values[start_row + i]
+            if len(target) < start_col + len(row):
+                target.extend([""] * (start_col + len(row) - len(target)))
+            for (j, value) in enumerate(row):
+                target[start_col + j] = "" if value is None else str(value)
+
+        return sum([len(row) for row in values])
+
+    def _range_name(self, range_name: str = None) -> str:
+        title = "'{}'".format(self.title.replace("'", "''"))
+        return title + "!" + range_name if range_name else title
+
+    def get(self, range_name: str = None, **kwargs) -> list:
+        return self.spreadsheet.values_get(self._range_name(range_name)).get(
+            "values", list())
+
+    def get_all_values(self, **kwargs) -> list:
+        return self.get()
+
+    def get_all_records(self,
+                        empty2zero: bool = False,
+                        head: int = 1,
+                        default_blank: str = "",
+                        **kwargs) -> list:
+        data = self.get_all_values()
+        if len(data) < head:
+            return list()
+
+        keys = data[head - 1]
+        records = list()
+        for row in data[head:]:
+            row = row + [""] * (len(keys) - len(row))
+            records.append(
+                dict(zip(keys, numericise_all(row, empty2zero, default_blank))))
+
+        return records
+
+    def update(self, range_name: str, values: list, **kwargs) -> dict:
+        return self.batch_update([{"range": range_name, "values": values}])
+
+    def batch_update(self, data: list, **kwargs) -> dict:
+        return self.spreadsheet.values_batch_update(
+            body={
+                "valueInputOption":
+                    "USER_ENTERED",
+                "data": [
+                    dict(value_range,
+                         range=self._range_name(value_range["range"]))
+                    for value_range in data
+                ],
+            })
+
+    def merge_cells(self, name: str, merge_type: str = "MERGE_ALL") -> dict:
+        grid_range = a1_range_to_grid_range(name)
+        grid_range["sheetId"] = self.id
+
+        return self.spreadsheet.batch_update({
+            "requests": [{
+                "mergeCells": {
+                    "mergeType": merge_type,
+                    "range": grid_range
+                }
+            }]
+        })
@@ -0,0 +1,146 @@
+import heapq
+
+
+class FlowNetwork:
+    """Directed flow network solved as a min-cost max-flow problem.
+
+    Uses successive shortest augmenting paths with Dijkstra and node potentials,
+    so edge costs must be non-negative. Every augmentation pushes as much flow
+    as the path allows, which keeps the number of iterations small when the
+    network is built over groups of identical riders and drivers.
+
+    Attributes:
+        node_count:
+            number of nodes in the network, nodes are integers 0..node_count-1
+        _graph:
+            adjacency list, for each node a list of edge ids leaving that node
+        _to:
+            list of the head node of every edge
+        _cap:
+            list of the residual capacity of every edge
+        _cost:
+            list of the cost per unit of flow of every edge
+
+    Typical Usage:
+        network = FlowNetwork(4)
+        edge = network.add_edge(0, 1, 2, 0)
+        .
+        .
+        flow, cost = network.min_cost_max_flow(0, 3)
+        network.flow(edge)
+    """
+
+    def __init__(self, node_count: int):
+        self.node_count: int = node_count
+        self._graph: list = [list() for _ in range(node_count)]
+        self._to: list = list()
+        self._cap: list = list()
+        self._cost: list = list()
+
+    def add_edge(self, u: int, v: int, capacity: int, cost: int) -> int:
+        """Adds an edge from u to v along with its residual reverse edge.
+
+            Args:
+                u:
+                    tail node
+                v:
+                    head node
+                capacity:
+                    maximum flow through the edge
+                cost:
+                    non-negative cost per unit of flow
+
+            Returns:
+                The id of the edge, used to read back its flow
+        """
+
+        edge = len(self._to)
+
+        self._graph[u].append(edge)
+        self._to.append(v)
+        self._cap.append(capacity)
+        self._cost.append(cost)
+
+        self._graph[v].append(edge + 1)
+        self._to.append(u)
+        self._cap.append(0)
+        self._cost.append(-cost)
+
+        return edge
+
+    def flow(self, edge: int) -> int:
+        """Returns the flow through an edge after solving.
+
+        The flow of an edge is the residual capacity of its reverse edge.
+        """
+
+        return self._cap[edge ^ 1]
+
+    def min_cost_max_flow(self, source: int, sink: int) -> (int, int):
+        """Pushes the maximum flow from source to sink at the minimum total cost.
+
+            Args:
+                source:
+                    source node
+                sink:
+                    sink node
+
+            Returns:
+                (int, int)
+                [0] -> total flow
+                [1] -> total cost of the flow
+        """
+
+        total_flow = 0
+        total_cost = 0
+        potential = [0] * self.node_count
+
+        while True:
+            dist = [None] * self.node_count
+            prev_edge = [None] * self.node_count
+            dist[source] = 0
+            queue = [(0, source)]
+
+            while queue:
+                d, u = heapq.heappop(queue)
+                if d > dist[u]:
+                    continue
+
+                for edge in self._graph[u]:
+                    if self._cap[edge] <= 0:
+                        continue
+
+                    v = self._to[edge]
+                    nd = d + self._cost[edge] + potential[u] - potential[v]
+                    if dist[v] is None or nd < dist[v]:
+                        dist[v] = nd
+                        prev_edge[v] = edge
+                        heapq.heappush(queue, (nd, v))
+
+            if dist[sink] is None:
+                break
+
+            for node in range(self.node_count):
+                if dist[node] is not None:
+                    potential[node] += dist[node]
+
+            # find the bottleneck capacity along the path
+            push = None
+            node = sink
+            while node != source:
+                edge = prev_edge[node]
+                if push is None or self._cap[edge] < push:
+                    push = self._cap[edge]
+                node = self._to[edge ^ 1]
+
+            node = sink
+            while node != source:
+                edge = prev_edge[node]
+                self._cap[edge] -= push
+                self._cap[edge ^ 1] += push
+                total_cost += push * self._cost[edge]
+                node = self._to[edge ^ 1]
+
+            total_flow += push
+
+        return total_flow, total_cost
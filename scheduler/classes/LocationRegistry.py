@@ -0,0 +1,157 @@
+import logging
+
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.RunContext import RunContext
+
+logger = logging.getLogger(__name__)
+
+
+class LocationRegistry:
+    """Meeting locations members can be picked up at.
+
+    Every location has a name and an integer id, ids are handed out in the order
+    locations are registered starting at 0. Members store the ids of their
+    locations, and a set of locations is stored as a bit mask with bit id set for
+    each location, so any number of pickup points is supported and two members
+    share a location when the AND of their masks is not 0.
+
+    The locations are loaded from the [locations] table of the configuration,
+    which maps each location name to the labels the form uses for it:
+
+        [locations]
+        NORTH = ["North Campus (Pierpont Commons)"]
+        CENTRAL = ["Central Campus (The Cube)"]
+
+    Attributes:
+        names:
+            list of location names, indexed by id
+        _ids:
+            dictionary mapping location name and form labels to id
+        _instance:
+            instance of this class, built from the configuration. An active
+            RunContext has its own instance
+
+    Typical Usage:
+        registry = LocationRegistry.get_instance()
+        location = registry.parse("North Campus (Pierpont Commons)")
+        registry.to_str(location)
+    """
+
+    _instance = None
+
+    def __init__(self, locations: dict = None):
+        """Builds a registry.
+
+            Args:
+                locations:
+                    dictionary mapping location names to lists of form labels
+        """
+
+        self.names: list = list()
+        self._ids: dict = dict()
+
+        for (name, labels) in (locations or dict()).items():
+            self.register(name, labels)
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Get the registry of the configured locations
+        """
+
+        context = RunContext.current()
+        if context is not None:
+            return context.instance(
+                cls, lambda: cls(Configuration.config().get("locations")))
+
+        if cls._instance is None:
+            cls._instance = cls(Configuration.config().get("locations"))
+        return cls._instance
+
+    @classmethod
+    def reset(cls):
+        """
+        Forget the registry, so the next get_instance reads the configuration again
+        """
+
+        context = RunContext.current()
+        if context is not None:
+            context.set_instance(cls, None)
+        else:
+            cls._instance = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def register(self, name: str, labels: list = None) -> int:
+        """Adds a location, or more labels for an existing location.
+
+            Args:
+                name:
+                    location name
+                labels:
+                    list of form labels for the location
+
+            Returns:
+                The id of the location
+        """
+
+        location = self._ids.get(name)
+
+        if location is None:
+            location = len(self.names)
+            self.names.append(name)
+            self._ids[name] = location
+
+        for label in labels or list():
+            self._ids[label] = location
+
+        return location
+
+    def get_id(self, name: str) -> int:
+        """Returns the id of a location name or form label.
+
+            Raises:
+                ValueError if the location is not registered
+        """
+
+        location = self._ids.get(name)
+
+        if location is None:
+            raise ValueError("Unknown location: {}".format(name))
+
+        return location
+
+    def parse(self, label: str) -> int:
+        """Returns the id of the location a form label stands for.
+
+            Args:
+                label:
+                    form label or location name
+
+            Returns:
+                The location id, or None if the label is not registered
+        """
+
+        location = self._ids.get(label.strip())
+
+        if location is None:
+            logger.warning("Unknown location: %s", label)
+
+        return location
+
+    def to_str(self, location: int) -> str:
+        """Returns the name of a location id.
+        """
+
+        return self.names[location]
+
+    def get_mask(self, names: list) -> int:
+        """Returns the location mask of a list of location names or form labels.
+        """
+
+        mask = 0
+        for name in names:
+            mask |= 1 << self.get_id(name)
+
+        return mask
@@ -16,11 +16,18 @@ class Member:
             participating in the carpools
         is_dues_paying:
             boolean value, true if this member has paid club membership dues, false otherwise
+        selection_weight:
+            weight of the member when riders are ordered for selection, members
+            with a higher weight tend to be picked earlier. Defaults to 1.0
 
     Typical Usage:
-        member = Member("John Foo", "foo@bar.com", "9876543211", [DayInfo(DayName.MONDAY, [6, 7, 8], ["NORTH", "CENTRAL"])], false)
+        member = Member("John Foo", "foo@bar.com", "9876543211", [DayInfo(DayName.MONDAY, [1080, 1140, 1200], [0, 1])], false)
     """
 
+    # no __dict__, so the many MemberTable views of a run stay small
+    __slots__ = ("name", "email", "phone", "days", "is_dues_paying",
+                 "selection_weight")
+
     # TODO: phone number str or int? I'm thinking str
     def __init__(self, name: str, email: str, phone: str, days: list,
                  is_dues_paying: bool):
@@ -29,6 +36,14 @@ class Member:
         self.phone: str = phone
         self.days: list = days
         self.is_dues_paying: bool = is_dues_paying
+        self.selection_weight: float = 1.0
+
+    def in_day(self, day: Day.DayName) -> bool:
+        for d in self.days:
+            if d.day == day:
+                return True
+
+        return False
 
     def get_locations(self, day: Day.DayName) -> list():
         for d in self.days:
@@ -42,4 +57,18 @@ class Member:
             if d.day == day:
                 return d.times
 
-        return list()
\ No newline at end of file
+        return list()
+
+    def get_location_mask(self, day: Day.DayName) -> int:
+        for d in self.days:
+            if d.day == day:
+                return d.location_mask
+
+        return 0
+
+    def get_time_mask(self, day: Day.DayName) -> int:
+        for d in self.days:
+            if d.day == day:
+                return d.time_mask
+
+        return 0
\ No newline at end of file
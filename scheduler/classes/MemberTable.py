@@ -0,0 +1,475 @@
+from array import array
+
+from scheduler.classes.Driver import Driver
+from scheduler.classes.Rider import Rider
+import scheduler.classes.Day as Day
+
+
+class MaskPool:
+    """The distinct masks of a MemberTable mask column, each stored once.
+
+    Rows of the column hold the number of their mask in the pool, so a mask is
+    kept once however many rows have it.
+
+    Attributes:
+        masks:
+            list of the distinct masks by number, the empty mask 0 is number 0
+        bits:
+            list of the set bits of each mask, ascending, by number
+        _numbers:
+            dictionary mapping each mask to its number
+
+    Typical Usage:
+        pool = MaskPool()
+        number = pool.add(Day.get_time_mask(times))
+        times = pool.bits[number]
+    """
+
+    def __init__(self, masks: list = None):
+        self.masks: list = list()
+        self.bits: list = list()
+        self._numbers: dict = dict()
+
+        self.add(0)
+        for mask in masks or list():
+            self.add(mask)
+
+        if masks and len(self.masks) != len(masks):
+            raise ValueError("pool masks must be distinct and start with 0")
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def add(self, mask: int) -> int:
+        """Adds a mask not seen before, returns the number of the mask.
+        """
+
+        number = self._numbers.get(mask)
+        if number is None:
+            number = len(self.masks)
+            self._numbers[mask] = number
+            self.masks.append(mask)
+            self.bits.append(
+                [bit for bit in range(mask.bit_length()) if mask >> bit & 1])
+
+        return number
+
+
+class MemberTable:
+    """Columnar (struct-of-arrays) storage for riders and drivers.
+
+    Each row of the table is one member in one role, a member who both rides and
+    drives has a row for each. Rows are indexed by member id. Per day columns are
+    stored for the days the table was built for only, at index
+    member_id * len(days) + day column.
+
+    A member's locations and times for a day are each stored as a single integer
+    mask, as in DayInfo: bit n of a location mask is set for LocationRegistry id
+    n and bit n of a time mask for the time code of minute n. The masks are
+    Python ints, so any number of locations and times is supported. Every
+    distinct mask is kept once in a MaskPool, together with its sorted ids or
+    time codes, and the per day columns only hold the mask's number in the pool.
+
+    Rider and Driver views over the rows are handed out by riders() and drivers()
+    for code that works with member objects.
+
+    Attributes:
+        days:
+            list of Day.DayName enums the table stores day columns for
+        names:
+            list of member names
+        emails:
+            list of member emails
+        phones:
+            list of member phone numbers
+        car_types:
+            list of car types, "" for riders
+        is_driver:
+            array of 1 for driver rows and 0 for rider rows
+        is_dues_paying:
+            array of 1 for dues paying members and 0 otherwise
+        seats:
+            array of seat counts, 0 for riders
+        day_bits:
+            array of per member bit sets, bit k is set if the member takes part on days[k]
+        location_masks:
+            array of per member per day location mask numbers in locations
+        time_masks:
+            array of per member per day time mask numbers in times
+        locations:
+            MaskPool of the distinct location masks
+        times:
+            MaskPool of the distinct time masks
+
+    Typical Usage:
+        table = MemberTable.from_members(riders, drivers, days)
+        riders, drivers = table.riders(), table.drivers()
+    """
+
+    def __init__(self, days: list):
+        self.days: list = list(days)
+        self.names: list = list()
+        self.emails: list = list()
+        self.phones: list = list()
+        self.car_types: list = list()
+        self.is_driver = array("b")
+        self.is_dues_paying = array("b")
+        self.seats = array("H")
+        self.day_bits = array("H")
+        self.location_masks = array("q")
+        self.time_masks = array("q")
+        self.locations: MaskPool = MaskPool()
+        self.times: MaskPool = MaskPool()
+
+        # indexed by DayName value, _value_ is read directly as it is a plain
+        # attribute, unlike value, and DayName's hash is computed in Python
+        self._day_columns: list = [None] * len(Day.DayName)
+        for (k, day) in enumerate(self.days):
+            self._day_columns[day._value_] = k
+        self._riders: list = list()
+        self._drivers: list = list()
+
+    @classmethod
+    def from_members(cls, riders: list, drivers: list, days: list):
+        """Builds a table from lists of Rider and Driver objects.
+
+            Args:
+                riders:
+                    list of Rider objects
+                drivers:
+                    list of Driver objects
+                days:
+                    list of Day.DayName enums to store day columns for
+
+            Returns:
+                A MemberTable
+        """
+
+        table = cls(days)
+
+        for rider in riders:
+            table.add(rider.name, rider.email, rider.phone, rider.days,
+                      rider.is_dues_paying)
+
+        for driver in drivers:
+            table.add(driver.name,
+                      driver.email,
+                      driver.phone,
+                      driver.days,
+                      driver.is_dues_paying,
+                      car_type=driver.car_type,
+                      seats=driver.seats)
+
+        return table
+
+    @classmethod
+    def from_columns(cls, days: list, columns: dict):
+        """Builds a table from columns saved from another table.
+
+            Args:
+                days:
+                    list of Day.DayName enums of the day columns
+                columns:
+                    dictionary mapping the names of the list and array attributes
+                    (names, emails, ..., time_masks) to their values, and
+                    locations and times to the lists of masks of their pools
+
+            Returns:
+                A MemberTable
+
+            Raises:
+                ValueError if a mask column refers to a mask its pool does not have
+        """
+
+        table = cls(days)
+
+        for (name, values) in columns.items():
+            if name in ("locations", "times"):
+                setattr(table, name, MaskPool(values))
+            else:
+                getattr(table, name).extend(values)
+
+        for (numbers, pool) in ((table.location_masks, table.locations),
+                                (table.time_masks, table.times)):
+            if numbers and not 0 <= min(numbers) <= max(numbers) < len(pool):
+                raise ValueError("mask number out of range")
+
+        for member_id in range(len(table)):
+            if table.is_driver[member_id]:
+                table._drivers.append(DriverView(table, member_id))
+            else:
+                table._riders.append(RiderView(table, member_id))
+
+        return table
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self,
+            name: str,
+            email: str,
+            phone: str,
+            days: list,
+            is_dues_paying: bool,
+            car_type: str = None,
+            seats: int = None) -> int:
+        """Adds a member to the table.
+
+        A member with seats is a driver, otherwise it is a rider. Days that the
+        table does not store a column for are dropped.
+
+            Args:
+                name:
+                    string of member name
+                email:
+                    string of member email
+                phone:
+                    string of member phone number
+                days:
+                    list of DayInfo objects
+                is_dues_paying:
+                    True if the member has paid dues
+                car_type:
+                    string of the driver's car type
+                seats:
+                    number of seats for riders, None for riders
+
+            Returns:
+                The member id of the new row
+        """
+
+        member_id = len(self.names)
+        is_driver = seats is not None
+
+        self.names.append(name)
+        self.emails.append(email)
+        self.phones.append(phone)
+        self.car_types.append(car_type or "")
+        self.is_driver.append(1 if is_driver else 0)
+        self.is_dues_paying.append(1 if is_dues_paying else 0)
+        self.seats.append(seats or 0)
+
+        location_masks = [0] * len(self.days)
+        time_masks = [0] * len(self.days)
+        day_bits = 0
+
+        for d in days or list():
+            k = self._day_columns[d.day._value_]
+            if k is None:
+                continue
+
+            day_bits |= 1 << k
+            location_masks[k] = self.locations.add(
+                Day.get_location_mask(d.locations or list()))
+            time_masks[k] = self.times.add(Day.get_time_mask(d.times or list()))
+
+        self.day_bits.append(day_bits)
+        self.location_masks.extend(location_masks)
+        self.time_masks.extend(time_masks)
+
+        if is_driver:
+            self._drivers.append(DriverView(self, member_id))
+        else:
+            self._riders.append(RiderView(self, member_id))
+
+        return member_id
+
+    def riders(self) -> list:
+        """Returns a list of Rider views, one per rider row.
+        """
+
+        return list(self._riders)
+
+    def drivers(self) -> list:
+        """Returns a list of Driver views, one per driver row.
+        """
+
+        return list(self._drivers)
+
+    def in_day(self, member_id: int, day: Day.DayName) -> bool:
+        """Returns True if the member takes part on the given day.
+        """
+
+        k = self._day_columns[day._value_]
+        return k is not None and bool(self.day_bits[member_id] >> k & 1)
+
+    def location_mask(self, member_id: int, day: Day.DayName) -> int:
+        """Returns the member's location mask for the given day, 0 if not taking part.
+        """
+
+        k = self._day_columns[day._value_]
+        if k is None:
+            return 0
+        return self.locations.masks[self.location_masks[member_id *
+                                                        len(self.days) + k]]
+
+    def time_mask(self, member_id: int, day: Day.DayName) -> int:
+        """Returns the member's time mask for the given day, 0 if not taking part.
+        """
+
+        k = self._day_columns[day._value_]
+        if k is None:
+            return 0
+        return self.times.masks[self.time_masks[member_id * len(self.days) + k]]
+
+    def get_locations(self, member_id: int, day: Day.DayName) -> list:
+        """Returns the ids of the member's locations for the given day, ascending.
+        """
+
+        k = self._day_columns[day._value_]
+        if k is None:
+            return list()
+        return self.locations.bits[self.location_masks[member_id *
+                                                       len(self.days) + k]]
+
+    def get_times(self, member_id: int, day: Day.DayName) -> list:
+        """Returns the member's time codes for the given day, in ascending order.
+        """
+
+        k = self._day_columns[day._value_]
+        if k is None:
+            return list()
+        return self.times.bits[self.time_masks[member_id * len(self.days) + k]]
+
+    def get_days(self, member_id: int) -> list:
+        """Returns DayInfo objects for the days the member takes part in.
+        """
+
+        return [
+            Day.DayInfo(day, self.get_times(member_id, day),
+                        self.get_locations(member_id, day))
+            for day in self.days
+            if self.in_day(member_id, day)
+        ]
+
+
+VIEW_SLOTS = ("table", "member_id", "_day_columns", "_first_column")
+
+
+class MemberView:
+    """Read only Member attributes backed by a row of a MemberTable.
+
+    A table hands out a view per row, so views have no __dict__. Member, Rider
+    and Driver declare __slots__ as well, and the attributes of a view are slots
+    of RiderView and DriverView, the only layout both of their bases allow.
+
+    Attributes:
+        table:
+            MemberTable holding the member's row
+        member_id:
+            the member's row in the table
+        _day_columns:
+            the table's list of day columns, indexed by DayName value
+        _first_column:
+            index of the member's first day column in the per day columns
+    """
+
+    __slots__ = ()
+
+    def __init__(self, table: MemberTable, member_id: int):
+        self.table: MemberTable = table
+        self.member_id: int = member_id
+        self._day_columns: list = table._day_columns
+        self._first_column: int = member_id * len(table.days)
+        self.selection_weight: float = 1.0
+
+    # the default pickling of slots would also save the properties that shadow
+    # Member's slots, so views save the attributes they set themselves
+    def __getstate__(self) -> dict:
+        return {
+            name: getattr(self, name) for name in VIEW_SLOTS + self._STATE_SLOTS
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        for (name, value) in state.items():
+            setattr(self, name, value)
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.member_id]
+
+    @property
+    def email(self) -> str:
+        return self.table.emails[self.member_id]
+
+    @property
+    def phone(self) -> str:
+        return self.table.phones[self.member_id]
+
+    @property
+    def is_dues_paying(self) -> bool:
+        return bool(self.table.is_dues_paying[self.member_id])
+
+    @property
+    def days(self) -> list:
+        return self.table.get_days(self.member_id)
+
+    # the methods below read the table's columns directly, they are called for
+    # every rider and driver pair while matching
+    def in_day(self, day: Day.DayName) -> bool:
+        k = self._day_columns[day._value_]
+        if k is None:
+            return False
+        return bool(self.table.day_bits[self.member_id] >> k & 1)
+
+    def get_locations(self, day: Day.DayName) -> list:
+        k = self._day_columns[day._value_]
+        if k is None:
+            return list()
+        table = self.table
+        return table.locations.bits[table.location_masks[self._first_column +
+                                                         k]]
+
+    def get_times(self, day: Day.DayName) -> list:
+        k = self._day_columns[day._value_]
+        if k is None:
+            return list()
+        table = self.table
+        return table.times.bits[table.time_masks[self._first_column + k]]
+
+    def get_location_mask(self, day: Day.DayName) -> int:
+        k = self._day_columns[day._value_]
+        if k is None:
+            return 0
+        table = self.table
+        return table.locations.masks[table.location_masks[self._first_column +
+                                                          k]]
+
+    def get_time_mask(self, day: Day.DayName) -> int:
+        k = self._day_columns[day._value_]
+        if k is None:
+            return 0
+        table = self.table
+        return table.times.masks[table.time_masks[self._first_column + k]]
+
+
+class RiderView(MemberView, Rider):
+    """Rider backed by a row of a MemberTable.
+    """
+
+    __slots__ = VIEW_SLOTS
+
+    _STATE_SLOTS = ("selection_weight",)
+
+
+class DriverView(MemberView, Driver):
+    """Driver backed by a row of a MemberTable.
+
+    seats_remaining is a regular attribute so it can still be changed by callers.
+    """
+
+    __slots__ = VIEW_SLOTS
+
+    _STATE_SLOTS = ("selection_weight", "seats_remaining")
+
+    def __init__(self, table: MemberTable, member_id: int):
+        super().__init__(table, member_id)
+        self.seats_remaining: int = table.seats[member_id]
+
+    @property
+    def car_type(self) -> str:
+        return self.table.car_types[self.member_id]
+
+    @property
+    def seats(self) -> int:
+        return self.table.seats[self.member_id]
@@ -19,9 +19,11 @@ class Rider(Member):
             boolean value, true if this member has paid club membership dues, false otherwise
 
     Typical Usage:
-        member = Rider("John Foo", "foo@bar.com", "9876543211", [DayInfo(DayName.MONDAY, [6, 7, 8], ["NORTH", "CENTRAL"])], false)
+        member = Rider("John Foo", "foo@bar.com", "9876543211", [DayInfo(DayName.MONDAY, [1080, 1140, 1200], [0, 1])], false)
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, email: str, phone: str, days: list,
                  is_dues_paying: bool):
         super().__init__(name, email, phone, days, is_dues_paying)
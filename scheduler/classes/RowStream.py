@@ -0,0 +1,125 @@
+import queue
+import threading
+
+
+class RowStream:
+    """Rows of a worksheet, read a page of rows per API call.
+
+    A background thread reads the pages, up to prefetch_pages ahead of the rows
+    being consumed, so the next page downloads while the current one is parsed.
+    Only the pages waiting in the queue are held in memory, however long the
+    sheet is.
+
+    The API leaves out empty cells at the end of a row, rows are padded with ""
+    to width cells so every column of interest can be indexed. It also leaves out
+    empty rows at the end of a page, so empty rows may be missing from the stream.
+    The stream ends at the first page without any row, or at the last row of the
+    sheet.
+
+    Attributes:
+        worksheet:
+            gspread.models.Worksheet to read
+        width:
+            number of cells every row is padded to
+        page_rows:
+            number of rows read per API call
+        rows:
+            number of rows handed out so far
+        pages:
+            number of pages read so far
+        _pages:
+            queue of pages read by the thread. A page is a list of rows, None
+            ends the stream and an exception is raised in the consuming thread
+        _stop:
+            event set to make the thread stop early
+        _thread:
+            thread reading the pages
+
+    Typical Usage:
+        stream = RowStream(worksheet, width=20)
+        for row in stream:
+            .
+            .
+    """
+
+    def __init__(self,
+                 worksheet,
+                 width: int,
+                 page_rows: int = 500,
+                 prefetch_pages: int = 2,
+                 first_row: int = 1):
+        self.worksheet = worksheet
+        self.width: int = width
+        self.page_rows: int = max(1, page_rows)
+        self.rows: int = 0
+        self.pages: int = 0
+
+        self._pages = queue.Queue(max(1, prefetch_pages))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read_pages,
+                                        args=(first_row,),
+                                        daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Queues an item for the consuming thread, False if the stream was closed.
+        """
+
+        while not self._stop.is_set():
+            try:
+                self._pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _read_pages(self, first_row: int) -> None:
+        """Reads pages until the last row of the sheet, run by the thread.
+        """
+
+        try:
+            start = first_row
+            last_row = self.worksheet.row_count
+
+            while start <= last_row:
+                end = min(start + self.page_rows - 1, last_row)
+                page = self.worksheet.get("{}:{}".format(start, end))
+
+                if not page:
+                    break
+
+                if not self._put(list(page)):
+                    return
+
+                start = end + 1
+
+            self._put(None)
+        except Exception as error:
+            self._put(error)
+
+    def __iter__(self):
+        try:
+            while True:
+                page = self._pages.get()
+
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+
+                self.pages += 1
+
+                for row in page:
+                    self.rows += 1
+                    if len(row) < self.width:
+                        row = row + [""] * (self.width - len(row))
+                    yield row
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stops the thread reading pages.
+        """
+
+        self._stop.set()
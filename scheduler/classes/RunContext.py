@@ -0,0 +1,104 @@
+from contextlib import contextmanager
+import threading
+
+# the context of the run in progress, separate for every thread
+_current = threading.local()
+
+
+class RunContext:
+    """The configuration and clients of a single scheduler run.
+
+    While a context is active, Configuration.config(), AuthorizedClient,
+    LocationRegistry and RunMetrics get_instance() return the context's own
+    configuration and instances instead of the process-wide ones. The active
+    context is held in a threading.local, so runs in different threads can each
+    activate their own context and run concurrently.
+    Without an active context, the process-wide instances are the default context.
+
+    A new thread starts without an active context, so a context is activated in
+    the thread that runs with it.
+
+    Attributes:
+        name:
+            name of the run, used in logs and reports
+        config:
+            dictionary of configuration settings, as loaded by Configuration.load
+        client:
+            AuthorizedClient of the run, None to share the process-wide client
+        _instances:
+            dictionary mapping a class to the run's instance of it
+        _lock:
+            lock guarding _instances
+
+    Typical Usage:
+        context = RunContext(Configuration.load("club.toml"), name="club")
+        with context.activate():
+            riders, drivers = members_from_sheet()
+        .
+        .
+        schedule = generate_rides(riders, drivers, context=context)
+    """
+
+    def __init__(self, config: dict, client=None, name: str = ""):
+        self.name: str = name
+        self.config: dict = config
+        self.client = client
+        self._instances: dict = dict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current():
+        """
+        Get the active context, None when no context is active
+        """
+
+        return getattr(_current, "context", None)
+
+    @contextmanager
+    def activate(self):
+        """Makes this the active context inside the with block.
+        """
+
+        previous = RunContext.current()
+        _current.context = self
+
+        try:
+            yield self
+        finally:
+            _current.context = previous
+
+    @staticmethod
+    @contextmanager
+    def use(context=None):
+        """Activates context inside the with block, when one is given.
+
+        Functions taking an optional context argument wrap their body in this,
+        so they run in the given context or else in the one already active.
+        """
+
+        if context is None:
+            yield RunContext.current()
+            return
+
+        with context.activate():
+            yield context
+
+    def instance(self, cls, factory):
+        """Returns the run's instance of a class, created with factory() on first use.
+        """
+
+        with self._lock:
+            if cls not in self._instances:
+                self._instances[cls] = factory()
+
+            return self._instances[cls]
+
+    def set_instance(self, cls, instance) -> None:
+        """Replaces the run's instance of a class, None to create it again on next use.
+        """
+
+        with self._lock:
+            if instance is None:
+                self._instances.pop(cls, None)
+            else:
+                self._instances[cls] = instance
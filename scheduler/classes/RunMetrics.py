@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import time
+
+from scheduler.classes.RunContext import RunContext
+
+
+class RunMetrics:
+    """Phase timings and counters of a scheduler run.
+
+    Phases are timed with the phase() context manager. Phases started inside
+    another phase are recorded under the outer phase's name, so timing "parse_rows"
+    inside "ingest" records "ingest/parse_rows". A phase that runs more than once
+    adds up its time and counts its calls.
+
+    Counters are plain numbers that are added to with count().
+
+    Attributes:
+        started:
+            datetime the metrics were started
+        phases:
+            dictionary mapping phase name to [total seconds, calls]
+        counters:
+            dictionary mapping counter name to its value
+        _stack:
+            names of the phases currently running, outermost first
+        _instance:
+            instance of this class. An active RunContext has its own instance
+
+    Typical Usage:
+        metrics = RunMetrics.get_instance()
+        with metrics.phase("ingest"):
+            .
+            .
+        metrics.count("riders", len(riders))
+        metrics.write("climbing_carpools_metrics.json")
+    """
+
+    _instance = None
+
+    def __init__(self):
+        self.started: datetime = datetime.now()
+        self.phases: dict = dict()
+        self.counters: dict = dict()
+        self._stack: list = list()
+        self._start: float = time.perf_counter()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Get the metrics of the current run
+        """
+
+        context = RunContext.current()
+        if context is not None:
+            return context.instance(cls, cls)
+
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset(cls):
+        """
+        Start the metrics of a new run
+        """
+
+        metrics = cls()
+
+        context = RunContext.current()
+        if context is not None:
+            context.set_instance(cls, metrics)
+        else:
+            cls._instance = metrics
+
+        return metrics
+
+    def _name(self, name: str) -> str:
+        """Returns the full name of a phase started now.
+        """
+
+        return "/".join(self._stack + [name])
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times the code run inside the with block as the named phase.
+        """
+
+        # added now so phases are listed before the phases nested in them
+        entry = self.phases.setdefault(self._name(name), [0.0, 0])
+        self._stack.append(name)
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            entry[0] += time.perf_counter() - start
+            entry[1] += 1
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Adds a time measured elsewhere, such as in a worker process, to a phase.
+
+            Args:
+                name:
+                    name of the phase, nested under the phases currently running
+                seconds:
+                    time to add
+        """
+
+        entry = self.phases.setdefault(self._name(name), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Adds value to the named counter.
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> dict:
+        """Returns the metrics as a dictionary that can be saved as JSON.
+        """
+
+        return {
+            "started": self.started.isoformat(),
+            "total_seconds": time.perf_counter() - self._start,
+            "phases": {
+                name: {
+                    "seconds": seconds,
+                    "calls": calls
+                } for (name, (seconds, calls)) in self.phases.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def write(self, filename: str) -> None:
+        """Writes the JSON report to filename.
+        """
+
+        with open(filename, "w") as report_file:
+            json.dump(self.report(), report_file, indent=2)
+
+    def summary(self) -> str:
+        """Returns a table of the phases and counters for printing.
+        """
+
+        lines = ["{:<40}{:>12}{:>8}".format("Phase", "Seconds", "Calls")]
+
+        for (name, (seconds, calls)) in self.phases.items():
+            indent = "  " * name.count("/")
+            lines.append("{:<40}{:>12.4f}{:>8}".format(
+                indent + name.split("/")[-1], seconds, calls))
+
+        lines.append("")
+        lines.append("{:<40}{:>12}".format("Counter", "Value"))
+
+        for (name, value) in sorted(self.counters.items()):
+            lines.append("{:<40}{:>12}".format(name, value))
+
+        return "\n".join(lines)
@@ -0,0 +1,341 @@
+from datetime import date, datetime, timedelta
+import logging
+import sqlite3
+
+import scheduler.classes.Day as Day
+
+logger = logging.getLogger(__name__)
+
+
+class RunStore:
+    """Persistent record of every run's members, cars and rider assignments.
+
+    The store is an SQLite file. Every run gets a row in runs, and the members,
+    cars and assignments of the run are added in a single transaction with one
+    batched insert per table. Members are numbered within their run, so the rows
+    of a run never depend on the ones of another.
+
+    A run is keyed by its club and week. Recording a week again, as an
+    incremental rematch does, replaces the earlier run of the club and week in
+    the same transaction, so a week is never counted twice.
+
+    Queries join assignments and cars to members on (run_id, member_id) and
+    filter by ride date, which the indexes below cover:
+
+        members (email)                 history of one member
+        cars (run_id, driver_id)        cars of a driver in a run
+        cars (ride_date)                cars since a date
+        assignments (run_id, rider_id)  rides of a rider in a run
+        runs (club, week_start)         earlier run of a club and week
+
+    The ride date of a car is the date of its day in the run's week.
+
+    Attributes:
+        filename:
+            path of the SQLite file
+        _connection:
+            sqlite3 connection to the file
+
+    Typical Usage:
+        store = RunStore("climbing_carpools_runs.sqlite3")
+        store.record_run(riders, drivers, schedule, club="mcc")
+        .
+        .
+        for (email, name, rides) in store.rides_per_rider(since=date(2024, 1, 8)):
+            .
+        store.close()
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY,
+            started TEXT NOT NULL,
+            club TEXT NOT NULL DEFAULT '',
+            week_start TEXT
+        );
+        CREATE TABLE IF NOT EXISTS members (
+            run_id INTEGER NOT NULL REFERENCES runs (run_id),
+            member_id INTEGER NOT NULL,
+            email TEXT NOT NULL,
+            name TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            is_driver INTEGER NOT NULL,
+            is_dues_paying INTEGER NOT NULL,
+            seats INTEGER NOT NULL,
+            PRIMARY KEY (run_id, member_id)
+        );
+        CREATE TABLE IF NOT EXISTS cars (
+            car_id INTEGER PRIMARY KEY,
+            run_id INTEGER NOT NULL REFERENCES runs (run_id),
+            day TEXT NOT NULL,
+            ride_date TEXT NOT NULL,
+            driver_id INTEGER NOT NULL,
+            departure INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS assignments (
+            car_id INTEGER NOT NULL REFERENCES cars (car_id),
+            run_id INTEGER NOT NULL,
+            rider_id INTEGER NOT NULL,
+            PRIMARY KEY (car_id, rider_id)
+        );
+        CREATE INDEX IF NOT EXISTS members_email ON members (email);
+        CREATE INDEX IF NOT EXISTS cars_driver ON cars (run_id, driver_id);
+        CREATE INDEX IF NOT EXISTS cars_ride_date ON cars (ride_date);
+        CREATE INDEX IF NOT EXISTS assignments_rider
+            ON assignments (run_id, rider_id);
+        CREATE INDEX IF NOT EXISTS runs_week ON runs (club, week_start);
+    """
+
+    def __init__(self, filename: str):
+        self.filename: str = filename
+        self._connection = sqlite3.connect(filename)
+        self._connection.executescript(self.SCHEMA)
+        self._connection.commit()
+
+    @staticmethod
+    def _key(email: str) -> str:
+        """Normalizes an email for use as a member key.
+        """
+
+        return (email or "").strip().lower()
+
+    def record_run(self,
+                   riders: list,
+                   drivers: list,
+                   schedule,
+                   club: str = "",
+                   week_start: date = None,
+                   started: datetime = None) -> int:
+        """Adds a run to the store, replacing the club's earlier run of the week.
+
+            Args:
+                riders:
+                    list of Rider objects that took part in the run
+                drivers:
+                    list of Driver objects that took part in the run
+                schedule:
+                    the run's schedule, an iterable of (Day.DayName, [Car]) tuples
+                club:
+                    name of the club the run was made for
+                week_start:
+                    Monday of the week the schedule is for, when not provided
+                    the week Day.get_week_start gives for the started date
+                started:
+                    time of the run, now when not provided
+
+            Returns:
+                The run id of the new run
+        """
+
+        started = started or datetime.now()
+        week_start = week_start or Day.get_week_start(started.date())
+
+        members = list()
+        member_ids = dict()
+        email_ids = dict()
+
+        for (member_id, member) in enumerate(list(riders) + list(drivers)):
+            is_driver = member_id >= len(riders)
+            member_ids[id(member)] = member_id
+            email_ids.setdefault((self._key(member.email), is_driver),
+                                 member_id)
+            name = member.name or ""
+            phone = member.phone or ""
+            seats = member.seats if is_driver else 0
+            members.append(
+                (member_id, self._key(member.email), name, phone,
+                 int(is_driver), int(bool(member.is_dues_paying)), seats))
+
+        def get_member_id(member, is_driver: bool) -> int:
+            # schedules updated by an incremental run may hold copies of members
+            if id(member) in member_ids:
+                return member_ids[id(member)]
+            return email_ids.get((self._key(member.email), is_driver))
+
+        with self._connection:
+            replaced = self._replace_week(club, week_start)
+
+            run_id = self._connection.execute(
+                "INSERT INTO runs (started, club, week_start) VALUES (?, ?, ?)",
+                (started.isoformat(timespec="seconds"), club,
+                 week_start.isoformat())).lastrowid
+
+            self._connection.executemany(
+                "INSERT INTO members (run_id, member_id, email, name, phone, "
+                "is_driver, is_dues_paying, seats) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id,) + member for member in members])
+
+            # car ids are handed out here, so the assignments can be inserted
+            # in the same batch as the cars
+            (car_id,) = self._connection.execute(
+                "SELECT COALESCE(MAX(car_id), 0) FROM cars").fetchone()
+
+            cars = list()
+            assignments = list()
+            for (day, day_cars) in schedule:
+                ride_date = week_start + timedelta(days=day.value)
+
+                for car in day_cars:
+                    driver_id = get_member_id(car.driver, True)
+                    if driver_id is None:
+                        continue
+
+                    car_id += 1
+                    times = car.driver.get_times(day)
+                    cars.append(
+                        (car_id, run_id, Day.to_str(day), ride_date.isoformat(),
+                         driver_id, times[0] if times else None))
+
+                    for rider in car.riders:
+                        rider_id = get_member_id(rider, False)
+                        if rider_id is not None:
+                            assignments.append((car_id, run_id, rider_id))
+
+            self._connection.executemany(
+                "INSERT INTO cars (car_id, run_id, day, ride_date, driver_id, "
+                "departure) VALUES (?, ?, ?, ?, ?, ?)", cars)
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO assignments (car_id, run_id, rider_id) "
+                "VALUES (?, ?, ?)", assignments)
+
+        logger.info("Recorded run %i with %i cars in run store %s", run_id,
+                    len(cars), self.filename)
+        if replaced:
+            logger.info("Run %i replaces %i earlier runs of the week", run_id,
+                        replaced)
+
+        return run_id
+
+    def _replace_week(self, club: str, week_start: date) -> int:
+        """Deletes the runs of a club and week, with their members and rides.
+
+        Called inside the transaction that records the new run of the week.
+
+            Returns:
+                number of runs deleted
+        """
+
+        run_ids = self._connection.execute(
+            "SELECT run_id FROM runs WHERE club = ? AND week_start = ?",
+            (club, week_start.isoformat())).fetchall()
+
+        for table in ("assignments", "cars", "members", "runs"):
+            self._connection.executemany(
+                "DELETE FROM {} WHERE run_id = ?".format(table), run_ids)
+
+        return len(run_ids)
+
+    def runs(self, since: date = None, limit: int = None) -> list:
+        """Returns the recorded runs, latest first.
+
+            Args:
+                since:
+                    only runs with a ride on or after this date
+                limit:
+                    maximum number of runs returned, all when not provided
+
+            Returns:
+                list of (run id, started, club, week start, members, cars,
+                riders seated) tuples
+        """
+
+        return self._connection.execute(
+            "SELECT r.run_id, r.started, r.club, r.week_start, "
+            "(SELECT COUNT(*) FROM members m WHERE m.run_id = r.run_id), "
+            "(SELECT COUNT(*) FROM cars c WHERE c.run_id = r.run_id), "
+            "(SELECT COUNT(*) FROM assignments a WHERE a.run_id = r.run_id) "
+            "FROM runs r "
+            "WHERE ? IS NULL OR EXISTS (SELECT 1 FROM cars c "
+            "WHERE c.run_id = r.run_id AND c.ride_date >= ?) "
+            "ORDER BY r.run_id DESC LIMIT ?",
+            (self._date(since), self._date(since),
+             -1 if limit is None else limit)).fetchall()
+
+    def rides_per_rider(self, since: date = None, limit: int = None) -> list:
+        """Returns how often each member got a ride, most rides first.
+
+            Args:
+                since:
+                    only rides on or after this date
+                limit:
+                    maximum number of riders returned, all when not provided
+
+            Returns:
+                list of (email, name, rides) tuples
+        """
+
+        return self._connection.execute(
+            "SELECT m.email, MAX(m.name), COUNT(*) AS rides "
+            "FROM cars c "
+            "JOIN assignments a ON a.car_id = c.car_id "
+            "JOIN members m ON m.run_id = a.run_id AND m.member_id = a.rider_id "
+            "WHERE ? IS NULL OR c.ride_date >= ? "
+            "GROUP BY m.email ORDER BY rides DESC, m.email LIMIT ?",
+            (self._date(since), self._date(since),
+             -1 if limit is None else limit)).fetchall()
+
+    def riders_per_driver(self, since: date = None, limit: int = None) -> list:
+        """Returns how many riders each member carried, most riders first.
+
+            Args:
+                since:
+                    only rides on or after this date
+                limit:
+                    maximum number of drivers returned, all when not provided
+
+            Returns:
+                list of (email, name, drives, riders carried) tuples
+        """
+
+        return self._connection.execute(
+            "SELECT m.email, MAX(m.name), COUNT(*), SUM(("
+            "SELECT COUNT(*) FROM assignments a WHERE a.car_id = c.car_id"
+            ")) AS carried "
+            "FROM cars c "
+            "JOIN members m ON m.run_id = c.run_id AND m.member_id = c.driver_id "
+            "WHERE ? IS NULL OR c.ride_date >= ? "
+            "GROUP BY m.email ORDER BY carried DESC, m.email LIMIT ?",
+            (self._date(since), self._date(since),
+             -1 if limit is None else limit)).fetchall()
+
+    def member_rides(self, email: str, since: date = None) -> list:
+        """Returns every ride a member gave or got, latest first.
+
+            Args:
+                email:
+                    the member's email
+                since:
+                    only rides on or after this date
+
+            Returns:
+                list of (ride date, day, "driver" or "rider", driver name,
+                departure time code) tuples
+        """
+
+        return self._connection.execute(
+            "SELECT c.ride_date, c.day, "
+            "CASE WHEN m.member_id = c.driver_id THEN 'driver' ELSE 'rider' END, "
+            "d.name, c.departure "
+            "FROM members m "
+            "JOIN cars c ON c.run_id = m.run_id AND (c.driver_id = m.member_id "
+            "OR EXISTS (SELECT 1 FROM assignments a WHERE a.car_id = c.car_id "
+            "AND a.rider_id = m.member_id)) "
+            "JOIN members d ON d.run_id = c.run_id AND d.member_id = c.driver_id "
+            "WHERE m.email = ? AND (? IS NULL OR c.ride_date >= ?) "
+            "ORDER BY c.ride_date DESC, c.car_id DESC",
+            (self._key(email), self._date(since),
+             self._date(since))).fetchall()
+
+    @staticmethod
+    def _date(value: date) -> str:
+        """Returns a date as stored in the ride_date column, None for None.
+        """
+
+        return value.isoformat() if value else None
+
+    def close(self) -> None:
+        """Closes the store file.
+        """
+
+        self._connection.close()
@@ -0,0 +1,183 @@
+from scheduler.classes.Car import Car
+from scheduler.classes.Driver import Driver
+from scheduler.classes.Member import Member
+from scheduler.classes.Rider import Rider
+import scheduler.classes.Day as Day
+
+
+class Schedule:
+    """Cars for every scheduled day, indexed by driver and by member.
+
+    Iterating over a schedule yields (Day.DayName, [Car]) tuples in day order with
+    each day's cars in departure order, the same structure generate_rides has
+    always returned, so it can be passed to write_schedule as is. Indexing with an
+    integer returns the tuple of the n-th day.
+
+    Each car's departure time is computed once when the car is added. Lookups of
+    the car a driver has on a day and of where a member rides on each day are
+    dictionary lookups. Members are looked up by email, so a member who rides on
+    one day and drives on another is found under both roles. Members without an
+    email are looked up by the member object itself.
+
+    Attributes:
+        _days:
+            list of Day.DayName enums, in the order they were added
+        _cars:
+            dictionary mapping Day.DayName to the list of that day's cars
+        _sorted:
+            set of days whose list of cars is in departure order
+        _driver_cars:
+            dictionary mapping (Day.DayName, Driver) to the driver's Car
+        _departures:
+            dictionary mapping Car to its departure time
+        _assignments:
+            dictionary mapping email (or Member when it has no email) to a
+            dictionary of Day.DayName -> Car
+
+    Typical Usage:
+        schedule = Schedule()
+        schedule.add_day(Day.DayName.TUESDAY)
+        schedule.add_rider(Day.DayName.TUESDAY, driver, rider)
+        .
+        .
+        for (day, cars) in schedule:
+            .
+            .
+        schedule.get_assignments("foo@bar.com")
+    """
+
+    def __init__(self):
+        self._days: list = list()
+        self._cars: dict = dict()
+        self._sorted: set = set()
+        self._driver_cars: dict = dict()
+        self._departures: dict = dict()
+        self._assignments: dict = dict()
+
+    def add_day(self, day: Day.DayName, cars: list = None) -> None:
+        """Adds a day to the schedule, optionally with its cars.
+
+            Args:
+                day:
+                    Day.DayName enum of the day
+                cars:
+                    list of Car objects departing on the day
+        """
+
+        if day not in self._cars:
+            self._days.append(day)
+            self._cars[day] = list()
+
+        for car in cars or list():
+            self.add_car(day, car)
+
+    def add_car(self, day: Day.DayName, car: Car) -> None:
+        """Adds a car and its riders to a day of the schedule.
+
+            Args:
+                day:
+                    Day.DayName enum of the day, added if not in the schedule yet
+                car:
+                    Car object
+        """
+
+        self.add_day(day)
+
+        self._cars[day].append(car)
+        self._sorted.discard(day)
+        self._driver_cars[(day, car.driver)] = car
+        self._departures[car] = min(car.driver.get_times(day), default=0)
+
+        self._assign(day, car.driver, car)
+        for rider in car.riders:
+            self._assign(day, rider, car)
+
+    def add_rider(self, day: Day.DayName, driver: Driver, rider: Rider) -> Car:
+        """Adds a rider to the driver's car, creating the car if needed.
+
+            Args:
+                day:
+                    Day.DayName enum of the day
+                driver:
+                    Driver object
+                rider:
+                    Rider object
+
+            Returns:
+                The driver's Car
+        """
+
+        car = self._driver_cars.get((day, driver))
+
+        if car is None:
+            car = Car(driver)
+            self.add_car(day, car)
+
+        car.riders.append(rider)
+        self._assign(day, rider, car)
+
+        return car
+
+    def _assign(self, day: Day.DayName, member: Member, car: Car) -> None:
+        """Records that the member is in the car on the given day.
+        """
+
+        self._assignments.setdefault(member.email or member, dict())[day] = car
+
+    def days(self) -> list:
+        """Returns the days of the schedule, in order.
+        """
+
+        return list(self._days)
+
+    def cars(self, day: Day.DayName) -> list:
+        """Returns the cars departing on the given day, in departure order.
+        """
+
+        cars = self._cars.get(day, list())
+
+        if day not in self._sorted:
+            cars.sort(key=self._departures.__getitem__)
+            self._sorted.add(day)
+
+        return cars
+
+    def get_car(self, day: Day.DayName, driver: Driver) -> Car:
+        """Returns the driver's car on the given day, or None.
+        """
+
+        return self._driver_cars.get((day, driver))
+
+    def get_departure(self, car: Car) -> float:
+        """Returns the departure time of a car.
+        """
+
+        return self._departures[car]
+
+    def get_assignments(self, member) -> dict:
+        """Returns where a member rides on each day.
+
+            Args:
+                member:
+                    Member object or email
+
+            Returns:
+                dictionary mapping Day.DayName to the Car the member is in. Days the
+                member is not in a car are left out
+        """
+
+        if not isinstance(member, str):
+            member = member.email or member
+
+        return dict(self._assignments.get(member, dict()))
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __getitem__(self, i: int) -> (Day.DayName, list):
+        day = self._days[i]
+        return day, self.cars(day)
+
+    def __iter__(self):
+        for day in self._days:
+            yield day, self.cars(day)
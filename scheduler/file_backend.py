@@ -0,0 +1,288 @@
+"""Backend for reading and writing data with local files.
+
+Reads form responses and the due paying members list from CSV, JSON lines, JSON
+or XLSX files laid out like the Google Sheets, with the heading row first and
+the columns set in [gform_backend.columns]. Writes the schedule to a JSON file.
+No Google account or network access is needed, so runs can be made offline for
+what-if analysis and benchmarks.
+
+CSV, JSON lines (one JSON array of cells per line) and XLSX files are parsed a
+row at a time, JSON files hold a single array of rows and are loaded at once.
+Reading XLSX files requires openpyxl (pip install openpyxl).
+
+Typical usage:
+    import scheduler.file_backend as file_backend
+
+    riders, drivers = file_backend.members_from_files()
+    file_backend.write_to_file(schedule, "schedule.json")
+"""
+
+import csv
+import json
+import logging
+import os
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.MemberTable import MemberTable
+from scheduler.classes.RunContext import RunContext
+from scheduler.classes.RunMetrics import RunMetrics
+from scheduler.gform_backend import (
+    get_member_table,
+    sort_schedule_for_output,
+    unpack_locations,
+    unpack_time,
+)
+import scheduler.classes.Day as Day
+
+logger = logging.getLogger(__name__)
+
+FORMATS = (".csv", ".jsonl", ".json", ".xlsx")
+
+
+def get_cell(value) -> str:
+    """Returns a cell as the string the Sheets API would return for it.
+    """
+
+    if value is None:
+        return ""
+
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+
+    return str(value)
+
+
+def read_rows(filename: str):
+    """Yields the rows of a file as lists of strings, heading row first.
+
+        Args:
+            filename:
+                path of a .csv, .jsonl, .json or .xlsx file
+
+        Raises:
+            ValueError if the file format is not supported
+    """
+
+    extension = os.path.splitext(filename)[1].lower()
+
+    if extension == ".csv":
+        with open(filename, newline="", encoding="utf-8-sig") as csv_file:
+            yield from csv.reader(csv_file)
+
+    elif extension == ".jsonl":
+        with open(filename, encoding="utf-8") as json_file:
+            for line in json_file:
+                if line.strip():
+                    yield [get_cell(value) for value in json.loads(line)]
+
+    elif extension == ".json":
+        with open(filename, encoding="utf-8") as json_file:
+            for row in json.load(json_file):
+                yield [get_cell(value) for value in row]
+
+    elif extension == ".xlsx":
+        if openpyxl is None:
+            raise ValueError(
+                "Reading {} requires openpyxl (pip install openpyxl)".format(
+                    filename))
+
+        workbook = openpyxl.load_workbook(filename, read_only=True)
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield [get_cell(value) for value in row]
+        finally:
+            workbook.close()
+
+    else:
+        raise ValueError(
+            "Unsupported file format: {}, expected one of {}".format(
+                filename, ", ".join(FORMATS)))
+
+
+def get_dues_payers(dues_file: str) -> set:
+    """Gets the uniqnames in the Uniqname column of the dues file.
+
+        Args:
+            dues_file:
+                path of the due paying members file, its heading row names the
+                Uniqname column
+
+        Returns:
+            A set that contains uniqnames of all due paying members
+    """
+
+    rows = read_rows(dues_file)
+    heading = next(rows, list())
+
+    if "Uniqname" not in heading:
+        raise ValueError("{} has no Uniqname column".format(dues_file))
+
+    column = heading.index("Uniqname")
+
+    payers = set()
+    for row in rows:
+        if column < len(row) and row[column].strip():
+            payers.add(row[column].strip())
+
+    return payers
+
+
+def pad_rows(rows, width: int):
+    """Yields the rows padded with "" to at least width cells.
+    """
+
+    for row in rows:
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        yield row
+
+
+def member_table_from_files(context: RunContext = None) -> MemberTable:
+    """Gets all club members from the responses file.
+
+    The files are set in the [file_backend] table of the configuration.
+
+        Args:
+            context:
+                RunContext to read the files with, the active context when not
+                provided
+
+        Returns:
+            MemberTable with a row for every rider and every driver response
+    """
+
+    with RunContext.use(context):
+        metrics = RunMetrics.get_instance()
+
+        file_config = Configuration.config("file_backend")
+        columns = Configuration.config("gform_backend.columns")
+        days_enabled = Configuration.config("mcc.days_enabled")
+
+        # the driver times of the last day are the last column that is read
+        width = max(max(columns.values()),
+                    columns["days_info_start"] + 4 * len(days_enabled) - 1) + 1
+
+        with metrics.phase("read_files"):
+            dues_payers = get_dues_payers(file_config["dues_file"])
+            table = get_member_table(
+                pad_rows(read_rows(file_config["responses_file"]), width),
+                days_enabled, dues_payers)
+
+        return table
+
+
+def members_from_files(context: RunContext = None) -> (list, list):
+    """Gets all club members from the responses file.
+
+    The files are set in the [file_backend] table of the configuration.
+
+        Args:
+            context:
+                RunContext to read the files with, the active context when not
+                provided
+
+        Returns:
+            (list, list)
+            The list in index 0 is a list of riders, where each entry is a Rider object
+            The list in index 1 is a list of drivers, where each entry is a Driver object
+    """
+
+    table = member_table_from_files(context)
+
+    return table.riders(), table.drivers()
+
+
+def get_file_revision(context: RunContext = None) -> list:
+    """Gets the revision of the responses and dues files.
+
+        Args:
+            context:
+                RunContext to read the files with, the active context when not
+                provided
+
+        Returns:
+            list of the path, modification time and size of each file
+    """
+
+    with RunContext.use(context):
+        file_config = Configuration.config("file_backend")
+
+        revision = list()
+        for filename in (file_config["responses_file"],
+                         file_config["dues_file"]):
+            stat = os.stat(filename)
+            revision.append(
+                [os.path.abspath(filename), stat.st_mtime_ns, stat.st_size])
+
+        return revision
+
+
+def get_car_output(car, day: Day.DayName) -> dict:
+    """Returns a car of the schedule as a dictionary for the JSON output.
+    """
+
+    return {
+        "driver":
+            car.driver.name,
+        "email":
+            car.driver.email,
+        "phone":
+            car.driver.phone,
+        "car_type":
+            car.car_type,
+        "departure_time":
+            unpack_time(car.driver, day),
+        "locations":
+            unpack_locations(car.driver, day).strip(),
+        "riders": [{
+            "name": rider.name,
+            "email": rider.email,
+            "phone": rider.phone,
+            "locations": unpack_locations(rider, day).strip(),
+        } for rider in car.riders],
+    }
+
+
+def write_to_file(schedule: list,
+                  filename: str = None,
+                  sheet_names: list = None,
+                  context: RunContext = None) -> None:
+    """Writes the schedule to a JSON file.
+
+    The file holds a list of days, each with the name its worksheet would have
+    and its cars in departure order.
+
+        Args:
+            schedule:
+                list of the schedule that is to be written
+            filename:
+                path of the JSON file, the configured output_file when not provided
+            sheet_names:
+                name of each day of the schedule, the day's name when not provided
+            context:
+                RunContext to write with, the active context when not provided
+    """
+
+    with RunContext.use(context):
+        if filename is None:
+            filename = Configuration.config("file_backend")["output_file"]
+
+        schedule = sort_schedule_for_output(schedule)
+
+        output = list()
+        for (i, (day, cars)) in enumerate(schedule):
+            output.append({
+                "name": sheet_names[i] if sheet_names else Day.to_str(day),
+                "day": Day.to_str(day),
+                "cars": [get_car_output(car, day) for car in cars],
+            })
+
+        with open(filename, "w") as output_file:
+            json.dump(output, output_file, indent=2)
+
+        logger.info("Schedule written to %s", filename)
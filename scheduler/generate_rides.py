@@ -4,18 +4,26 @@ Typical Usage:
     import generate_rides
     <call one of the functions in this file>
 """
+import heapq
 import random
 import logging
 import sys
-from copy import deepcopy
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 from scheduler.classes.Car import Car
-from scheduler.classes.MeetingLocation import MeetingLocation
+from scheduler.classes.CompatibilityMatrix import CompatibilityMatrix
 from scheduler.classes.Configuration import Configuration
 from scheduler.classes.Driver import Driver
+from scheduler.classes.DriverIndex import DriverIndex
+from scheduler.classes.FlowNetwork import FlowNetwork
 from scheduler.classes.Member import Member
 from scheduler.classes.Rider import Rider
+from scheduler.classes.RunContext import RunContext
+from scheduler.classes.RunMetrics import RunMetrics
+from scheduler.classes.Schedule import Schedule
 import scheduler.classes.Day as Day
+import scheduler.log as log
 
 logger = logging.getLogger(__name__)
 
@@ -34,17 +42,10 @@ def check_in_days(member: Member, day: Day.DayName) -> bool:
         False -> member is not signed up for the given day
     """
 
-    for d in member.days:
-        if d.day == day:
-            logger.debug("%s is in %s", member.name, day)
-            return True
+    return member.in_day(day)
 
-    logger.debug("%s is not in %s", member.name, day)
 
-    return False
-
-
-def get_total_seats(drivers: list, day: Day.DayName) -> int:
+def get_total_seats(drivers: list, day: Day.DayName, seats: dict = None) -> int:
     """ Returns the number of available seats for passengers across all drivers for a certain day.
 
     Args:
@@ -52,16 +53,23 @@ def get_total_seats(drivers: list, day: Day.DayName) -> int:
             list of Driver objects
         day:
             Day.DayName enum specifying the day for which to calculate seats
+        seats:
+            optional seat ledger, dictionary of Driver -> seats left on the day.
+            Each driver's seats_remaining is used when not provided
     
     Returns:
         Integer of total number of seats avaialble for a certain day across all drivers for that day
     """
 
-    return sum([
-        driver.seats_remaining
-        for driver in drivers
-        if check_in_days(driver, day)
-    ])
+    if seats is None:
+        return sum([
+            driver.seats_remaining
+            for driver in drivers
+            if check_in_days(driver, day)
+        ])
+
+    return sum(
+        [seats[driver] for driver in drivers if check_in_days(driver, day)])
 
 
 def are_location_compatible(rider: Rider, driver: Driver,
@@ -78,15 +86,14 @@ def are_location_compatible(rider: Rider, driver: Driver,
 
     """
 
-    for location in rider.get_locations(day):
-        if location in driver.get_locations(day):
-            logger.debug("location match %s and %s", rider.name, driver.name)
-            return True
-
-    return False
+    # the locations both listed
+    return bool(rider.get_location_mask(day) & driver.get_location_mask(day))
 
 
-def time_compatibility(rider: Rider, driver: Driver, day: Day.DayName) -> float:
+def time_compatibility(rider: Rider,
+                       driver: Driver,
+                       day: Day.DayName,
+                       tolerance: int = 0) -> int:
     """ Checks time compatibility. Finds driver and rider with closest departure time.
 
     For a specific driver and rider, returns the smallest time difference between when
@@ -99,48 +106,48 @@ def time_compatibility(rider: Rider, driver: Driver, day: Day.DayName) -> float:
             Driver object
         day:
             Day.DayName enum of day for which to check time compatability
+        tolerance:
+            largest number of minutes the driver may leave before or after one of
+            the rider's times
 
     Returns:
-        Float of the earliest matching departure time in the rider and driver
-        or -1 if no match was found
+        Time code of the driver's departure time if it is within tolerance of one
+        of the rider's times, or -1 if no match was found
     """
 
-    rider_times = rider.get_times(day)
-    driver_times = driver.get_times(day)
-
-    rider_times.sort()
-
-    # there should only be one time here, so maybe remove
-    # maybe keep this in case there are more than 1 to keep things deterministic
-    driver_times.sort()
-
-    if len(driver_times) != 1:
+    if len(driver.get_times(day)) != 1:
         logger.error("driver has multiple departure times for %s", day)
         exit(2)
 
-    driver_time = driver_times[0]
+    if tolerance == 0:
+        # the times both listed, the lowest bit is the earliest
+        return Day.earliest_time(
+            rider.get_time_mask(day) & driver.get_time_mask(day))
 
-    result = float(-1)
+    departure_time = driver.get_times(day)[0]
+    delta = Day.get_time_delta(rider.get_times(day), departure_time)
 
-    # finds earliest matching time, rider times are sorted
-    for time in rider_times:
-        if time == driver_time:
-            logger.debug("rider %s time compatible with %s", rider.name,
-                         driver.name)
-            result = time
-            break
+    if 0 <= delta <= tolerance:
+        return departure_time
 
-    return result
+    return -1
 
 
-def find_best_match(rider: Rider, drivers: list,
-                    day: Day.DayName) -> (Driver, list):
+def find_best_match(rider: Rider,
+                    drivers: list,
+                    day: Day.DayName,
+                    tolerance: int = 0) -> (Driver, list):
     """Find the best match for the rider.
 
     Finds all compatible drivers for the rider and gives priority to the driver
     that has available seats and minimizes the time between when the rider and driver
     would like to leave. 
 
+    This is the legacy reference implementation. It scans every driver for every
+    rider and the matching engines do not use it: they look drivers up through a
+    DriverIndex, which picks the same driver. It is kept to check DriverIndex
+    against and as the baseline of scheduler/benchmark.py.
+
     Args:
         rider:
             Rider object
@@ -148,6 +155,8 @@ def find_best_match(rider: Rider, drivers: list,
             list of Driver objects
         day:
             Day.DayName enum of day for which a match is being found
+        tolerance:
+            departure time tolerance window, in minutes
         
     Returns:
         (Driver, list)
@@ -171,11 +180,12 @@ def find_best_match(rider: Rider, drivers: list,
     for driver in drivers:
         if driver.seats_remaining and are_location_compatible(
                 rider, driver, day):
-            departure_time = time_compatibility(rider, driver, day)
+            departure_time = time_compatibility(rider, driver, day, tolerance)
 
             # departure time will be -1 if rider and driver are not time compatible
-            if departure_time > 0:
-                compatible_drivers.append([driver, departure_time])
+            if departure_time >= 0:
+                delta = Day.get_time_delta(rider.get_times(day), departure_time)
+                compatible_drivers.append([driver, (delta, departure_time)])
 
     if not compatible_drivers:
         logger.warn("no compatible drivers for %s", rider.name)
@@ -184,9 +194,10 @@ def find_best_match(rider: Rider, drivers: list,
     # compatible_drivers is a list where each entry is a list with two elements
     # inner list strucutre:
     # [0] -> Driver object
-    # [1] -> float that is the timne delta between when this specific driver and a rider want to leave
+    # [1] -> (minutes between the driver's departure and the closest rider time, departure time)
 
-    # Sort the compatible drivers list to find the compatible driver leaving earliest
+    # Sort the compatible drivers list to find the compatible driver leaving closest
+    # to one of the rider's times, and earliest among those
     # Store the smallest driver dictionary value into the best match variable
     best_match = sorted(compatible_drivers, key=lambda lst: lst[1])[0][0]
 
@@ -199,91 +210,835 @@ def find_best_match(rider: Rider, drivers: list,
     return best_match, drivers
 
 
-def generate_rides(riders: list, drivers: list) -> list:
+def match_riders_greedy(riders: list,
+                        drivers: list,
+                        day: Day.DayName,
+                        seats: dict,
+                        matrix: CompatibilityMatrix = None,
+                        tolerance: int = 0,
+                        driver_index: DriverIndex = None) -> list:
+    """Matches riders to drivers one rider at a time.
+
+    Riders are taken in the order of the riders list and each one is placed in the
+    car of its best match driver, so the order of the riders list decides who gets
+    a seat when there are more riders than seats.
+
+    Args:
+        riders:
+            list of Rider objects, in the order they are picked
+        drivers:
+            list of Driver objects
+        day:
+            Day.DayName enum of the day being matched
+        seats:
+            seat ledger, dictionary of Driver -> seats left on the day. Updated
+            as seats are taken
+        matrix:
+            optional CompatibilityMatrix for the day built over the same riders,
+            drivers and seat ledger. Used in place of the DriverIndex when provided
+        tolerance:
+            departure time tolerance window, in minutes
+        driver_index:
+            optional DriverIndex of the day built over the same drivers and
+            tolerance before any seat was taken. It is copied with the seat
+            ledger instead of building a new index, and is not modified
+
+    Returns:
+        A list of Car objects departing on the given day
+    """
+
+    # cars for the given day, by driver
+    cars = dict()
+
+    seats_remaining = get_total_seats(drivers, day, seats)
+
+    # drivers with open seats for the day, bucketed by location and time
+    # so that each rider only looks at the drivers it could ride with.
+    # the compatibility matrix answers the same queries from its arrays
+    if matrix is not None:
+        driver_index = matrix
+    elif driver_index is not None:
+        driver_index = driver_index.copy(seats)
+    else:
+        driver_index = DriverIndex(drivers, day, seats, tolerance)
+
+    # keep picking riders until no more seats remain or no more riders remain
+    for chosen_rider in riders:
+        if seats_remaining <= 0:
+            break
+
+        # don't match rider if not riding current day
+        if not chosen_rider.in_day(day):
+            continue
+
+        best_driver = driver_index.find_best_match(chosen_rider)
+
+        if best_driver:
+            driver_index.take_seat(best_driver)
+
+            # give driver a car if they don't already have one
+            if best_driver not in cars:
+                cars[best_driver] = Car(best_driver)
+
+            # add rider to selected driver's car
+            cars[best_driver].riders.append(chosen_rider)
+
+            seats_remaining -= 1
+
+    return list(cars.values())
+
+
+def match_riders_most_constrained(riders: list,
+                                  drivers: list,
+                                  day: Day.DayName,
+                                  seats: dict,
+                                  matrix: CompatibilityMatrix = None,
+                                  tolerance: int = 0,
+                                  driver_index: DriverIndex = None) -> list:
+    """Matches riders to drivers one rider at a time, most constrained rider first.
+
+    Every rider's list of candidate drivers is computed once. A priority queue then
+    always serves the rider with the fewest candidates that still have open seats,
+    so a rider with a single option is not beaten to their seat by a rider who had
+    several. When a driver fills up, only the riders who listed that driver have
+    their count updated. Riders with the same count are served in the order of
+    the riders list, so the random shuffle is only the tie-break.
+
+    Riders with the same locations and times have the same candidates, so the
+    candidate lists and counts are kept once per such group of riders.
+
+    Each rider is placed with their best candidate that still has a seat, the same
+    choice match_riders_greedy makes.
+
+    Args:
+        riders:
+            list of Rider objects, the order breaks ties between riders
+        drivers:
+            list of Driver objects
+        day:
+            Day.DayName enum of the day being matched
+        seats:
+            seat ledger, dictionary of Driver -> seats left on the day. Updated
+            as seats are taken
+        matrix:
+            optional CompatibilityMatrix for the day built over the same riders,
+            drivers and seat ledger. Used in place of the DriverIndex when provided
+        tolerance:
+            departure time tolerance window, in minutes
+        driver_index:
+            optional DriverIndex of the day built over the same drivers and
+            tolerance before any seat was taken. It is copied with the seat
+            ledger instead of building a new index, and is not modified
+
+    Returns:
+        A list of Car objects departing on the given day
+    """
+
+    if matrix is not None:
+        driver_index = matrix
+    elif driver_index is not None:
+        driver_index = driver_index.copy(seats)
+    else:
+        driver_index = DriverIndex(drivers, day, seats, tolerance)
+
+    # riders of each group, in the order of the riders list
+    groups = dict()
+    for rider in riders:
+        if check_in_days(rider, day):
+            key = (frozenset(rider.get_locations(day)),
+                   tuple(sorted(rider.get_times(day))))
+            groups.setdefault(key, list()).append(rider)
+
+    group_riders = list(groups.values())
+
+    # candidate drivers of each group, best first, and the groups of each driver
+    candidates = list()
+    remaining = list()
+    groups_of = dict()
+
+    for (g, members) in enumerate(group_riders):
+        group_candidates = driver_index.find_candidates(members[0])
+
+        for driver in group_candidates:
+            groups_of.setdefault(driver, list()).append(g)
+
+        candidates.append(group_candidates)
+        remaining.append(len(group_candidates))
+
+    # position in the riders list breaks ties between groups
+    position = {rider: i for (i, rider) in enumerate(riders)}
+    next_rider = [0] * len(group_riders)
+
+    queue = [(remaining[g], position[members[0]], g)
+             for (g, members) in enumerate(group_riders)]
+    heapq.heapify(queue)
+
+    cars = dict()
+
+    while queue:
+        count, rider_position, g = heapq.heappop(queue)
+
+        # skip entries left behind when a group's count went down or its
+        # rider was already served
+        if (next_rider[g] >= len(group_riders[g]) or count != remaining[g] or
+                rider_position != position[group_riders[g][next_rider[g]]]):
+            continue
+
+        chosen_rider = group_riders[g][next_rider[g]]
+        next_rider[g] += 1
+
+        if count > 0:
+            best_driver = next(d for d in candidates[g] if seats[d] > 0)
+
+            if best_driver not in cars:
+                cars[best_driver] = Car(best_driver)
+            cars[best_driver].riders.append(chosen_rider)
+
+            seats[best_driver] -= 1
+
+            # a full driver is one fewer candidate for every group that listed them
+            if seats[best_driver] == 0:
+                for k in groups_of[best_driver]:
+                    if next_rider[k] < len(group_riders[k]):
+                        remaining[k] -= 1
+                        heapq.heappush(
+                            queue,
+                            (remaining[k],
+                             position[group_riders[k][next_rider[k]]], k))
+
+        if next_rider[g] < len(group_riders[g]):
+            heapq.heappush(
+                queue,
+                (remaining[g], position[group_riders[g][next_rider[g]]], g))
+
+    return list(cars.values())
+
+
+def get_group_cost(rider_locations: frozenset,
+                   rider_times: tuple,
+                   driver_locations: frozenset,
+                   driver_times: frozenset,
+                   tolerance: int = 0) -> int:
+    """Returns the cost of seating a group of riders with a group of drivers.
+
+    The cost is the best Day.get_time_score of the drivers' departure times for
+    the riders, less the riders' earliest time. Without a tolerance that is the
+    number of minutes after the riders' earliest time the drivers leave.
+
+    Args:
+        rider_locations:
+            locations of the rider group
+        rider_times:
+            sorted departure times of the rider group
+        driver_locations:
+            locations of the driver group
+        driver_times:
+            departure times of the driver group
+        tolerance:
+            departure time tolerance window, in minutes
+
+    Returns:
+        The cost, or None if the groups are not compatible
+    """
+
+    if rider_locations.isdisjoint(driver_locations) or not rider_times:
+        return None
+
+    scores = list()
+    for time in driver_times:
+        delta = Day.get_time_delta(rider_times, time)
+        if 0 <= delta <= tolerance:
+            scores.append(Day.get_time_score(delta, time))
+
+    if not scores:
+        return None
+
+    return min(scores) - rider_times[0]
+
+
+def match_riders_flow(riders: list,
+                      drivers: list,
+                      day: Day.DayName,
+                      seats: dict,
+                      matrix: CompatibilityMatrix = None,
+                      tolerance: int = 0,
+                      driver_index: DriverIndex = None) -> list:
+    """Matches riders to drivers by solving a min-cost max-flow problem.
+
+    Every rider is connected to every compatible driver, the capacity of a driver
+    is the seats it has left and the cost of an edge grows with the minutes between
+    the departure and the rider's times (see get_group_cost). The maximum number
+    of riders is seated, and among those matchings the one that best respects the
+    riders' time preferences is chosen.
+
+    Riders with the same locations and times are interchangeable, as are drivers
+    with the same locations and times, so the network is built over those groups
+    instead of over individual members. Its size then depends on the number of
+    distinct location/time combinations rather than on the number of members.
+    Within a group, riders are seated in the same order match_riders_greedy
+    would pick them, and drivers are filled in the order of the drivers list.
+
+    Args:
+        riders:
+            list of Rider objects, in the order they are picked
+        drivers:
+            list of Driver objects
+        day:
+            Day.DayName enum of the day being matched
+        seats:
+            seat ledger, dictionary of Driver -> seats left on the day. Updated
+            as seats are taken
+        matrix:
+            optional CompatibilityMatrix for the day built over the same riders
+            and drivers. When provided, the edges between groups are read from
+            its scores
+        tolerance:
+            departure time tolerance window, in minutes
+        driver_index:
+            unused, the flow engine does not look drivers up one rider at a time.
+            Taken so that every engine can be called the same way
+
+    Returns:
+        A list of Car objects departing on the given day
+    """
+
+    # group riders and drivers by their locations and times for the day
+    rider_groups = dict()
+    for rider in riders:
+        if not check_in_days(rider, day):
+            continue
+        key = (frozenset(rider.get_locations(day)),
+               tuple(sorted(rider.get_times(day))))
+        rider_groups.setdefault(key, list()).append(rider)
+
+    driver_groups = dict()
+    for driver in drivers:
+        if seats[driver] > 0 and check_in_days(driver, day):
+            key = (frozenset(driver.get_locations(day)),
+                   frozenset(driver.get_times(day)))
+            driver_groups.setdefault(key, list()).append(driver)
+
+    rider_keys = list(rider_groups)
+    driver_keys = list(driver_groups)
+
+    # nodes: source, rider groups, driver groups, sink
+    source = 0
+    sink = 1 + len(rider_keys) + len(driver_keys)
+    network = FlowNetwork(sink + 1)
+
+    for (i, key) in enumerate(rider_keys):
+        network.add_edge(source, 1 + i, len(rider_groups[key]), 0)
+
+    for (j, key) in enumerate(driver_keys):
+        group_seats = sum([seats[d] for d in driver_groups[key]])
+        network.add_edge(1 + len(rider_keys) + j, sink, group_seats, 0)
+
+    if matrix is not None:
+        driver_matrix_groups = [
+            matrix.get_driver_group(driver_groups[key][0])
+            for key in driver_keys
+        ]
+
+    group_edges = list()
+    for (i, rider_key) in enumerate(rider_keys):
+        group_size = len(rider_groups[rider_key])
+
+        if matrix is not None:
+            # every member of a group has the same scores, so the first member
+            # of each group stands in for the whole group
+            scores = matrix.get_group_scores(
+                matrix.get_rider_group(rider_groups[rider_key][0]))
+            costs = [
+                None if scores[g] == matrix.NO_MATCH else int(scores[g]) -
+                rider_key[1][0] for g in driver_matrix_groups
+            ]
+        else:
+            (rider_locations, rider_times) = rider_key
+            costs = [
+                get_group_cost(rider_locations, rider_times, driver_locations,
+                               driver_times, tolerance)
+                for (driver_locations, driver_times) in driver_keys
+            ]
+
+        for (j, cost) in enumerate(costs):
+            if cost is None:
+                continue
+
+            edge = network.add_edge(1 + i, 1 + len(rider_keys) + j, group_size,
+                                    cost)
+            group_edges.append((edge, i, j))
+
+    seated, cost = network.min_cost_max_flow(source, sink)
+    logger.info("flow seated %i riders on %s at cost %i", seated,
+                Day.to_str(day), cost)
+
+    # hand out the seats of each driver group in order
+    cars = dict()
+    next_rider = [0] * len(rider_keys)
+    next_driver = [0] * len(driver_keys)
+
+    for (edge, i, j) in group_edges:
+        group_riders = rider_groups[rider_keys[i]]
+        group_drivers = driver_groups[driver_keys[j]]
+
+        for _ in range(network.flow(edge)):
+            chosen_rider = group_riders[next_rider[i]]
+            next_rider[i] += 1
+
+            driver = group_drivers[next_driver[j]]
+            seats[driver] -= 1
+            if seats[driver] <= 0:
+                next_driver[j] += 1
+
+            if driver not in cars:
+                cars[driver] = Car(driver)
+            cars[driver].riders.append(chosen_rider)
+
+    return [cars[d] for d in drivers if d in cars]
+
+
+ENGINES = {
+    "greedy": match_riders_greedy,
+    "flow": match_riders_flow,
+}
+
+
+def get_engine(name: str):
+    """Returns the matching function for the engine with the given name.
+
+    Args:
+        name:
+            name of the engine, one of the keys of ENGINES
+
+    Returns:
+        A function taking (riders, drivers, day, seats, matrix, tolerance,
+        driver_index) and returning a list of Car objects
+    """
+
+    if name not in ENGINES:
+        raise ValueError("Unknown matching engine: {}".format(name))
+
+    return ENGINES[name]
+
+
+def get_match_function(engine: str, rider_order: str = "random"):
+    """Returns the matching function for an engine and rider order.
+
+    Args:
+        engine:
+            name of the matching engine, one of the keys of ENGINES
+        rider_order:
+            order the greedy engine serves riders in, "random" or "constrained"
+            for most constrained rider first
+
+    Returns:
+        A function taking (riders, drivers, day, seats, matrix, tolerance,
+        driver_index) and returning a list of Car objects
+    """
+
+    if rider_order not in ("random", "constrained"):
+        raise ValueError("Unknown rider order: {}".format(rider_order))
+
+    if engine == "greedy" and rider_order == "constrained":
+        return match_riders_most_constrained
+
+    return get_engine(engine)
+
+
+def order_riders(riders: list, rng: random.Random) -> list:
+    """Returns the riders in a random selection order.
+
+    Without selection weights every order is equally likely. When riders carry a
+    selection_weight other than 1.0 the order is drawn by weighted sampling
+    without replacement: each rider gets the key u ** (1 / weight) for a uniform
+    random u, and riders are ordered by descending key.
+
+    Args:
+        riders:
+            list of Rider objects, not modified
+        rng:
+            random.Random used to draw the order
+
+    Returns:
+        A new list with the riders in selection order
+    """
+
+    days_riders = list(riders)
+
+    weights = [rider.selection_weight for rider in days_riders]
+    if all([w == 1.0 for w in weights]):
+        rng.shuffle(days_riders)
+        return days_riders
+
+    keys = [rng.random()**(1.0 / w) for w in weights]
+    order = sorted(range(len(days_riders)), key=keys.__getitem__, reverse=True)
+
+    return [days_riders[i] for i in order]
+
+
+def match_day(riders: list,
+              drivers: list,
+              day: Day.DayName,
+              seed: int,
+              engine: str,
+              use_numpy: bool,
+              rider_order: str = "random",
+              tolerance: int = 0,
+              indexes: dict = None) -> list:
+    """Matches riders with drivers for a single day.
+
+    The riders are shuffled with a random number generator seeded from the run
+    seed and the day, so a day is matched the same way for a given seed no matter
+    which process runs it or in which order the days are run.
+
+    Args:
+        riders:
+            list of Rider objects, not modified
+        drivers:
+            list of Driver objects, not modified
+        day:
+            Day.DayName enum of the day to match
+        seed:
+            seed of the run
+        engine:
+            name of the matching engine, one of the keys of ENGINES
+        use_numpy:
+            True to build a CompatibilityMatrix for the engine
+        rider_order:
+            order the greedy engine serves riders in, "random" or "constrained"
+            for most constrained rider first
+        tolerance:
+            minutes a driver may leave before or after a rider's time
+        indexes:
+            optional dictionary of Day.DayName -> DriverIndex shared by the runs
+            over the same drivers and tolerance. The day's index is built and
+            added on first use, and copied by the engines after that
+
+    Returns:
+        A list of Car objects departing on the given day
+    """
+
+    # seats are tracked in a ledger that starts over every day, so the
+    # riders and drivers never need to be copied or reset
+    seats = {driver: driver.seats_remaining for driver in drivers}
+
+    # shuffle the riders for every day to ensure they are chosen fairly
+    days_riders = order_riders(
+        riders, random.Random("{}:{}".format(seed, Day.to_str(day))))
+
+    logger.info("%i seats available for %s",
+                get_total_seats(drivers, day, seats), Day.to_str(day))
+
+    # rider/driver compatibility computed in bulk for the engines. Riders are
+    # grouped as the engine looks them up, which skips those not riding today
+    matrix = None
+    if use_numpy:
+        matrix = CompatibilityMatrix(list(), drivers, day, seats, tolerance)
+
+    match_riders = get_match_function(engine, rider_order)
+
+    # the index of the day's drivers is only built once for runs that share it
+    driver_index = None
+    if (indexes is not None and matrix is None and
+            match_riders is not match_riders_flow):
+        if day not in indexes:
+            indexes[day] = DriverIndex(drivers, day, tolerance=tolerance)
+        driver_index = indexes[day]
+
+    return match_riders(days_riders, drivers, day, seats, matrix, tolerance,
+                        driver_index)
+
+
+# riders and drivers of a worker process, set once when the worker starts so
+# they are not sent again with every day, and the driver indexes built from them
+_worker_members = None
+_worker_indexes = None
+
+
+def _init_worker(riders: list, drivers: list, records, level: int) -> None:
+    """Stores the riders and drivers in a worker process and sends its log
+    records to the queue of the parent process.
+    """
+
+    global _worker_members, _worker_indexes
+    _worker_members = (riders, drivers)
+    _worker_indexes = dict()
+
+    log.configure_worker_logging(records, level)
+
+
+def start_workers(riders: list, drivers: list,
+                  workers: int) -> ProcessPoolExecutor:
+    """Starts a pool of worker processes for generate_rides.
+
+    The riders and drivers are sent to each worker once, when it starts. A pool
+    can be passed to several generate_rides calls over the same riders and
+    drivers, so the workers and the driver indexes they build are kept from one
+    call to the next. The caller shuts it down.
+
+    Args:
+        riders:
+            list of Rider objects every run with the pool matches
+        drivers:
+            list of Driver objects every run with the pool matches
+        workers:
+            number of worker processes
+
+    Returns:
+        The ProcessPoolExecutor
+    """
+
+    return ProcessPoolExecutor(max_workers=workers,
+                               initializer=_init_worker,
+                               initargs=(riders, drivers,
+                                         log.get_worker_queue(),
+                                         logging.getLogger().level))
+
+
+def _match_day_worker(day: Day.DayName, seed: int, engine: str, use_numpy: bool,
+                      rider_order: str, tolerance: int,
+                      weights: list) -> (float, list):
+    """Matches a day in a worker process.
+
+    The selection weights of the riders change from one run to the next, so
+    they are sent with every day, in the order of the riders list.
+
+    Returns:
+        (seconds, list)
+        seconds: time it took to match the day
+
+        The list holds (driver position, [rider positions]) tuples, one per car.
+        Positions refer to the drivers and riders lists the worker was started
+        with, so the parent process can rebuild the cars with its own Rider and
+        Driver objects
+    """
+
+    start = time.perf_counter()
+
+    riders, drivers = _worker_members
+    rider_positions = {rider: i for (i, rider) in enumerate(riders)}
+    driver_positions = {driver: i for (i, driver) in enumerate(drivers)}
+
+    for (rider, weight) in zip(riders, weights):
+        rider.selection_weight = weight
+
+    cars = match_day(riders, drivers, day, seed, engine, use_numpy, rider_order,
+                     tolerance, _worker_indexes)
+
+    return time.perf_counter() - start, [
+        (driver_positions[car.driver], [rider_positions[r]
+                                        for r in car.riders])
+        for car in cars
+    ]
+
+
+def generate_rides(riders: list,
+                   drivers: list,
+                   days: list = None,
+                   seed=None,
+                   context: RunContext = None,
+                   executor: ProcessPoolExecutor = None,
+                   indexes: dict = None) -> Schedule:
     """Matches riders with drivers.
 
+    The matching engine is selected with the mcc.engine configuration setting.
+    Days are matched independently of each other. With mcc.workers greater than 1,
+    the days are spread over a pool of worker processes and the results are put
+    back in day order. The mcc.seed setting makes a run reproducible, with or
+    without workers. Runs that match the same riders and drivers several times
+    can share a pool from start_workers and a dictionary of driver indexes, so
+    neither is built again for every run.
+
     Args:
         riders:
             A list of Rider objects. 
         drivers:
             A list of Driver objects.
+        days:
+            list of Day.DayName enums to match, mcc.days_enabled when not provided
+        seed:
+            seed of the run, mcc.seed (or a random seed) when not provided
+        context:
+            RunContext whose configuration and metrics are used, the active
+            context when not provided
+        executor:
+            pool from start_workers over the same riders and drivers to match
+            the days in. When not provided, a pool is started for the run if
+            mcc.workers is greater than 1
+        indexes:
+            dictionary of Day.DayName -> DriverIndex shared by the runs over the
+            same drivers, filled as days are matched without workers. See
+            match_day
 
     Returns:
-        A list of departure days and corresponding cars. The list has the following format:
+        A Schedule of departure days and corresponding cars. Iterating over it gives
+        the following format:
         [(DAY 1, [CAR 1, CAR2, CAR 3]), (DAY 2, [CAR 1]), (etc, etc)]
         
-        Each entry in the list is a tuple. The tuple holds a string in index 0 that 
+        Each entry is a tuple. The tuple holds a Day.DayName in index 0 that 
         corresponds to the day that group of cars will be departing. Index 1 holds a list of the car 
-        objects that are departing on that day.
+        objects that are departing on that day, in departure order.
     
     Typical Usage:
         schedule = generate_rides(riders, drivers)
     """
 
-    schedule = list()
+    with RunContext.use(context):
+        mcc_config = Configuration.config("mcc")
 
-    # copy only once
-    days_drivers = deepcopy(drivers)
+        # Collect which days the club wishes to run a carpool
+        days_enabled = days
+        if days_enabled is None:
+            days_enabled = [
+                Day.from_str(day) for day in mcc_config["days_enabled"]
+            ]
 
-    # Collect which days the club wishes to run a carpool
-    days_enabled = Configuration.config("mcc.days_enabled")
+        engine = mcc_config.get("engine", "greedy")
+        rider_order = mcc_config.get("rider_order", "random")
+        get_match_function(engine, rider_order)
 
-    for day in days_enabled:
+        tolerance = mcc_config.get("time_tolerance", 0)
 
-        # we're only copying the entire list of drivers once now.
-        # now copying only the seats remaining every day instead
-        # of the whole list.
-        for (days_d, d) in zip(days_drivers, drivers):
-            days_d.seats_remaining = d.seats_remaining
+        use_numpy = mcc_config.get("use_numpy", False)
+        if use_numpy and not CompatibilityMatrix.available():
+            logger.warning("use_numpy is set but NumPy is not installed")
+            use_numpy = False
 
-        day = Day.from_str(day)
+        # every day draws its own random stream from the run seed
+        if seed is None:
+            seed = mcc_config.get("seed")
+        if seed is None:
+            seed = random.randrange(2**32)
+        logger.info("matching with seed %s", seed)
 
-        # cars for the given day
-        cars = list()
+        workers = min(mcc_config.get("workers", 1), len(days_enabled))
 
-        # shuffle the riders for every day to ensure they are chosen fairly
-        random.shuffle(riders)
+        schedule = Schedule()
+        metrics = RunMetrics.get_instance()
 
-        seats_remaining = get_total_seats(days_drivers, day)
-        logger.info("%i seats available for %s", seats_remaining,
-                    Day.to_str(day))
+        if executor is None and workers <= 1:
+            for day in days_enabled:
+                with metrics.phase(Day.to_str(day)):
+                    schedule.add_day(
+                        day,
+                        match_day(riders, drivers, day, seed, engine, use_numpy,
+                                  rider_order, tolerance, indexes))
 
-        # Copy the riders to maintain the original list of riders so that
-        # each iteration of the loop has an unaffected rider list
-        # TODO: find a more efficient way to do this
-        days_riders = deepcopy(riders)
+            log_day_summaries(riders, schedule)
+            return schedule
 
-        # keep picking riders until no more seats remain or no more riders remain
-        while seats_remaining > 0 and len(days_riders) > 0:
-            chosen_rider = days_riders.pop()
-            # don't match rider if not riding current day
-            if not check_in_days(chosen_rider, day):
-                logger.debug("%s not riding %s", chosen_rider.name, day)
-                continue
+        own_executor = executor is None
+        if own_executor:
+            executor = start_workers(riders, drivers, workers)
+
+        weights = [rider.selection_weight for rider in riders]
+
+        try:
+            results = executor.map(
+                _match_day_worker, days_enabled, [seed] * len(days_enabled),
+                [engine] * len(days_enabled), [use_numpy] * len(days_enabled),
+                [rider_order] * len(days_enabled),
+                [tolerance] * len(days_enabled), [weights] * len(days_enabled))
+
+            # map returns results in day order
+            for (day, (seconds, day_cars)) in zip(days_enabled, results):
+                metrics.add_time(Day.to_str(day), seconds)
+
+                cars = list()
+                for (driver_position, rider_positions) in day_cars:
+                    car = Car(drivers[driver_position])
+                    car.riders = [riders[i] for i in rider_positions]
+                    cars.append(car)
+
+                schedule.add_day(day, cars)
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+        log_day_summaries(riders, schedule)
+        return schedule
+
+
+def log_day_summaries(riders: list, schedule: Schedule) -> None:
+    """Logs one summary record per day of the schedule.
+
+    Matching itself does not log per rider. Instead the number of riders matched
+    on each day is logged here, and at DEBUG level the names of the riders left
+    without a car.
 
-            best_driver, days_drivers = find_best_match(chosen_rider,
-                                                        days_drivers, day)
+    Args:
+        riders:
+            list of Rider objects the schedule was made for
+        schedule:
+            iterable of (Day.DayName, [Car]) tuples
+    """
+
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    for (day, cars) in schedule:
+        matched = set()
+        for car in cars:
+            matched.update(car.riders)
+
+        day_riders = [rider for rider in riders if rider.in_day(day)]
 
-            # Used to check if a Car object has been created for this rider, for this day yet
-            driver_has_car = False
+        logger.info("%s: %i of %i riders matched in %i cars", Day.to_str(day),
+                    len(matched), len(day_riders), len(cars))
 
-            if best_driver:
-                # add rider to selected driver's car
-                for car in cars:
-                    if car.driver == best_driver:
-                        car.riders.append(chosen_rider)
-                        driver_has_car = True
+        if debug:
+            unmatched = [r.name for r in day_riders if r not in matched]
+            if unmatched:
+                logger.debug("%s: not matched: %s", Day.to_str(day),
+                             ", ".join(unmatched))
 
-                # give driver a car if they don't already have one
-                if not driver_has_car:
-                    new_car = Car(best_driver)
-                    new_car.riders.append(chosen_rider)
-                    cars.append(new_car)
 
-                seats_remaining -= 1
-            else:
-                logger.debug("%s not matched", chosen_rider.name)
+def count_schedule(riders: list, drivers: list, schedule: Schedule) -> dict:
+    """Counts the members, seats and matches of a schedule.
 
-        schedule.append((day, cars))
+    Args:
+        riders:
+            list of Rider objects the schedule was made for
+        drivers:
+            list of Driver objects the schedule was made for
+        schedule:
+            iterable of (Day.DayName, [Car]) tuples
+
+    Returns:
+        dictionary of counter name to count. Totals over all days are under
+        "riders", "drivers", "seats_offered", "seats_filled" and "unmatched_riders",
+        the same counts for a single day are prefixed with the day's name
+    """
 
-    return schedule
+    counts = {
+        "riders": len(riders),
+        "drivers": len(drivers),
+        "seats_offered": 0,
+        "seats_filled": 0,
+        "unmatched_riders": 0,
+    }
+
+    for (day, cars) in schedule:
+        day_counts = {
+            "riders":
+                sum([1 for rider in riders if rider.in_day(day)]),
+            "drivers":
+                sum([1 for driver in drivers if driver.in_day(day)]),
+            "seats_offered":
+                sum([driver.seats for driver in drivers if driver.in_day(day)]),
+            "seats_filled":
+                sum([len(car.riders) for car in cars]),
+        }
+        day_counts["unmatched_riders"] = (day_counts["riders"] -
+                                          day_counts["seats_filled"])
+
+        for (name, count) in day_counts.items():
+            counts["{}/{}".format(Day.to_str(day), name)] = count
+
+        counts["seats_offered"] += day_counts["seats_offered"]
+        counts["seats_filled"] += day_counts["seats_filled"]
+        counts["unmatched_riders"] += day_counts["unmatched_riders"]
+
+    return counts
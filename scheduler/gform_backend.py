@@ -11,19 +11,26 @@ Typical usage:
 
 import logging
 import gspread
+from gspread.urls import DRIVE_FILES_API_V3_URL
+from gspread.utils import a1_range_to_grid_range, absolute_range_name
 from gspread_formatting import *
+import gspread_formatting.batch_update_requests as format_requests
 import json
 import sys
-from datetime import datetime
 from random import uniform
 
 import scheduler.util as util
 from scheduler.classes.AuthorizedClient import AuthorizedClient
 from scheduler.classes.Driver import Driver
 from scheduler.classes.Car import Car
+from scheduler.classes.LocationRegistry import LocationRegistry
 from scheduler.classes.Member import Member
-import scheduler.classes.MeetingLocation as MeetingLocation
+from scheduler.classes.MemberTable import MemberTable
 from scheduler.classes.Rider import Rider
+from scheduler.classes.RunContext import RunContext
+from scheduler.classes.RowStream import RowStream
+from scheduler.classes.RunMetrics import RunMetrics
+from scheduler.classes.Schedule import Schedule
 import scheduler.classes.Day as Day
 from scheduler.classes.WSCell import WSCell
 from scheduler.classes.WSRange import WSRange, CarBlock
@@ -69,42 +76,40 @@ def validate_dues_payers(email: str, dues_payers: set) -> bool:
     return uniqname in dues_payers
 
 
-def parse_location(location: str) -> str:
+def parse_location(location: str) -> int:
     """Converts location name in value for locations list.
 
         Args:
             location: 
-                string that contains the location
+                string that contains the location, as labeled in the form
         Returns
-            String that is either "NORTH" or "CENTRAL"
+            id of the location in the LocationRegistry, None if the label is not
+            in the [locations] configuration
     """
 
-    if location == "North Campus (Pierpont Commons)":
-        return MeetingLocation.MeetingLocation.NORTH
-    elif location == "Central Campus (The Cube)":
-        return MeetingLocation.MeetingLocation.CENTRAL
+    return LocationRegistry.get_instance().parse(location)
 
 
-def parse_times(time: str) -> float:
-    """Converts hh:mm to decimal time: hh.(mm/60).
+def parse_times(time: str) -> int:
+    """Converts hh:mm <AM|PM> to a time code, the number of minutes since midnight.
 
         Args:
             time:
                 time, as a string in hh:mm <AM|PM> time
         
         Returns
-            float that is the time converted to hh.(mm/60) time
+            int that is the time converted to minutes since midnight
     """
     time = time.split()
 
-    # conversion from 12-hr with AM/PM time to 24-hr time
+    # conversion from 12-hr with AM/PM time to 24-hr time, 12 AM is hour 0
     if time[1] == "PM":
         conversion_scalar = 12
     else:
         conversion_scalar = 0
 
     time = time[0].split(":")
-    return float(time[0]) + (float(time[1]) / 60) + conversion_scalar
+    return Day.to_minutes(int(time[0]) % 12 + conversion_scalar, int(time[1]))
 
 
 def get_days_and_locations(start_col: int, response: int,
@@ -174,44 +179,45 @@ def get_days_and_locations(start_col: int, response: int,
 
             times_strs = response[i + len(days_enabled)].split(",")
 
+            locations = list()
+            for l in response[i].split(","):
+                location = parse_location(l.strip())
+                if location is not None and location not in locations:
+                    locations.append(location)
+
             day = Day.DayInfo(day=Day.from_str(d),
                               times=[
                                   parse_times(times_strs[i])
                                   for i in range(0, len(times_strs))
                               ],
-                              locations=list())
-
-            locations = response[i].split(",")
-
-            for l in locations:
-                day.locations.append(parse_location(l.strip()))
+                              locations=locations)
 
             days.append(day)
 
     return days
 
 
-def get_riders_and_drivers(
-        responses: list, days_enabled: list,
-        dues_payers_sheet: gspread.models.Worksheet) -> (list, list):
-    """Gets drivers from the responses.
+def get_member_table(responses, days_enabled: list,
+                     dues_payers: set) -> MemberTable:
+    """Parses the responses into a MemberTable.
+
+    Rows are parsed one at a time as they are iterated, so responses can be a
+    RowStream that is still downloading.
 
         Args:
             responses:
-                list of responses from spreadsheet
+                list or iterable of responses from spreadsheet, starting with
+                the heading row
             days_enabled:
                 list of days that the spreadsheet software is run for
-        
+            dues_payers:
+                set of uniqnames of due paying members
+
         Returns
-            tuple of lists
-                list at index 0: list of Driver objects
-                list at index 1: list of Rider objects
+            MemberTable with a row for every rider and every driver response
     """
 
-    dues_payers = get_dues_payers(dues_payers_sheet)
-
-    drivers = list()
-    riders = list()
+    table = MemberTable([Day.from_str(d) for d in days_enabled])
 
     columns = Configuration.config("gform_backend.columns")
 
@@ -224,75 +230,212 @@ def get_riders_and_drivers(
     is_driver_column = columns["is_driver"]
     days_info_start_column = columns["days_info_start"]
 
-    for row in responses[1:]:
+    # checked once, not for every response
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    rows = iter(responses)
+
+    # skip the heading row
+    next(rows, None)
+
+    for row in rows:
         is_driver = (row[is_driver_column] == "Yes")
         is_rider = (row[is_rider_column] == "Yes")
 
         if is_driver:
 
-            driver = Driver(name=row[name_column],
-                            email=row[email_column],
-                            phone=row[phone_column],
-                            is_dues_paying=validate_dues_payers(
-                                row[email_column], dues_payers),
-                            days=get_days_and_locations(
-                                days_info_start_column + 2 * len(days_enabled),
-                                row, days_enabled),
-                            car_type=row[car_type_column],
-                            seats=int(row[seats_column]))
+            days = get_days_and_locations(
+                days_info_start_column + 2 * len(days_enabled), row,
+                days_enabled)
 
-            for d in driver.days:
-                logger.debug("[Driver] %s: %s", driver.name, d)
+            if debug:
+                logger.debug("[Driver] %s: %s", row[name_column], days)
 
-            drivers.append(driver)
+            table.add(name=row[name_column],
+                      email=row[email_column],
+                      phone=row[phone_column],
+                      days=days,
+                      is_dues_paying=validate_dues_payers(
+                          row[email_column], dues_payers),
+                      car_type=row[car_type_column],
+                      seats=int(row[seats_column]))
 
         if is_rider:
 
-            rider = Rider(name=row[name_column],
-                          email=row[email_column],
-                          phone=row[phone_column],
-                          is_dues_paying=validate_dues_payers(
-                              row[email_column], dues_payers),
-                          days=get_days_and_locations(days_info_start_column,
-                                                      row, days_enabled))
+            days = get_days_and_locations(days_info_start_column, row,
+                                          days_enabled)
+
+            if debug:
+                logger.debug("[Rider] %s: %s", row[name_column], days)
+
+            table.add(name=row[name_column],
+                      email=row[email_column],
+                      phone=row[phone_column],
+                      days=days,
+                      is_dues_paying=validate_dues_payers(
+                          row[email_column], dues_payers))
+
+    return table
+
+
+def get_riders_and_drivers(responses, days_enabled: list,
+                           dues_payers: set) -> (list, list):
+    """Gets riders and drivers from the responses.
+
+    Members are stored in a MemberTable, the returned riders and drivers are
+    views over its rows.
+
+        Args:
+            responses:
+                list or iterable of responses from spreadsheet, starting with
+                the heading row
+            days_enabled:
+                list of days that the spreadsheet software is run for
+            dues_payers:
+                set of uniqnames of due paying members
+        
+        Returns
+            tuple of lists
+                list at index 0: list of Rider objects
+                list at index 1: list of Driver objects
+    """
+
+    table = get_member_table(responses, days_enabled, dues_payers)
+
+    return table.riders(), table.drivers()
+
+
+def get_response_stream(responses_sheet: gspread.models.Worksheet,
+                        days_enabled: list) -> RowStream:
+    """Starts reading the responses sheet a page of rows at a time.
+
+    The page size and the number of pages read ahead are set in the
+    [gform_backend.ingest] table of the configuration.
+
+        Args:
+            responses_sheet:
+                worksheet of form responses
+            days_enabled:
+                list of days that the spreadsheet software is run for
+
+        Returns:
+            RowStream over every row of the sheet, heading row included
+    """
+
+    columns = Configuration.config("gform_backend.columns")
+    ingest_config = Configuration.config("gform_backend").get("ingest", dict())
+
+    # the driver times of the last day are the last column that is read
+    width = max(max(columns.values()),
+                columns["days_info_start"] + 4 * len(days_enabled) - 1) + 1
+
+    return RowStream(responses_sheet,
+                     width,
+                     page_rows=ingest_config.get("page_rows", 500),
+                     prefetch_pages=ingest_config.get("prefetch_pages", 2))
+
+
+def member_table_from_sheet(context: RunContext = None) -> MemberTable:
+    """Gets all club members who submitted a response using the form.
+
+        Args:
+            context:
+                RunContext to read the sheets with, the active context when not
+                provided
+
+        Returns:
+            MemberTable with a row for every rider and every driver response
+    """
+
+    with RunContext.use(context):
+        metrics = RunMetrics.get_instance()
 
-            for d in rider.days:
-                logger.debug("[Rider] %s: %s", rider.name, d)
+        authorized_client = AuthorizedClient.get_instance()
 
-            riders.append(rider)
+        gform_backend_config = Configuration.config("gform_backend.files")
+        days_enabled = Configuration.config("mcc.days_enabled")
 
-    return riders, drivers
+        with metrics.phase("open_sheets"):
+            # listing the drive is a full API call, only made for the debug log
+            if logger.isEnabledFor(logging.DEBUG):
+                for sheet in authorized_client.client.openall():
+                    logger.debug("%s", sheet.title)
 
+            # get responses and dues payers sheets, clubs in the same process
+            # share the opened spreadsheets
+            responses_sheet = authorized_client.open(
+                gform_backend_config["responses_sheet"]).sheet1
+            dues_payers_sheet = authorized_client.open(
+                gform_backend_config["dues_sheet"]).sheet1
 
-def members_from_sheet() -> (list, list):
+        # create lists of riders and drivers
+        print(days_enabled)
+
+        # rows are parsed while the next pages are downloaded
+        with metrics.phase("stream_rows"):
+            all_responses = get_response_stream(responses_sheet, days_enabled)
+            dues_payers = get_dues_payers(dues_payers_sheet)
+            table = get_member_table(all_responses, days_enabled, dues_payers)
+
+        metrics.count("response_rows", max(all_responses.rows - 1, 0))
+        metrics.count("response_pages", all_responses.pages)
+
+        return table
+
+
+def members_from_sheet(context: RunContext = None) -> (list, list):
     """Gets all club members who submitted a response using the form.
 
+        Args:
+            context:
+                RunContext to read the sheets with, the active context when not
+                provided
+
         Returns:
             (list, list)
             The list in index 0 is a list of riders, where each entry is a Rider object
             The list in index 1 is a list of drivers, where each entry is a Driver object
     """
 
-    client = AuthorizedClient.get_instance().client
+    table = member_table_from_sheet(context)
+
+    return table.riders(), table.drivers()
 
-    gform_backend_config = Configuration.config("gform_backend.files")
-    days_enabled = Configuration.config("mcc.days_enabled")
 
-    for sheet in client.openall():
-        logger.debug("%s", sheet.title)
+def get_sheet_revision(context: RunContext = None) -> list:
+    """Gets the revision of the responses and dues spreadsheets.
 
-    # get responses and dues payers sheets
-    responses_sheet = client.open(
-        gform_backend_config["responses_sheet"]).sheet1
-    dues_payers_sheet = client.open(gform_backend_config["dues_sheet"]).sheet1
+    The Drive version of a file goes up with every change made to it, so the
+    members only need to be read again when a version changed. Getting the
+    versions is a single small Drive API call per spreadsheet.
+
+        Args:
+            context:
+                RunContext to read the sheets with, the active context when not
+                provided
+
+        Returns:
+            list of the Drive versions of the responses and dues spreadsheets
+    """
 
-    all_responses = responses_sheet.get_all_values()
+    with RunContext.use(context):
+        authorized_client = AuthorizedClient.get_instance()
+        gform_backend_config = Configuration.config("gform_backend.files")
 
-    # create lists of riders and drivers
-    print(days_enabled)
+        revision = list()
+        for name in (gform_backend_config["responses_sheet"],
+                     gform_backend_config["dues_sheet"]):
+            spreadsheet = authorized_client.open(name)
+            response = authorized_client.client.request(
+                "get",
+                "{}/{}".format(DRIVE_FILES_API_V3_URL, spreadsheet.id),
+                params={
+                    "fields": "version",
+                    "supportsAllDrives": True
+                })
+            revision.append([spreadsheet.id, response.json()["version"]])
 
-    return get_riders_and_drivers(all_responses, days_enabled,
-                                  dues_payers_sheet)
+        return revision
 
 
 def delete_spreadsheet(name: str) -> None:
@@ -308,7 +451,7 @@ def delete_spreadsheet(name: str) -> None:
             logger.info("Deleting spreadsheet: %s", s.title)
 
 
-def create_spreadsheet() -> gspread.models.Spreadsheet:
+def create_spreadsheet(name: str = None) -> gspread.models.Spreadsheet:
     """Creates a spreadsheet with given name in the location defined by the folder_id.
 
     The folder_id can be found by viewing the folder in Drive and selecting the
@@ -318,6 +461,15 @@ def create_spreadsheet() -> gspread.models.Spreadsheet:
 
     The folder id and the name of the spreadsheet to create are in the toml config files
 
+    Creating takes three API calls: one to list the spreadsheets with the name,
+    one to create the new spreadsheet and one to share it. Every existing
+    spreadsheet with the name costs one more call to delete it, since Drive
+    deletes one file per call.
+
+        Args:
+            name:
+                name of the spreadsheet, the configured output_sheet when not provided
+
         Returns:
             A gspread.models.Spreadsheet object
     """
@@ -325,14 +477,17 @@ def create_spreadsheet() -> gspread.models.Spreadsheet:
     config = Configuration.config("gform_backend.files")
     client = AuthorizedClient.get_instance().client
 
-    # checks if sheet with name already exists, deletes if exists
-    if client.openall(config["output_sheet"]):
-        delete_spreadsheet(config["output_sheet"])
+    if name is None:
+        name = config["output_sheet"]
+
+    # checks if sheet with name already exists, deletes if exists. The listing
+    # already has the ids, so it is not listed again to delete them
+    for existing in client.openall(name):
         logger.info("Sheet exists, deleting")
+        client.del_spreadsheet(existing.id)
 
-    logger.info("Creating sheet")
-    spreadsheet = client.create(config["output_sheet"],
-                                folder_id=config["output_folder_id"])
+    logger.info("Creating sheet %s", name)
+    spreadsheet = client.create(name, folder_id=config["output_folder_id"])
     spreadsheet.share("rkalnins@umich.edu",
                       notify=False,
                       perm_type="user",
@@ -368,15 +523,16 @@ def unpack_locations(member: Member, day: Day.DayName) -> str:
 
     locations = member.get_locations(day)
     location_str = ""
+    registry = LocationRegistry.get_instance()
 
     for l in locations:
-        location_str = location_str + MeetingLocation.to_str(l) + " "
+        location_str = location_str + registry.to_str(l) + " "
 
     return location_str
 
 
 def unpack_time(driver: Driver, day: Day.DayName) -> str:
-    """Converts time from decimal time (hh.(mm/60)) to hh:mm <AM|PM> format
+    """Converts the driver's departure time code to hh:mm <AM|PM> format
 
         Args:
             driver:
@@ -385,15 +541,11 @@ def unpack_time(driver: Driver, day: Day.DayName) -> str:
                 Day.DayName enum for which to get the time
         
         Returns:
-            Returns the unpacked time as a string, converted from (hh.(mm/60)) to (hh:mm) <AM|PM> format
+            Returns the unpacked time as a string in (hh:mm) <AM|PM> format
     """
 
-    time = driver.get_times(day)[0]
-    dt = datetime.strptime("{0:02.0f}:{1:02.0f}".format(*divmod(time * 60, 60)),
-                           "%H:%M")
-
     # there should only be one time for the driver
-    return dt.strftime("%I:%M %p")
+    return Day.time_to_str(driver.get_times(day)[0])
 
 
 def get_car_block_colors() -> (float, float, float, float):
@@ -426,10 +578,10 @@ def get_car_block_colors() -> (float, float, float, float):
 
 
 def format_column_widths(ws: gspread.models.Worksheet,
-                         column_widths: list) -> None:
-    """Sets the first n column widths for the provided worksheet where n is the
-    number of provided column widths. The columns (column index > n) will be
-    set using the width of column n.
+                         column_widths: list) -> list:
+    """Returns the requests setting the first n column widths for the provided
+    worksheet where n is the number of provided column widths. The columns
+    (column index > n) will be set using the width of column n.
         
         Args:
             ws:
@@ -438,7 +590,7 @@ def format_column_widths(ws: gspread.models.Worksheet,
                 A list of column widths in pixels (int)
 
         Returns:
-            None
+            list of batch_update requests
 
     """
     widths_list = list()
@@ -461,11 +613,12 @@ def format_column_widths(ws: gspread.models.Worksheet,
 
         widths_list.append((col_letter, w))
 
-    set_column_widths(ws, widths_list)
+    return format_requests.set_column_widths(ws, widths_list)
 
 
 def configure_sheet_title(ws: gspread.models.Worksheet,
-                          day: Day.DayName) -> (str, tuple):
+                          day: Day.DayName,
+                          name: str = None) -> (str, tuple):
     """Returns the output and corresponding format for the provided sheet's title
 
         Args:
@@ -473,12 +626,16 @@ def configure_sheet_title(ws: gspread.models.Worksheet,
                 The worksheet for which to set the title
             day:
                 The day which appears as a suffic to the sheet_name_base
+            name:
+                The suffix to use instead of the day's name
     
         Returns:
             heading text:
                 The text to use as the heading for the sheet
             (cell_A1A1, title_fmt):
                 The range and format to use on the sheet title cell
+            merge request:
+                The batch_update request merging the title cells
 
     """
     output_config = Configuration.config("gform_backend.output")
@@ -489,7 +646,7 @@ def configure_sheet_title(ws: gspread.models.Worksheet,
 
     cell_A1A1 = WSRange(WSCell(1, 1), WSCell(1, 1)).getA1()
 
-    title = output_config["name"] + " — " + Day.to_str(day)
+    title = output_config["name"] + " — " + (name or Day.to_str(day))
 
     # text for the title
     heading_text = {
@@ -503,9 +660,16 @@ def configure_sheet_title(ws: gspread.models.Worksheet,
                               fontSize=output_config["title_font_size"]))
 
     # merge the cells to make the sheet look nicer
-    ws.merge_cells(title_range_a1)
+    title_grid_range = a1_range_to_grid_range(title_range_a1)
+    title_grid_range["sheetId"] = ws.id
+    merge_request = {
+        "mergeCells": {
+            "mergeType": "MERGE_ALL",
+            "range": title_grid_range
+        }
+    }
 
-    return heading_text, (cell_A1A1, title_fmt)
+    return heading_text, (cell_A1A1, title_fmt), merge_request
 
 
 def get_car_output(car: Car, a1_range: str, day: Day) -> dict:
@@ -636,19 +800,28 @@ def get_initial_indicies() -> (int, int, int, int):
     return start_row_index, end_row_index, start_col_index, end_col_index
 
 
-# TODO -> This function is a monster! I appreciate that it works well, but I think for maintainability it should
-# be broken up into smaller functions, and needs to be more clearly labeled and commented and documented
-
-
-def write_schedule(schedule: list,
-                   spreadsheet: gspread.models.Spreadsheet) -> None:
-    """Write schedule to provided sheet.
+def get_day_output(ws: gspread.models.Worksheet, day: tuple,
+                   sheet_name: str) -> (list, list, int, int):
+    """Returns the values and formatting of a day's worksheet.
 
         Args:
-            schedule:
-                list of the schedule that is to be written to google sheets
-            spreadsheet:
-                spreadsheet to write the schedule to
+            ws:
+                The worksheet the day is written to
+            day:
+                The day, a (Day.DayName, [Car]) tuple
+            sheet_name:
+                The name of the worksheet, used in its title
+
+        Returns:
+            values:
+                list of dictionaries of a range and values for values.batchUpdate
+            requests:
+                list of batch_update requests sizing, merging and formatting the
+                worksheet's cells
+            rows:
+                number of rows the output takes up
+            columns:
+                number of columns the output takes up
     """
 
     # Get settings for sheet writing from configuration file
@@ -661,73 +834,175 @@ def write_schedule(schedule: list,
     general_font_size = output_config["general_font_size"]
     column_widths = output_config["column_widths"]
 
-    # each day is a worksheet (i.e. a tab)
-    for (i, day) in zip(range(0, len(schedule)), schedule):
-        ws = spreadsheet.get_worksheet(i)
+    day_output = list()
+    day_format = list()
+    requests = format_column_widths(ws, column_widths)
 
-        # if the ith worksheet doesn't exist, we need to create it.
-        # if it already exists, then we duplicate the existing sheet
-        # and use a different name that matches the current scheme
-        # and then delete the old sheet
-        #
-        # used when we need to delete the default sheet1
-        # and create a sheet for the current day
-        if not ws:
-            ws = spreadsheet.add_worksheet(Day.to_str(day[0]), 100, 100)
-        else:
-            ws_new = spreadsheet.duplicate_sheet(ws.id,
-                                                 new_sheet_name=Day.to_str(
-                                                     day[0]))
-            spreadsheet.del_worksheet(ws)
-            ws = ws_new
+    # sheet titles
+    if use_sheet_titles:
+        outputs, formats, merge_request = configure_sheet_title(
+            ws, day[0], sheet_name)
+        day_output.append(outputs)
+        day_format.append(formats)
+        requests.append(merge_request)
+
+    start_row, end_row, start_col, end_col = get_initial_indicies()
+    car_block = CarBlock(start_row, end_row, start_col, end_col)
 
-        day_output = list()
-        day_format = list()
+    # add each car in the current day to the day's output list
+    for car in day[1]:
 
-        format_column_widths(ws, column_widths)
+        car_block.update_block_length(car.seats)
 
-        # sheet titles
-        if use_sheet_titles:
-            outputs, formats = configure_sheet_title(ws, day[0])
-            day_output.append(outputs)
-            day_format.append(formats)
+        # get the ranges for this car
+        car_block_a1_range = car_block.get_car_block_a1_range()
+        heading_a1_range = car_block.get_car_heading_a1_range()
+        roles_a1_range = car_block.get_car_roles_a1_range()
 
-        start_row, end_row, start_col, end_col = get_initial_indicies()
-        car_block = CarBlock(start_row, end_row, start_col, end_col)
+        red, green, blue, alpha = get_car_block_colors()
 
-        # add each car in the current day to the day's output list
-        for car in day[1]:
+        # prepare all formatting
+        car_block_fmt = cellFormat(
+            backgroundColor=color(red, green, blue, alpha),
+            textFormat=textFormat(fontSize=general_font_size),
+        )
+        roles_col_fmt = cellFormat(textFormat=textFormat(bold=bold_roles))
+        header_row_fmt = cellFormat(textFormat=textFormat(bold=bold_header))
 
-            car_block.update_block_length(car.seats)
+        # add formatting to update list
+        day_format.append((car_block_a1_range, car_block_fmt))
+        day_format.append((heading_a1_range, header_row_fmt))
+        day_format.append((roles_a1_range, roles_col_fmt))
 
-            # get the ranges for this car
-            car_block_a1_range = car_block.get_car_block_a1_range()
-            heading_a1_range = car_block.get_car_heading_a1_range()
-            roles_a1_range = car_block.get_car_roles_a1_range()
+        day_output.append(get_car_output(car, car_block_a1_range, day))
 
-            red, green, blue, alpha = get_car_block_colors()
+        # move to next writing location
+        car_block.move_to_next()
 
-            # prepare all formatting
-            car_block_fmt = cellFormat(
-                backgroundColor=color(red, green, blue, alpha),
-                textFormat=textFormat(fontSize=general_font_size),
-            )
-            roles_col_fmt = cellFormat(textFormat=textFormat(bold=bold_roles))
-            header_row_fmt = cellFormat(textFormat=textFormat(bold=bold_header))
+    requests.extend(format_requests.format_cell_ranges(ws, day_format))
 
-            # add formatting to update list
-            day_format.append((car_block_a1_range, car_block_fmt))
-            day_format.append((heading_a1_range, header_row_fmt))
-            day_format.append((roles_a1_range, roles_col_fmt))
+    # the bottom right corner of the output and the merged title size the
+    # worksheet
+    grid_ranges = [
+        a1_range_to_grid_range(output["range"]) for output in day_output
+    ]
+    grid_ranges.extend([
+        request["mergeCells"]["range"]
+        for request in requests
+        if "mergeCells" in request
+    ])
+
+    rows = max([r.get("endRowIndex", 0) for r in grid_ranges] + [0])
+    columns = max([r.get("endColumnIndex", 0) for r in grid_ranges] + [0])
+
+    return day_output, requests, rows, columns
+
+
+def write_schedule(schedule: list,
+                   spreadsheet: gspread.models.Spreadsheet,
+                   sheet_names: list = None,
+                   context: RunContext = None) -> None:
+    """Write schedule to provided sheet.
 
-            day_output.append(get_car_output(car, car_block_a1_range, day))
+    Each day is written to a worksheet (i.e. a tab) of its own, which replaces
+    the worksheets the spreadsheet had. Whatever the number of days, the whole
+    schedule takes three API calls: one to list the existing worksheets, one
+    batch_update adding, sizing, merging and formatting the new worksheets and
+    deleting the old ones, and one values batch update writing every day's
+    values.
 
-            # move to next writing location
-            car_block.move_to_next()
+        Args:
+            schedule:
+                list of the schedule that is to be written to google sheets
+            spreadsheet:
+                spreadsheet to write the schedule to
+            sheet_names:
+                name of the worksheet of each day of the schedule, the day's name
+                when not provided
+            context:
+                RunContext to write with, the active context when not provided
+    """
 
-        # batch update minimizes API calls
-        ws.batch_update(day_output)
-        format_cell_ranges(ws, day_format)
+    with RunContext.use(context):
+        metrics = RunMetrics.get_instance()
+
+        if not sheet_names:
+            sheet_names = [Day.to_str(day[0]) for day in schedule]
+
+        with metrics.phase("worksheets"):
+            existing = spreadsheet.worksheets()
+
+        # an existing worksheet holding the name of a new one is renamed, as
+        # names must be unique until the existing worksheets are deleted
+        rename_requests = list()
+        for ws in existing:
+            if ws.title in sheet_names:
+                rename_requests.append({
+                    "updateSheetProperties": {
+                        "properties": {
+                            "sheetId": ws.id,
+                            "title": "{} (old {})".format(ws.title, ws.id),
+                        },
+                        "fields": "title",
+                    }
+                })
+
+        # the new worksheets' ids are picked here, so the requests formatting
+        # them can go in the same batch_update that adds them
+        next_id = max([ws.id for ws in existing] + [0]) + 1
+
+        add_requests = list()
+        day_requests = list()
+        values = list()
+
+        with metrics.phase("formatting"):
+            for (i, (day, sheet_name)) in enumerate(zip(schedule, sheet_names)):
+                properties = {
+                    "sheetId": next_id + i,
+                    "title": sheet_name,
+                    "index": i,
+                }
+                ws = gspread.models.Worksheet(spreadsheet, properties)
+
+                day_output, requests, rows, columns = get_day_output(
+                    ws, day, sheet_name)
+
+                properties["gridProperties"] = {
+                    "rowCount": max(rows, 100),
+                    "columnCount": max(columns, 26),
+                }
+                add_requests.append({"addSheet": {"properties": properties}})
+                day_requests.extend(requests)
+
+                values.extend([
+                    dict(output,
+                         range=absolute_range_name(sheet_name, output["range"]))
+                    for output in day_output
+                ])
+
+        delete_requests = [{
+            "deleteSheet": {
+                "sheetId": ws.id
+            }
+        } for ws in existing]
+
+        # a spreadsheet must keep a worksheet, the old ones are only deleted
+        # when there are days to replace them with
+        if not add_requests:
+            delete_requests = list()
+
+        with metrics.phase("batch_update"):
+            spreadsheet.batch_update({
+                "requests":
+                    rename_requests + add_requests + delete_requests +
+                    day_requests
+            })
+
+            if values:
+                spreadsheet.values_batch_update(body={
+                    "valueInputOption": "RAW",
+                    "data": values,
+                })
 
 
 def sort_schedule_for_output(schedule: list) -> list:
@@ -742,6 +1017,10 @@ def sort_schedule_for_output(schedule: list) -> list:
 
     """
 
+    # a Schedule already keeps each day's cars in departure order
+    if isinstance(schedule, Schedule):
+        return schedule
+
     # we want to sort each day in the schedule
     for day in schedule:
 
@@ -769,12 +1048,36 @@ def sort_schedule_for_output(schedule: list) -> list:
     return schedule
 
 
-def write_to_sheet(schedule: list) -> None:
+def write_to_sheet(schedule: list,
+                   name: str = None,
+                   sheet_names: list = None,
+                   context: RunContext = None) -> None:
     """Writes provided schedule to a spreadsheet defined by the provided name.
 
     An exisiting spreadsheet with the same name will be deleted and a new one will
-    be made in its place.
+    be made in its place. Publishing costs the same number of API calls however
+    many days the schedule has:
+
+        create_spreadsheet  3, plus 1 per existing spreadsheet with the name
+        write_schedule      3, to list, replace and fill the worksheets
+
+    so 6 calls when no spreadsheet has the name yet, and 7 when the previous
+    run's spreadsheet is replaced.
+
+        Args:
+            schedule:
+                list of the schedule that is to be written to google sheets
+            name:
+                name of the spreadsheet, the configured output_sheet when not provided
+            sheet_names:
+                name of the worksheet of each day of the schedule, the day's name
+                when not provided
+            context:
+                RunContext to write with, the active context when not provided
     """
-    spreadsheet = create_spreadsheet()
+    with RunContext.use(context):
+        with RunMetrics.get_instance().phase("create_spreadsheet"):
+            spreadsheet = create_spreadsheet(name)
 
-    write_schedule(sort_schedule_for_output(schedule), spreadsheet)
+        write_schedule(sort_schedule_for_output(schedule), spreadsheet,
+                       sheet_names)
@@ -0,0 +1,467 @@
+""" Incremental re-matching of a published schedule.
+
+After every run the members and the schedule are saved to a state file. When late
+responses come in, rematch() first compares the new responses with the saved ones.
+Every car assignment that is still valid is kept, and only the riders that were
+added, changed their response or lost their seat are matched, into the seats that
+are still open and with the drivers that share a location with them. Riders who
+were not placed before are only tried again on days a seat was freed or a driver
+was added, so the work of a rematch follows the size of the change, not the size
+of the roster.
+
+Members are keyed by email. A second response with the same email is keyed by the
+email and its number, "foo@bar.com#2", so no response is lost.
+
+Typical Usage:
+    import scheduler.incremental as incremental
+
+    state = incremental.load_state(filename)
+    schedule = incremental.rematch(state, riders, drivers)
+    incremental.save_state(filename, riders, drivers, schedule)
+"""
+
+from datetime import date, datetime
+import json
+import logging
+import os
+import random
+
+from scheduler.classes.CompatibilityMatrix import CompatibilityMatrix
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.LocationRegistry import LocationRegistry
+from scheduler.classes.Member import Member
+from scheduler.classes.Schedule import Schedule
+from scheduler.generate_rides import (get_match_function, order_riders,
+                                      log_day_summaries)
+import scheduler.classes.Day as Day
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 3
+
+
+def get_day_state(member: Member,
+                  day: Day.DayName,
+                  registry: LocationRegistry = None) -> dict:
+    """Returns the member's locations and times for a day in state file form.
+
+    Locations are saved by name instead of id, so the state stays valid when
+    locations are added to the configuration.
+
+    Args:
+        member:
+            Member object
+        day:
+            Day.DayName enum
+        registry:
+            LocationRegistry naming the locations, the active one when not
+            provided
+
+    Returns:
+        dictionary with sorted "locations" and "times" lists, or None if the
+        member does not take part on the day
+    """
+
+    if not member.in_day(day):
+        return None
+
+    if registry is None:
+        registry = LocationRegistry.get_instance()
+
+    return {
+        "locations":
+            sorted([registry.to_str(l) for l in member.get_locations(day)]),
+        "times":
+            sorted(member.get_times(day)),
+    }
+
+
+def get_member_state(member: Member,
+                     days: list,
+                     registry: LocationRegistry = None) -> dict:
+    """Returns the parts of a member's response that matching depends on.
+
+    Args:
+        member:
+            Rider or Driver object
+        days:
+            list of Day.DayName enums
+        registry:
+            LocationRegistry naming the locations, the active one when not
+            provided
+
+    Returns:
+        dictionary that can be saved as JSON
+    """
+
+    if registry is None:
+        registry = LocationRegistry.get_instance()
+
+    day_states = dict()
+    for day in days:
+        day_state = get_day_state(member, day, registry)
+        if day_state is not None:
+            day_states[Day.to_str(day)] = day_state
+
+    state = {"name": member.name, "days": day_states}
+
+    if hasattr(member, "seats"):
+        state["seats"] = member.seats
+
+    return state
+
+
+def get_member_keys(members: list) -> list:
+    """Returns the key of every member, its email numbered from the second
+    response with the same email on.
+
+    Args:
+        members:
+            list of Rider or Driver objects
+
+    Returns:
+        list of keys, in the order of members
+    """
+
+    counts = dict()
+    keys = list()
+
+    for member in members:
+        count = counts.get(member.email, 0) + 1
+        counts[member.email] = count
+        keys.append(member.email if count ==
+                    1 else "{}#{}".format(member.email, count))
+
+    return keys
+
+
+def save_state(filename: str,
+               riders: list,
+               drivers: list,
+               schedule: Schedule,
+               fairness: dict = None,
+               week_start: date = None) -> None:
+    """Saves the members and schedule of a run for a later rematch.
+
+    Args:
+        filename:
+            path of the JSON state file
+        riders:
+            list of Rider objects
+        drivers:
+            list of Driver objects
+        schedule:
+            the run's schedule, an iterable of (Day.DayName, [Car]) tuples
+        fairness:
+            outcome FairnessLedger.record returned for the schedule, None if it
+            was not recorded
+        week_start:
+            Monday of the week the schedule is for, None if it is not known
+    """
+
+    days = [day for (day, _) in schedule]
+    registry = LocationRegistry.get_instance()
+    rider_keys = dict(zip(riders, get_member_keys(riders)))
+    driver_keys = dict(zip(drivers, get_member_keys(drivers)))
+
+    state = {
+        "version": STATE_VERSION,
+        "riders": {
+            key: get_member_state(r, days, registry)
+            for (r, key) in rider_keys.items()
+        },
+        "drivers": {
+            key: get_member_state(d, days, registry)
+            for (d, key) in driver_keys.items()
+        },
+        "schedule": {
+            Day.to_str(day): [{
+                "driver": driver_keys[car.driver],
+                "riders": [rider_keys[r] for r in car.riders],
+            } for car in cars] for (day, cars) in schedule
+        },
+        "fairness": fairness,
+        "week_start": week_start.isoformat() if week_start else None,
+    }
+
+    # write to a temporary file first so a failed write keeps the old state
+    with open(filename + ".tmp", "w") as state_file:
+        json.dump(state, state_file)
+    os.replace(filename + ".tmp", filename)
+
+
+def load_state(filename: str) -> dict:
+    """Loads a state file written by save_state.
+
+    Returns:
+        The state dictionary, or None if the file does not exist or was written by
+        a different version
+    """
+
+    if not os.path.exists(filename):
+        return None
+
+    with open(filename) as state_file:
+        state = json.load(state_file)
+
+    if state.get("version") != STATE_VERSION:
+        logger.warning("Ignoring state file %s with version %s", filename,
+                       state.get("version"))
+        return None
+
+    return state
+
+
+def get_week_start(state: dict) -> date:
+    """Returns the Monday of the week a saved schedule is for.
+
+    Returns:
+        date, or None if the state does not record its week
+    """
+
+    if not state.get("week_start"):
+        return None
+
+    return datetime.strptime(state["week_start"], "%Y-%m-%d").date()
+
+
+def diff_members(saved: dict, members: list, days: list) -> (dict, set):
+    """Compares members with their saved state.
+
+    Args:
+        saved:
+            dictionary mapping member key to saved member state
+        members:
+            list of Rider or Driver objects from the current responses
+        days:
+            list of Day.DayName enums the state is compared on
+
+    Returns:
+        (dict, set)
+        dict: maps the key of every member to the member
+        set: keys of the members that are new or whose response changed
+    """
+
+    registry = LocationRegistry.get_instance()
+    by_key = dict(zip(get_member_keys(members), members))
+
+    changed = {
+        key for (key, member) in by_key.items()
+        if saved.get(key) != get_member_state(member, days, registry)
+    }
+
+    return by_key, changed
+
+
+def is_unchanged(saved: dict, changed: set, key: str, member: Member,
+                 day: Day.DayName) -> bool:
+    """Returns True if the member's response for the day is the saved one.
+
+    Args:
+        saved:
+            dictionary mapping member key to saved member state
+        changed:
+            keys of the members that are new or changed, from diff_members
+        key:
+            the member's key
+        member:
+            Rider or Driver object
+        day:
+            Day.DayName enum
+    """
+
+    if key not in changed:
+        return True
+
+    old = saved.get(key)
+
+    return (old is not None and
+            old.get("seats") == getattr(member, "seats", None) and
+            old["days"].get(Day.to_str(day)) == get_day_state(member, day))
+
+
+def get_open_drivers(drivers: list, day: Day.DayName, taken: dict,
+                     riders: list) -> dict:
+    """Returns the open seats of the drivers that can take one of the riders.
+
+    Only drivers with open seats on the day that share a location with one of
+    the riders are returned, so only their location and time buckets are built
+    by the matching engine.
+
+    Args:
+        drivers:
+            list of Driver objects
+        day:
+            Day.DayName enum
+        taken:
+            dictionary mapping Driver to the seats taken by kept riders
+        riders:
+            list of Rider objects to place
+
+    Returns:
+        seat ledger, dictionary mapping Driver to its open seats, in the order
+        of drivers
+    """
+
+    locations = set()
+    for rider in riders:
+        locations.update(rider.get_locations(day))
+
+    seats = dict()
+    for driver in drivers:
+        open_seats = driver.seats_remaining - taken.get(driver, 0)
+        if (open_seats > 0 and driver.in_day(day) and
+                not locations.isdisjoint(driver.get_locations(day))):
+            seats[driver] = open_seats
+
+    return seats
+
+
+def rematch(state: dict,
+            riders: list,
+            drivers: list,
+            seed: int = None) -> Schedule:
+    """Updates a saved schedule with the current responses.
+
+    For every enabled day, a previous car is kept as long as its driver still
+    drives that day with the same locations, time and seats. Its riders stay in it
+    as long as their response for the day is unchanged and the car has room.
+
+    The riders to place on a day are the new and changed riders and the riders of
+    cars that were dropped or lost seats. Riders who were not placed before are
+    added when they share a location with a driver who has a seat that was not
+    open in the previous schedule, the only seats they could get. The riders are
+    ordered as in a full run and matched with the configured engine (mcc.engine,
+    mcc.rider_order and mcc.use_numpy) into the open seats of the drivers they
+    share a location with. The kept assignments are fixed, so the flow engine only
+    optimizes the placement of these riders.
+
+    Args:
+        state:
+            state dictionary from load_state
+        riders:
+            list of Rider objects from the current responses
+        drivers:
+            list of Driver objects from the current responses
+        seed:
+            seed for the order of the riders to place, random when not provided
+
+    Returns:
+        The updated Schedule
+    """
+
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    mcc_config = Configuration.config("mcc")
+    days_enabled = [Day.from_str(day) for day in mcc_config["days_enabled"]]
+    tolerance = mcc_config.get("time_tolerance", 0)
+    match_riders = get_match_function(mcc_config.get("engine", "greedy"),
+                                      mcc_config.get("rider_order", "random"))
+    use_numpy = mcc_config.get("use_numpy", False)
+    if use_numpy and not CompatibilityMatrix.available():
+        logger.warning("use_numpy is set but NumPy is not installed")
+        use_numpy = False
+
+    riders_by_key, changed_riders = diff_members(state["riders"], riders,
+                                                 days_enabled)
+    drivers_by_key, changed_drivers = diff_members(state["drivers"], drivers,
+                                                   days_enabled)
+
+    logger.info("Rematch found %i new or changed riders and %i drivers",
+                len(changed_riders), len(changed_drivers))
+
+    rider_positions = {key: i for (i, key) in enumerate(riders_by_key)}
+
+    schedule = Schedule()
+    kept_count = 0
+    placed_count = 0
+
+    for day in days_enabled:
+        day_name = Day.to_str(day)
+        schedule.add_day(day)
+        previous_cars = state["schedule"].get(day_name, list())
+
+        taken = dict()
+        kept = set()
+        to_place = set(changed_riders)
+
+        # drivers with a seat that was not open in the previous schedule,
+        # a dictionary used as an ordered set
+        freed = {
+            drivers_by_key[key]: None
+            for key in changed_drivers
+            if drivers_by_key[key].in_day(day)
+        }
+
+        for car_state in previous_cars:
+            key = car_state["driver"]
+            driver = drivers_by_key.get(key)
+
+            if driver is None or not is_unchanged(
+                    state["drivers"], changed_drivers, key, driver, day):
+                to_place.update(car_state["riders"])
+                continue
+
+            taken.setdefault(driver, 0)
+
+            for rider_key in car_state["riders"]:
+                rider = riders_by_key.get(rider_key)
+
+                if taken[driver] >= driver.seats_remaining:
+                    to_place.add(rider_key)
+                elif (rider is None or rider_key in kept or
+                      not is_unchanged(state["riders"], changed_riders,
+                                       rider_key, rider, day)):
+                    to_place.add(rider_key)
+                    freed[driver] = None
+                else:
+                    schedule.add_rider(day, driver, rider)
+                    taken[driver] += 1
+                    kept.add(rider_key)
+
+        kept_count += len(kept)
+
+        if freed:
+            locations = set()
+            for driver in freed:
+                locations.update(driver.get_locations(day))
+
+            placed = {key for car in previous_cars for key in car["riders"]}
+            to_place.update([
+                key for (key, rider) in riders_by_key.items()
+                if key not in placed and rider.in_day(day) and
+                not locations.isdisjoint(rider.get_locations(day))
+            ])
+
+        to_place = [
+            riders_by_key[key] for key in sorted(
+                [k for k in to_place if k in riders_by_key and k not in kept],
+                key=rider_positions.__getitem__)
+        ]
+        to_place = [rider for rider in to_place if rider.in_day(day)]
+
+        if not to_place:
+            continue
+
+        seats = get_open_drivers(drivers, day, taken, to_place)
+        open_drivers = list(seats)
+        to_place = order_riders(to_place,
+                                random.Random("{}:{}".format(seed, day_name)))
+
+        matrix = None
+        if use_numpy:
+            matrix = CompatibilityMatrix(to_place, open_drivers, day, seats,
+                                         tolerance)
+
+        for car in match_riders(to_place, open_drivers, day, seats, matrix,
+                                tolerance):
+            for rider in car.riders:
+                schedule.add_rider(day, car.driver, rider)
+                placed_count += 1
+
+    logger.info("Rematch kept %i assignments and placed %i riders", kept_count,
+                placed_count)
+    log_day_summaries(riders, schedule)
+
+    return schedule
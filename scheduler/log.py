@@ -0,0 +1,194 @@
+""" Sets up logging for a scheduler run.
+
+Records are put on a queue by the calling thread and written to a rotating log
+file by a background thread, so logging never waits on file I/O. The level,
+file name and rotation are set in the [logging] table of the configuration.
+
+Worker processes cannot reach that queue. A process pool gets the queue of
+get_worker_queue instead, and its initializer calls configure_worker_logging so
+the workers' records end up in the same log file.
+
+Typical Usage:
+    import scheduler.log as log
+
+    log.configure_logging()
+    .
+    .
+    with ProcessPoolExecutor(initializer=log.configure_worker_logging,
+                             initargs=(log.get_worker_queue(),
+                                       logging.getLogger().level)):
+        .
+    .
+    log.stop_logging()
+"""
+
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+
+from scheduler.classes.Configuration import Configuration
+
+DEFAULT_FORMAT = "%(asctime)s %(name)s - %(levelname)s - %(message)s"
+
+# the listener writing the records of the queue, None when not configured
+_listener = None
+_queue_handler = None
+
+# the queue of worker processes and its listener, None until a pool asks for it
+_worker_records = None
+_worker_listener = None
+
+
+def get_level(level) -> int:
+    """Returns the logging level for a level name or number.
+
+    Args:
+        level:
+            level name such as "INFO", or a logging level number
+
+    Returns:
+        logging level number
+    """
+
+    if isinstance(level, int):
+        return level
+
+    number = logging.getLevelName(str(level).upper())
+
+    if not isinstance(number, int):
+        raise ValueError("Unknown logging level: {}".format(level))
+
+    return number
+
+
+def configure_logging(config: dict = None) -> None:
+    """Sends the records of every logger to a rotating log file.
+
+    Calling this again replaces the previous setup.
+
+    Args:
+        config:
+            dictionary with the settings of the [logging] configuration table,
+            read from the configuration when not provided. Settings:
+                level: level name, default "INFO"
+                filename: log file, default "climbing_carpools.log"
+                max_bytes: size a log file is rotated at, 0 to never rotate on size
+                backup_count: number of rotated log files to keep
+                rotate_on_start: True to start every run with a new log file
+                format: logging format string
+    """
+
+    global _listener, _queue_handler
+
+    if config is None:
+        config = Configuration.config().get("logging", dict())
+
+    stop_logging()
+
+    filename = config.get("filename", "climbing_carpools.log")
+    backup_count = config.get("backup_count", 5)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        filename,
+        maxBytes=config.get("max_bytes", 0),
+        backupCount=backup_count,
+        delay=True)
+    file_handler.setFormatter(
+        logging.Formatter(config.get("format", DEFAULT_FORMAT)))
+
+    # keep the log of the previous run instead of truncating it
+    if (config.get("rotate_on_start", True) and backup_count > 0 and
+            os.path.exists(filename) and os.path.getsize(filename) > 0):
+        file_handler.doRollover()
+
+    records = queue.Queue(-1)
+    _queue_handler = logging.handlers.QueueHandler(records)
+    _listener = logging.handlers.QueueListener(records, file_handler)
+
+    root = logging.getLogger()
+    root.setLevel(get_level(config.get("level", "INFO")))
+    root.addHandler(_queue_handler)
+
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Writes the queued records and closes the log file.
+    """
+
+    global _listener, _queue_handler, _worker_records, _worker_listener
+
+    if _listener is None:
+        return
+
+    logging.getLogger().removeHandler(_queue_handler)
+
+    if _worker_listener is not None:
+        _worker_listener.stop()
+        _worker_records.close()
+        _worker_records.join_thread()
+        _worker_listener = None
+        _worker_records = None
+
+    _listener.stop()
+
+    for handler in _listener.handlers:
+        handler.close()
+
+    _listener = None
+    _queue_handler = None
+
+
+def get_worker_queue():
+    """Returns the queue worker processes send their records to.
+
+    The queue is made on first use, and its records are written by a second
+    listener to the same log file as the ones of this process.
+
+    Returns:
+        multiprocessing.Queue to pass to configure_worker_logging, None when
+        logging is not configured
+    """
+
+    global _worker_records, _worker_listener
+
+    if _listener is None:
+        return None
+
+    if _worker_listener is None:
+        _worker_records = multiprocessing.Queue(-1)
+        _worker_listener = logging.handlers.QueueListener(
+            _worker_records, *_listener.handlers)
+        _worker_listener.start()
+
+    return _worker_records
+
+
+def configure_worker_logging(records, level) -> None:
+    """Sends the records of a worker process to the queue of its parent.
+
+    Handlers inherited from the parent are removed, as their queue is only read
+    in the parent. Does nothing when records is None.
+
+    Args:
+        records:
+            queue returned by get_worker_queue in the parent process
+        level:
+            level name or number of the parent's root logger
+    """
+
+    if records is None:
+        return
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(get_level(level))
+
+
+atexit.register(stop_logging)
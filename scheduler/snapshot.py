@@ -0,0 +1,297 @@
+""" Binary snapshots of the parsed members.
+
+After ingest the MemberTable is saved to a snapshot file together with the
+revision of the source it was parsed from. When the next run finds the source at
+the same revision, the table is loaded from the snapshot instead of reading and
+parsing every response again.
+
+A snapshot file is laid out as:
+
+    header      magic, format version, revision length, payload length and the
+                SHA-256 digest of the payload
+    revision    UTF-8 revision string
+    payload     sections, each an 8 byte length followed by its bytes:
+                    metadata (JSON: days, the table's pools of distinct
+                        location and time masks, array item sizes)
+                    names, emails, phones, car types (UTF-8, NUL separated)
+                    is_driver, is_dues_paying, seats, day_bits (raw arrays)
+                    location and time mask numbers (raw arrays, numbers of
+                        the masks in the pools of the metadata)
+
+The file is read through a memory map and the payload is checked against its
+digest before any of it is used. The locations of a mask are saved by name, so a
+snapshot does not depend on the ids the LocationRegistry hands out.
+
+Typical Usage:
+    import scheduler.snapshot as snapshot
+
+    table = snapshot.load_snapshot(filename, revision)
+    if table is None:
+        table = ...
+        snapshot.save_snapshot(filename, table, revision)
+"""
+
+from array import array
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+
+from scheduler.classes.LocationRegistry import LocationRegistry
+from scheduler.classes.MemberTable import MemberTable
+import scheduler.classes.Day as Day
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MCCSNAP\0"
+SNAPSHOT_VERSION = 3
+
+# magic, version, revision length, payload length, payload digest
+HEADER = struct.Struct("<8sHHQ32s")
+SECTION_LENGTH = struct.Struct("<Q")
+
+STRING_COLUMNS = ("names", "emails", "phones", "car_types")
+ARRAY_COLUMNS = ("is_driver", "is_dues_paying", "seats", "day_bits")
+MASK_COLUMNS = ("location_masks", "time_masks")
+
+
+def get_revision(*parts) -> str:
+    """Returns a revision string combining the revisions of several sources.
+
+    Args:
+        parts:
+            JSON serializable revisions, such as the source files' modification
+            times and the configuration the members were parsed with
+
+    Returns:
+        hex digest identifying the combined revision
+    """
+
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _pack_strings(values: list) -> bytes:
+    """Returns the strings as UTF-8 separated by NUL characters, None as "".
+    """
+
+    values = [value or "" for value in values]
+
+    for value in values:
+        if "\0" in value:
+            raise ValueError(
+                "Cannot save a string holding NUL: {!r}".format(value))
+
+    return "\0".join(values).encode()
+
+
+def _unpack_strings(data, count: int) -> list:
+    """Returns the count strings packed by _pack_strings.
+    """
+
+    if count == 0:
+        return list()
+
+    return bytes(data).decode().split("\0")
+
+
+def save_snapshot(filename: str, table: MemberTable, revision: str) -> None:
+    """Saves a MemberTable to a snapshot file.
+
+    The file is written to a temporary file first and then moved in place, so a
+    snapshot is never left half written.
+
+    Args:
+        filename:
+            path of the snapshot file
+        table:
+            MemberTable to save
+        revision:
+            revision of the source the table was parsed from
+    """
+
+    registry = LocationRegistry.get_instance()
+
+    metadata = {
+        "rows": len(table),
+        "days": [Day.to_str(day) for day in table.days],
+        "locations": [
+            [registry.to_str(l) for l in bits] for bits in table.locations.bits
+        ],
+        "times": table.times.bits,
+        "byteorder": sys.byteorder,
+        "itemsizes": {
+            name: getattr(table, name).itemsize
+            for name in ARRAY_COLUMNS + MASK_COLUMNS
+        },
+    }
+
+    sections = [json.dumps(metadata).encode()]
+    sections.extend(
+        [_pack_strings(getattr(table, name)) for name in STRING_COLUMNS])
+    sections.extend([
+        getattr(table, name).tobytes() for name in ARRAY_COLUMNS + MASK_COLUMNS
+    ])
+
+    payload = b"".join(
+        [SECTION_LENGTH.pack(len(section)) + section for section in sections])
+    revision_bytes = revision.encode()
+
+    temporary = filename + ".tmp"
+    with open(temporary, "wb") as snapshot_file:
+        snapshot_file.write(
+            HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(revision_bytes),
+                        len(payload),
+                        hashlib.sha256(payload).digest()))
+        snapshot_file.write(revision_bytes)
+        snapshot_file.write(payload)
+
+    os.replace(temporary, filename)
+
+    logger.info("Saved %i members to snapshot %s", len(table), filename)
+
+
+def _read_sections(payload) -> list:
+    """Splits a payload into its sections.
+    """
+
+    sections = list()
+    offset = 0
+
+    while offset < len(payload):
+        (length,) = SECTION_LENGTH.unpack_from(payload, offset)
+        offset += SECTION_LENGTH.size
+
+        if offset + length > len(payload):
+            raise ValueError("section runs past the end of the payload")
+
+        sections.append(payload[offset:offset + length])
+        offset += length
+
+    return sections
+
+
+def _load_table(payload) -> MemberTable:
+    """Builds the MemberTable saved in a payload.
+    """
+
+    sections = _read_sections(payload)
+
+    # the sections are views of the memory map, released before it is closed
+    try:
+        return _load_sections(sections)
+    finally:
+        for section in sections:
+            section.release()
+
+
+def _load_sections(sections: list) -> MemberTable:
+    """Builds the MemberTable saved in the sections of a payload.
+    """
+
+    if len(sections) != (1 + len(STRING_COLUMNS) + len(ARRAY_COLUMNS) +
+                         len(MASK_COLUMNS)):
+        raise ValueError("unexpected number of sections")
+
+    metadata = json.loads(bytes(sections[0]).decode())
+    registry = LocationRegistry.get_instance()
+
+    columns = dict()
+    for (name, section) in zip(STRING_COLUMNS, sections[1:]):
+        columns[name] = _unpack_strings(section, metadata["rows"])
+
+    columns["locations"] = [
+        Day.get_location_mask([registry.get_id(l)
+                               for l in locations])
+        for locations in metadata["locations"]
+    ]
+    columns["times"] = [Day.get_time_mask(times) for times in metadata["times"]]
+
+    template = MemberTable(list())
+    typecodes = {
+        name: getattr(template, name).typecode
+        for name in ARRAY_COLUMNS + MASK_COLUMNS
+    }
+
+    for (name, section) in zip(ARRAY_COLUMNS + MASK_COLUMNS,
+                               sections[1 + len(STRING_COLUMNS):]):
+        values = array(typecodes[name])
+        if values.itemsize != metadata["itemsizes"][name]:
+            raise ValueError("{} was saved with another item size".format(name))
+
+        values.frombytes(section)
+        if metadata["byteorder"] != sys.byteorder:
+            values.byteswap()
+
+        columns[name] = values
+
+    return MemberTable.from_columns(
+        [Day.from_str(day) for day in metadata["days"]], columns)
+
+
+def load_snapshot(filename: str, revision: str) -> MemberTable:
+    """Loads the MemberTable saved in a snapshot file.
+
+    Args:
+        filename:
+            path of the snapshot file
+        revision:
+            current revision of the source
+
+    Returns:
+        The saved MemberTable, or None if there is no snapshot, it was made
+        from another revision or it is damaged
+    """
+
+    try:
+        with open(filename, "rb") as snapshot_file:
+            with mmap.mmap(snapshot_file.fileno(), 0,
+                           access=mmap.ACCESS_READ) as data:
+                view = memoryview(data)
+                try:
+                    return _load_view(filename, view, revision)
+                finally:
+                    view.release()
+    except (OSError, ValueError) as error:
+        if not isinstance(error, FileNotFoundError):
+            logger.warning("Ignoring snapshot %s: %s", filename, error)
+        return None
+
+
+def _load_view(filename: str, view: memoryview, revision: str) -> MemberTable:
+    """Checks the snapshot in view and loads its table.
+    """
+
+    if len(view) < HEADER.size:
+        raise ValueError("file is too short")
+
+    (magic, version, revision_length, payload_length,
+     digest) = HEADER.unpack_from(view)
+
+    if magic != MAGIC:
+        raise ValueError("not a snapshot file")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError("snapshot version {} is not supported".format(version))
+
+    start = HEADER.size + revision_length
+    if len(view) != start + payload_length:
+        raise ValueError("file is truncated")
+
+    if bytes(view[HEADER.size:start]).decode() != revision:
+        logger.info("Snapshot %s is from another revision", filename)
+        return None
+
+    payload = view[start:]
+    try:
+        if hashlib.sha256(payload).digest() != digest:
+            raise ValueError("checksum mismatch")
+
+        table = _load_table(payload)
+    finally:
+        payload.release()
+
+    logger.info("Loaded %i members from snapshot %s", len(table), filename)
+    return table
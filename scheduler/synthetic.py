@@ -0,0 +1,174 @@
+""" Generates synthetic rider and driver populations.
+
+The populations are built from a seeded random generator, so the same arguments
+always give the same members. They are used by the benchmark suite and can be used
+to try the matching engines at sizes the real form responses never reach.
+
+Typical Usage:
+    import scheduler.synthetic as synthetic
+
+    riders, drivers = synthetic.generate_population(10000, seed=1)
+"""
+
+import random
+
+from scheduler.classes.Driver import Driver
+from scheduler.classes.LocationRegistry import LocationRegistry
+from scheduler.classes.Rider import Rider
+import scheduler.classes.Day as Day
+
+DEFAULT_DAYS = [Day.DayName.TUESDAY, Day.DayName.THURSDAY, Day.DayName.SUNDAY]
+
+DEFAULT_LOCATIONS = {
+    "NORTH": 0.5,
+    "CENTRAL": 0.5,
+}
+
+# every half hour from 5 PM to 8 PM
+DEFAULT_TIMES = [Day.to_minutes(17, minute) for minute in range(0, 181, 30)]
+
+DEFAULT_SEATS = {1: 0.1, 2: 0.2, 3: 0.3, 4: 0.3, 6: 0.1}
+
+
+def _pick_weighted(rng: random.Random, weights: dict):
+    """Returns one key of weights, chosen with probability proportional to its value.
+    """
+
+    return rng.choices(list(weights.keys()), weights=list(weights.values()))[0]
+
+
+def generate_days(rng: random.Random,
+                  days: list,
+                  locations: dict,
+                  times: list,
+                  day_probability: float = 0.6,
+                  time_spread: int = 3,
+                  location_probability: float = 0.25,
+                  is_driver: bool = False) -> list:
+    """Generates the DayInfo objects of one member.
+
+    Args:
+        rng:
+            random.Random to draw from
+        days:
+            list of Day.DayName enums the member may sign up for
+        locations:
+            dictionary mapping location ids to their relative popularity
+        times:
+            list of departure times, in ascending order
+        day_probability:
+            chance the member signs up for each day
+        time_spread:
+            largest number of consecutive times a member picks for a day
+        location_probability:
+            chance the member picks every location instead of only one
+        is_driver:
+            True for a driver, drivers leave at a single time
+
+    Returns:
+        list of DayInfo objects, at least one
+    """
+
+    day_infos = list()
+
+    for day in days:
+        if rng.random() >= day_probability:
+            continue
+
+        if rng.random() < location_probability:
+            day_locations = list(locations.keys())
+        else:
+            day_locations = [_pick_weighted(rng, locations)]
+
+        spread = 1 if is_driver else rng.randint(1, min(time_spread,
+                                                        len(times)))
+        start = rng.randrange(len(times) - spread + 1)
+
+        day_infos.append(
+            Day.DayInfo(day, times[start:start + spread], day_locations))
+
+    if not day_infos:
+        day_infos.append(
+            Day.DayInfo(rng.choice(days), [rng.choice(times)],
+                        [_pick_weighted(rng, locations)]))
+
+    return day_infos
+
+
+def generate_population(members: int,
+                        seed: int = 0,
+                        days: list = None,
+                        locations: dict = None,
+                        times: list = None,
+                        seats: dict = None,
+                        driver_fraction: float = 0.2,
+                        dues_fraction: float = 0.9,
+                        day_probability: float = 0.6,
+                        time_spread: int = 3) -> (list, list):
+    """Generates a population of riders and drivers.
+
+    Args:
+        members:
+            total number of riders and drivers
+        seed:
+            seed of the random generator
+        days:
+            list of Day.DayName enums members sign up for, defaults to the club days
+        locations:
+            dictionary mapping location names to their relative popularity,
+            defaults to an even split between NORTH and CENTRAL. Names that are
+            not configured are added to the LocationRegistry
+        times:
+            list of departure time codes in ascending order, defaults to every
+            half hour from 5 PM to 8 PM
+        seats:
+            dictionary mapping a seat count to its relative frequency among drivers
+        driver_fraction:
+            fraction of the members that are drivers
+        dues_fraction:
+            fraction of the members that have paid dues
+        day_probability:
+            chance a member signs up for each day
+        time_spread:
+            largest number of consecutive times a member picks for a day
+
+    Returns:
+        (riders list, drivers list)
+    """
+
+    rng = random.Random(seed)
+    days = days or DEFAULT_DAYS
+    registry = LocationRegistry.get_instance()
+    locations = {
+        registry.register(name): weight
+        for (name, weight) in (locations or DEFAULT_LOCATIONS).items()
+    }
+    times = times or DEFAULT_TIMES
+    seats = seats or DEFAULT_SEATS
+
+    riders = list()
+    drivers = list()
+
+    for i in range(members):
+        name = "Member {}".format(i)
+        email = "member{}@example.com".format(i)
+        phone = "555{:07d}".format(i)
+        is_driver = rng.random() < driver_fraction
+        member_days = generate_days(rng,
+                                    days,
+                                    locations,
+                                    times,
+                                    day_probability,
+                                    time_spread,
+                                    is_driver=is_driver)
+        is_dues_paying = rng.random() < dues_fraction
+
+        if is_driver:
+            drivers.append(
+                Driver(name, email, phone, member_days, is_dues_paying, "car",
+                       _pick_weighted(rng, seats)))
+        else:
+            riders.append(Rider(name, email, phone, member_days,
+                                is_dues_paying))
+
+    return riders, drivers
@@ -0,0 +1,106 @@
+from unittest import TestCase
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import BatchTestData as test_data
+
+import scheduler.batch as batch
+
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.FairnessLedger import FairnessLedger
+import scheduler.classes.Day as Day
+
+
+class BatchTest(TestCase):
+    """
+    Tests batch.py
+    """
+
+    get_weeks_test_data = test_data.get_weeks_test_data
+    plan_weeks_test_data = test_data.plan_weeks_test_data
+
+    @params(get_weeks_test_data[0], get_weeks_test_data[1])
+    def test_get_weeks(self, date_range, days_enabled, check):
+        start, end = batch.parse_date_range(date_range)
+        weeks = batch.get_weeks(start, end,
+                                [Day.from_str(day) for day in days_enabled])
+
+        self.assertEqual(
+            [(week_start.isoformat(), [d.isoformat()
+                                       for (_, d) in days])
+             for (week_start, days) in weeks], check)
+
+        for (_, days) in weeks:
+            for (day, day_date) in days:
+                self.assertEqual(day.value, day_date.weekday())
+
+    def test_parse_date_range(self):
+        with self.assertRaises(ValueError):
+            batch.parse_date_range("2026-10-19")
+        with self.assertRaises(ValueError):
+            batch.parse_date_range("2026-10-19:2026-10-18")
+
+    @params(plan_weeks_test_data[0])
+    def test_plan_weeks(self, riders, drivers, date_range):
+        riders = members_to_class(members=riders)
+        drivers = members_to_class(members=drivers, is_driver=True)
+
+        start, end = batch.parse_date_range(date_range)
+        weeks = batch.get_weeks(start, end, [Day.DayName.TUESDAY])
+        ledger = FairnessLedger(":memory:")
+
+        plans = batch.plan_weeks(riders, drivers, weeks, ledger, seed=1)
+
+        self.assertEqual([week_start for (week_start, _) in plans],
+                         [week_start for (week_start, _) in weeks])
+
+        # the driver's seat is free again every week
+        for (_, schedule) in plans:
+            self.assertEqual(
+                sum(len(car.riders) for (_, cars) in schedule for car in cars),
+                1)
+
+        history = [ledger.get(rider.email) for rider in riders]
+        self.assertEqual([h[0] for h in history], [len(weeks)] * len(riders))
+        self.assertEqual(sum(h[1] for h in history), len(weeks))
+
+        schedule, names = batch.merge_weeks(plans)
+        self.assertEqual(len(schedule), len(weeks))
+        self.assertEqual(names[0], "TUESDAY 2026-10-20")
+
+        ledger.close()
+
+    @params(plan_weeks_test_data[0])
+    def test_plan_weeks_workers(self, riders, drivers, date_range):
+        start, end = batch.parse_date_range(date_range)
+        weeks = batch.get_weeks(start, end,
+                                [Day.DayName.TUESDAY, Day.DayName.THURSDAY])
+
+        mcc_config = Configuration.config("mcc")
+        saved = dict(mcc_config)
+
+        try:
+            seated = list()
+            for workers in (1, 2):
+                mcc_config["workers"] = workers
+                plans = batch.plan_weeks(members_to_class(members=riders),
+                                         members_to_class(members=drivers,
+                                                          is_driver=True),
+                                         weeks,
+                                         seed=1)
+
+                # the pool is started once, so the riders' weights of every
+                # week have to reach it for the seat to go round
+                seated.append([[
+                    rider.name
+                    for (_, cars) in schedule
+                    for car in cars
+                    for rider in car.riders
+                ]
+                               for (_, schedule) in plans])
+        finally:
+            mcc_config.clear()
+            mcc_config.update(saved)
+
+        self.assertEqual(seated[0], seated[1])
+        self.assertEqual(len(set(names[0] for names in seated[0])), 2)
@@ -0,0 +1,77 @@
+from unittest import TestCase, skipUnless
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import GenerateRidesTestData, CompatibilityMatrixTestData as test_data
+
+import scheduler.generate_rides as generate_rides
+import scheduler.synthetic as synthetic
+
+from scheduler.classes.CompatibilityMatrix import CompatibilityMatrix
+import scheduler.classes.Day as Day
+
+
+@skipUnless(CompatibilityMatrix.available(), "NumPy is not installed")
+class CompatibilityMatrixTest(TestCase):
+    """
+    Tests CompatibilityMatrix
+    """
+
+    pairwise_test_data = test_data.pairwise_test_data
+    synthetic_test_data = test_data.synthetic_test_data
+    match_riders_test_data = GenerateRidesTestData.match_riders_test_data
+
+    @params(pairwise_test_data[0])
+    def test_pairwise(self, riders, drivers, day):
+        riders = members_to_class(members=riders)
+        drivers = members_to_class(members=drivers, is_driver=True)
+        day = Day.from_str(day)
+
+        matrix = CompatibilityMatrix(riders, drivers, day)
+
+        for (i, rider) in enumerate(riders):
+            for (j, driver) in enumerate(drivers):
+                compatible = (generate_rides.are_location_compatible(
+                    rider, driver, day) and generate_rides.time_compatibility(
+                        rider, driver, day) > 0)
+                self.assertEqual(
+                    matrix.get_score(rider, driver) != matrix.NO_MATCH,
+                    compatible)
+
+    @params(*synthetic_test_data)
+    def test_synthetic(self, members, seed, day, tolerance):
+        riders, drivers = synthetic.generate_population(members, seed=seed)
+        day = Day.from_str(day)
+
+        for engine in generate_rides.ENGINES:
+            cars = list()
+            for use_matrix in (False, True):
+                seats = {d: d.seats_remaining for d in drivers}
+                matrix = None
+                if use_matrix:
+                    matrix = CompatibilityMatrix(riders, drivers, day, seats,
+                                                 tolerance)
+
+                cars.append([(car.driver, car.riders)
+                             for car in generate_rides.get_engine(engine)
+                             (riders, drivers, day, seats, matrix, tolerance)])
+
+            self.assertEqual(cars[0], cars[1])
+
+    @params(match_riders_test_data[0])
+    def test_match_riders(self, riders, drivers, day, check):
+        for (engine, cars_check) in check.items():
+            riders_list = members_to_class(members=riders)
+            drivers_list = members_to_class(members=drivers, is_driver=True)
+            seats = {d: d.seats_remaining for d in drivers_list}
+
+            matrix = CompatibilityMatrix(riders_list, drivers_list,
+                                         Day.from_str(day), seats)
+            cars = generate_rides.get_engine(engine)(riders_list, drivers_list,
+                                                     Day.from_str(day), seats,
+                                                     matrix)
+
+            result = {
+                car.driver.name: [r.name for r in car.riders] for car in cars
+            }
+            self.assertEqual(result, cars_check)
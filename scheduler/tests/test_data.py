@@ -48,6 +48,64 @@ class JsonBackendTestData:
     ]
 
 
+class FakeClientTestData:
+    """
+    Data for the FakeClientTest
+    """
+
+    row_stream_test_data = [
+    # (rows, page rows, API calls reading the sheet). The grid has 1000
+    # rows, the stream ends at the first empty page
+        ([["a", "b"]] * 10, 4, 4),
+        ([["a", "b"]] * 10, 10, 2),
+    ]
+
+    write_calls_test_data = [
+    # (days, members, existing output spreadsheets, API calls publishing the
+    # schedule)
+        (["TUESDAY"], 50, 0, 6),
+        (["TUESDAY", "THURSDAY", "SUNDAY"], 300, 0, 6),
+        (["TUESDAY"], 50, 1, 7),
+        (["TUESDAY", "THURSDAY", "SUNDAY"], 300, 2, 8),
+    ]
+
+
+class FileBackendTestData:
+    """
+    Data for the FileBackendTest
+    """
+
+    # form responses for a single enabled day, TUESDAY
+    responses = [
+        [
+            "Timestamp", "Email", "Name", "Phone", "Rider", "Driver", "Car",
+            "Seats", "Rider locations", "Rider times", "Driver locations",
+            "Driver time"
+        ],
+        [
+            "1", "r1@umich.edu", "r1", "555-0001", "Yes", "No", "", "",
+            "North Campus (Pierpont Commons)", "6:00 PM, 7:00 PM"
+        ],
+        [
+            "2", "d1@umich.edu", "d1", "555-0002", "No", "Yes", "Honda", "3",
+            "", "", "North Campus (Pierpont Commons)", "6:00 PM"
+        ],
+        [
+            "3", "r2@umich.edu", "r2", "555-0003", "Yes", "No", "", "",
+            "Central Campus (The Cube)", "6:00 PM"
+        ],
+    ]
+
+    dues = [["Name", "Uniqname"], ["Rider One", "r1"], ["Driver One", "d1"]]
+
+    # (file extension, expected riders and dues, drivers, {driver: riders})
+    members_from_files_test_data = [
+        (extension, [("r1", True), ("r2", False)], [("d1", True, 3)], {
+            "d1": ["r1"]
+        }) for extension in (".csv", ".jsonl", ".json")
+    ]
+
+
 class GenerateRidesTestData:
     """
     Data for the GenerateRidesTest
@@ -167,29 +225,29 @@ class GenerateRidesTestData:
             {
                 "days": [{
                     "day": "MONDAY",
-                    "departure_times": [1, 2, 3, 4]
+                    "departure_times": [60, 120, 180, 240]
                 }]
             },
             {
                 "days": [{
                     "day": "MONDAY",
-                    "departure_times": [4]
+                    "departure_times": [240]
                 }]
             },
             "MONDAY",
-            4,
+            240,
         ),
         (
             {
                 "days": [{
                     "day": "TUESDAY",
-                    "departure_times": [1, 2, 3, 4]
+                    "departure_times": [60, 120, 180, 240]
                 }]
             },
             {
                 "days": [{
                     "day": "TUESDAY",
-                    "departure_times": [8]
+                    "departure_times": [480]
                 }]
             },
             "TUESDAY",
@@ -199,7 +257,7 @@ class GenerateRidesTestData:
             {
                 "days": [{
                     "day": "MONDAY",
-                    "departure_times": [1.5, 2, 3, 4]
+                    "departure_times": [90, 120, 180, 240]
                 }]
             },
             {
@@ -221,7 +279,7 @@ class GenerateRidesTestData:
                 "days": [{
                     "day": "TUESDAY",
                     "locations": ["NORTH"],
-                    "departure_times": [1, 2, 3],
+                    "departure_times": [60, 120, 180],
                 }],
             },
             [
@@ -261,7 +319,7 @@ class GenerateRidesTestData:
                     "days": [{
                         "day": "MONDAY",
                         "locations": ["NORTH"],
-                        "departure_times": [8],
+                        "departure_times": [480],
                     }],
                 },
                 {
@@ -274,7 +332,7 @@ class GenerateRidesTestData:
                     "days": [{
                         "day": "TUESDAY",
                         "locations": ["NORTH"],
-                        "departure_times": [2],
+                        "departure_times": [120],
                     }],
                 },
             ],
@@ -283,6 +341,1046 @@ class GenerateRidesTestData:
         ),
     ]
 
+    match_riders_test_data = [
+        (
+            [{
+                "name":
+                    "r1",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH", "CENTRAL"],
+                    "departure_times": [360, 420],
+                }],
+            }, {
+                "name":
+                    "r2",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }],
+            [
+                {
+                    "name":
+                        "a",
+                    "seats":
+                        1,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["NORTH"],
+                        "departure_times": [360],
+                    }],
+                },
+                {
+                    "name":
+                        "b",
+                    "seats":
+                        1,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["CENTRAL"],
+                        "departure_times": [360],
+                    }],
+                },
+            ],
+            "TUESDAY",
+            {
+                "greedy": {
+                    "a": ["r1"]
+                },
+                "flow": {
+                    "a": ["r2"],
+                    "b": ["r1"]
+                },
+            },
+        ),
+    ]
+
+    generate_rides_test_data = [
+        (
+            [{
+                "name":
+                    "r{}".format(i),
+                "days": [{
+                    "day": day,
+                    "locations": ["NORTH", "CENTRAL"][:1 + i % 2],
+                    "departure_times": [360, 420, 480][i % 3:],
+                } for day in ["TUESDAY", "THURSDAY", "SUNDAY"][i % 2:]],
+            } for i in range(12)],
+            [{
+                "name":
+                    "d{}".format(i),
+                "seats":
+                    1 + i % 3,
+                "days": [{
+                    "day": day,
+                    "locations": [["NORTH"], ["CENTRAL"]][i % 2],
+                    "departure_times": [360 + 60 * (i % 3)],
+                } for day in ["TUESDAY", "THURSDAY", "SUNDAY"]],
+            } for i in range(3)],
+            ["TUESDAY", "THURSDAY", "SUNDAY"],
+            1234,
+        ),
+    ]
+
+    most_constrained_test_data = [
+        (
+            match_riders_test_data[0][0],
+            match_riders_test_data[0][1],
+            "TUESDAY",
+            {
+                "a": ["r2"],
+                "b": ["r1"]
+            },
+        ),
+    ]
+
+    count_schedule_test_data = [
+        (
+            match_riders_test_data[0][0],
+            match_riders_test_data[0][1],
+            {
+                "TUESDAY": {
+                    "a": ["r1"]
+                },
+                "THURSDAY": {}
+            },
+            {
+                "riders": 2,
+                "drivers": 2,
+                "seats_offered": 2,
+                "seats_filled": 1,
+                "unmatched_riders": 1,
+                "TUESDAY/riders": 2,
+                "TUESDAY/drivers": 2,
+                "TUESDAY/seats_offered": 2,
+                "TUESDAY/seats_filled": 1,
+                "TUESDAY/unmatched_riders": 1,
+                "THURSDAY/riders": 0,
+                "THURSDAY/drivers": 0,
+                "THURSDAY/seats_offered": 0,
+                "THURSDAY/seats_filled": 0,
+                "THURSDAY/unmatched_riders": 0,
+            },
+        ),
+    ]
+
+
+class DayTestData:
+    """
+    Data for the DayTest
+    """
+
+    # (form time, time code)
+    time_code_test_data = [
+        ("12:00 AM", 0),
+        ("09:15 AM", 555),
+        ("12:30 PM", 750),
+        ("06:00 PM", 1080),
+        ("11:59 PM", 1439),
+    ]
+
+    # (rider times, driver times, earliest common time)
+    earliest_time_test_data = [
+        ([1080, 1140, 1020], [1140], 1140),
+        ([1080, 1140], [1020], -1),
+        ([0, 1439], [0, 1439], 0),
+    ]
+
+    # (run date, Monday of the week it schedules)
+    week_start_test_data = [
+        ("2024-01-08", "2024-01-08"),
+        ("2024-01-09", "2024-01-15"),
+        ("2024-01-14", "2024-01-15"),
+    ]
+
+
+class DriverIndexTestData:
+    """
+    Data for the DriverIndexTest
+    """
+
+    find_best_match_test_data = GenerateRidesTestData.find_best_match_test_data + [
+        (
+            {
+                "name":
+                    "r",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH", "CENTRAL"],
+                    "departure_times": [180, 120],
+                }],
+            },
+            [
+                {
+                    "name":
+                        "a",
+                    "seats":
+                        2,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["NORTH"],
+                        "departure_times": [180],
+                    }],
+                },
+                {
+                    "name":
+                        "b",
+                    "seats":
+                        1,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["CENTRAL"],
+                        "departure_times": [120],
+                    }],
+                },
+                {
+                    "name":
+                        "c",
+                    "seats":
+                        1,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["NORTH"],
+                        "departure_times": [120],
+                    }],
+                },
+            ],
+            "TUESDAY",
+            "b",
+        ),
+    ]
+
+    tolerance_rider = {
+        "name":
+            "r",
+        "days": [{
+            "day": "MONDAY",
+            "locations": ["NORTH"],
+            "departure_times": [360],
+        }],
+    }
+
+    tolerance_drivers = [
+        {
+            "name":
+                "a",
+            "seats":
+                1,
+            "days": [{
+                "day": "MONDAY",
+                "locations": ["NORTH"],
+                "departure_times": [375],
+            }],
+        },
+        {
+            "name":
+                "b",
+            "seats":
+                1,
+            "days": [{
+                "day": "MONDAY",
+                "locations": ["NORTH"],
+                "departure_times": [350],
+            }],
+        },
+        {
+            "name":
+                "c",
+            "seats":
+                1,
+            "days": [{
+                "day": "MONDAY",
+                "locations": ["NORTH"],
+                "departure_times": [370],
+            }],
+        },
+    ]
+
+    # (rider, drivers, day, tolerance, drivers in the order they are picked)
+    tolerance_test_data = [
+        (tolerance_rider, tolerance_drivers, "MONDAY", 0, [None]),
+        (tolerance_rider, tolerance_drivers, "MONDAY", 5, [None]),
+        (tolerance_rider, tolerance_drivers, "MONDAY", 10, ["b", "c", None]),
+        (tolerance_rider, tolerance_drivers, "MONDAY", 15,
+         ["b", "c", "a", None]),
+    ]
+
+    take_seat_test_data = [
+        (
+            {
+                "name":
+                    "r",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [120, 180],
+                }],
+            },
+            [
+                {
+                    "name":
+                        "a",
+                    "seats":
+                        1,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["NORTH"],
+                        "departure_times": [120],
+                    }],
+                },
+                {
+                    "name":
+                        "b",
+                    "seats":
+                        1,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["NORTH"],
+                        "departure_times": [180],
+                    }],
+                },
+            ],
+            "TUESDAY",
+            ["a", "b", None],
+        ),
+    ]
+
+
+class FlowNetworkTestData:
+    """
+    Data for the FlowNetworkTest
+    """
+
+    # (node count, [(u, v, capacity, cost)], flow, cost, flow per edge)
+    min_cost_max_flow_test_data = [
+        (
+            4,
+            [(0, 1, 2, 0), (0, 2, 1, 0), (1, 3, 1, 1), (1, 2, 1, 0),
+             (2, 3, 2, 3)],
+            3,
+            7,
+            [2, 1, 1, 1, 2],
+        ),
+        (
+            6,
+            [(0, 1, 1, 0), (0, 2, 1, 0), (1, 3, 1, 0), (1, 4, 1, 1),
+             (2, 3, 1, 0), (3, 5, 1, 0), (4, 5, 1, 0)],
+            2,
+            1,
+            [1, 1, 0, 1, 1, 1, 1],
+        ),
+    ]
+
+
+class CompatibilityMatrixTestData:
+    """
+    Data for the CompatibilityMatrixTest
+    """
+
+    # (members, seed, day, tolerance) of synthetic populations matched with
+    # and without the matrix
+    synthetic_test_data = [
+        (500, 3, "MONDAY", 0),
+        (500, 4, "TUESDAY", 30),
+    ]
+
+    pairwise_test_data = [
+        (
+            [
+                {
+                    "name":
+                        "r1",
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["NORTH"],
+                        "departure_times": [360, 420],
+                    }],
+                },
+                {
+                    "name":
+                        "r2",
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["NORTH", "CENTRAL"],
+                        "departure_times": [480],
+                    }],
+                },
+                {
+                    "name":
+                        "r3",
+                    "days": [{
+                        "day": "MONDAY",
+                        "locations": ["CENTRAL"],
+                        "departure_times": [420],
+                    }],
+                },
+            ],
+            [
+                {
+                    "name":
+                        "a",
+                    "seats":
+                        2,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["NORTH"],
+                        "departure_times": [420],
+                    }],
+                },
+                {
+                    "name":
+                        "b",
+                    "seats":
+                        1,
+                    "days": [{
+                        "day": "TUESDAY",
+                        "locations": ["CENTRAL"],
+                        "departure_times": [480],
+                    }],
+                },
+                {
+                    "name":
+                        "c",
+                    "seats":
+                        1,
+                    "days": [{
+                        "day": "MONDAY",
+                        "locations": ["CENTRAL"],
+                        "departure_times": [420],
+                    }],
+                },
+            ],
+            "TUESDAY",
+        ),
+    ]
+
+
+class MemberTableTestData:
+    """
+    Data for the MemberTableTest
+    """
+
+    views_test_data = [
+        (
+            CompatibilityMatrixTestData.pairwise_test_data[0][0],
+            CompatibilityMatrixTestData.pairwise_test_data[0][1],
+            ["MONDAY", "TUESDAY", "SUNDAY"],
+        ),
+    ]
+
+    # (number of members, distinct times, distinct locations), more than a
+    # 64 bit mask holds
+    many_values_test_data = [
+        (40, 150, 90),
+    ]
+
+
+class ScheduleTestData:
+    """
+    Data for the ScheduleTest
+    """
+
+    schedule_test_data = [
+        (
+            [{
+                "name": "r1",
+                "email": "r1@umich.edu",
+                "days": [],
+            }, {
+                "name": "r2",
+                "email": "r2@umich.edu",
+                "days": [],
+            }],
+            [{
+                "name":
+                    "a",
+                "email":
+                    "a@umich.edu",
+                "seats":
+                    2,
+                "days": [{
+                    "day": "TUESDAY",
+                    "departure_times": [480],
+                }, {
+                    "day": "THURSDAY",
+                    "departure_times": [360],
+                }],
+            }, {
+                "name": "b",
+                "email": "b@umich.edu",
+                "seats": 2,
+                "days": [{
+                    "day": "TUESDAY",
+                    "departure_times": [360],
+                }],
+            }, {
+                "name": "c",
+                "email": "c@umich.edu",
+                "seats": 2,
+                "days": [{
+                    "day": "THURSDAY",
+                    "departure_times": [420],
+                }],
+            }],
+            [
+                ("TUESDAY", "a", "r1"),
+                ("TUESDAY", "b", "r2"),
+                ("TUESDAY", "a", "r2"),
+                ("THURSDAY", "c", "r1"),
+                ("THURSDAY", "a", "r2"),
+            ],
+            [("TUESDAY", ["b", "a"]), ("THURSDAY", ["a", "c"])],
+            {
+                "r1": {
+                    "TUESDAY": "a",
+                    "THURSDAY": "c"
+                },
+                "a": {
+                    "TUESDAY": "a",
+                    "THURSDAY": "a"
+                },
+            },
+        ),
+    ]
+
+
+class FairnessLedgerTestData:
+    """
+    Data for the FairnessLedgerTest
+    """
+
+    record_test_data = [
+        (
+            [{
+                "name": "r1",
+                "email": "r1@umich.edu",
+                "days": [{
+                    "day": "TUESDAY"
+                }, {
+                    "day": "THURSDAY"
+                }],
+            }, {
+                "name": "r2",
+                "email": "R2@umich.edu ",
+                "days": [{
+                    "day": "TUESDAY"
+                }],
+            }, {
+                "name": "r3",
+                "email": "r3@umich.edu",
+                "days": [{
+                    "day": "SUNDAY"
+                }],
+            }],
+            {
+                "name": "d",
+                "email": "d@umich.edu",
+                "seats": 4,
+                "days": []
+            },
+            [
+                [("TUESDAY", ["r2"]), ("THURSDAY", ["r1"])],
+                [("TUESDAY", []), ("THURSDAY", ["r1"])],
+                [("TUESDAY", ["r1", "r2"]), ("THURSDAY", [])],
+            ],
+            {
+    # (requested, matched, unmatched, unmatched streak)
+                "r1": (6, 3, 3, 3),
+                "r2": (3, 2, 1, 0),
+                "r3": (0, 0, 0, 0),
+            },
+        ),
+    ]
+
+
+class IncrementalTestData:
+    """
+    Data for the IncrementalTest
+    """
+
+    rematch_test_data = [
+        (
+    # previous riders
+            [{
+                "name":
+                    "r1",
+                "email":
+                    "r1@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }, {
+                "name":
+                    "r2",
+                "email":
+                    "r2@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }, {
+                "name":
+                    "r3",
+                "email":
+                    "r3@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["CENTRAL"],
+                    "departure_times": [360],
+                }],
+            }],
+    # current riders, r2 withdrew, r3 moved to NORTH and r4 is new
+            [{
+                "name":
+                    "r1",
+                "email":
+                    "r1@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }, {
+                "name":
+                    "r3",
+                "email":
+                    "r3@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }, {
+                "name":
+                    "r4",
+                "email":
+                    "r4@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["CENTRAL"],
+                    "departure_times": [360],
+                }],
+            }],
+            [{
+                "name":
+                    "a",
+                "email":
+                    "a@umich.edu",
+                "seats":
+                    2,
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }, {
+                "name":
+                    "b",
+                "email":
+                    "b@umich.edu",
+                "seats":
+                    1,
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["CENTRAL"],
+                    "departure_times": [360],
+                }],
+            }],
+    # previous schedule
+            {
+                "a": ["r1", "r2"],
+                "b": ["r3"]
+            },
+    # expected schedule
+            {
+                "a": ["r1", "r3"],
+                "b": ["r4"]
+            },
+        ),
+        (
+    # previous riders, two responses with the same email
+            [{
+                "name":
+                    "r1",
+                "email":
+                    "r1@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }, {
+                "name":
+                    "r1 again",
+                "email":
+                    "r1@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }],
+    # current riders, unchanged
+            [{
+                "name":
+                    "r1",
+                "email":
+                    "r1@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }, {
+                "name":
+                    "r1 again",
+                "email":
+                    "r1@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }],
+            [{
+                "name":
+                    "a",
+                "email":
+                    "a@umich.edu",
+                "seats":
+                    2,
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [360],
+                }],
+            }],
+    # previous schedule
+            {
+                "a": ["r1", "r1 again"]
+            },
+    # expected schedule
+            {
+                "a": ["r1", "r1 again"]
+            },
+        ),
+    ]
+
+
+class BatchTestData:
+    """
+    Data for the BatchTest
+    """
+
+    # (date range, days enabled, [(week start, [dates])])
+    get_weeks_test_data = [
+        (
+            "2026-10-21:2026-11-03",
+            ["TUESDAY", "THURSDAY", "SUNDAY"],
+            [
+                ("2026-10-19", ["2026-10-22", "2026-10-25"]),
+                ("2026-10-26", ["2026-10-27", "2026-10-29", "2026-11-01"]),
+                ("2026-11-02", ["2026-11-03"]),
+            ],
+        ),
+        ("2026-10-20:2026-10-20", ["MONDAY"], []),
+    ]
+
+    # two riders with standing responses share the single seat of a driver
+    plan_weeks_test_data = [
+        (
+            [{
+                "name":
+                    "r1",
+                "email":
+                    "r1@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [1080],
+                }],
+            }, {
+                "name":
+                    "r2",
+                "email":
+                    "r2@umich.edu",
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [1080],
+                }],
+            }],
+            [{
+                "name":
+                    "d",
+                "email":
+                    "d@umich.edu",
+                "seats":
+                    1,
+                "days": [{
+                    "day": "TUESDAY",
+                    "locations": ["NORTH"],
+                    "departure_times": [1080],
+                }],
+            }],
+            "2026-10-19:2026-11-15",
+        ),
+    ]
+
+
+class SyntheticTestData:
+    """
+    Data for the SyntheticTest
+    """
+
+    # (members, seed, seats)
+    generate_population_test_data = [
+        (500, 3, {
+            2: 1,
+            5: 1
+        }),
+    ]
+
+    # (report results, baseline results, threshold, expected regressions)
+    find_regressions_test_data = [
+        (
+            [
+                {
+                    "benchmark": "engine:greedy",
+                    "members": 100,
+                    "seconds": 1.1
+                },
+                {
+                    "benchmark": "engine:flow",
+                    "members": 100,
+                    "seconds": 2.0
+                },
+                {
+                    "benchmark": "engine:flow",
+                    "members": 1000,
+                    "seconds": 9.0
+                },
+            ],
+            [
+                {
+                    "benchmark": "engine:greedy",
+                    "members": 100,
+                    "seconds": 1.0
+                },
+                {
+                    "benchmark": "engine:flow",
+                    "members": 100,
+                    "seconds": 1.0
+                },
+            ],
+            0.2,
+            [("engine:flow", 100, "seconds", 1.0, 2.0)],
+        ),
+        (
+            [
+                {
+                    "benchmark": "engine:greedy",
+                    "members": 100,
+                    "seconds": 1.0,
+                    "peak_memory_bytes": 1300
+                },
+                {
+                    "benchmark": "engine:flow",
+                    "members": 100,
+                    "seconds": 1.0,
+                    "peak_memory_bytes": 1100
+                },
+                {
+                    "benchmark": "engine:flow",
+                    "members": 1000,
+                    "seconds": 1.0,
+                    "peak_memory_bytes": 5000
+                },
+            ],
+            [
+                {
+                    "benchmark": "engine:greedy",
+                    "members": 100,
+                    "seconds": 1.0,
+                    "peak_memory_bytes": 1000
+                },
+                {
+                    "benchmark": "engine:flow",
+                    "members": 100,
+                    "seconds": 1.0,
+                    "peak_memory_bytes": 1000
+                },
+                {
+                    "benchmark": "engine:flow",
+                    "members": 1000,
+                    "seconds": 1.0,
+                    "peak_memory_bytes": None
+                },
+            ],
+            0.2,
+            [("engine:greedy", 100, "peak_memory_bytes", 1000, 1300)],
+        ),
+    ]
+
+
+class LocationRegistryTestData:
+    """
+    Data for the LocationRegistryTest
+    """
+
+    # (locations table, form label, expected location name)
+    parse_test_data = [
+        (
+            {
+                "NORTH": ["North Campus (Pierpont Commons)"],
+                "CENTRAL": ["Central Campus (The Cube)"],
+                "ATHLETIC": ["South Campus (Crisler)", "Crisler Center"],
+            },
+            " Crisler Center ",
+            "ATHLETIC",
+        ),
+        (
+            {
+                "NORTH": ["North Campus (Pierpont Commons)"],
+                "CENTRAL": ["Central Campus (The Cube)"],
+            },
+            "CENTRAL",
+            "CENTRAL",
+        ),
+    ]
+
+
+class LogTestData:
+    """
+    Data for the LogTest
+    """
+
+    # (level, expected messages in the log)
+    configure_logging_test_data = [
+        ("INFO", ["info message", "warning message"]),
+        ("DEBUG", ["debug message", "info message", "warning message"]),
+        ("WARNING", ["warning message"]),
+    ]
+
+
+class RowStreamTestData:
+    """
+    Data for the RowStreamTest
+    """
+
+    # (sheet rows, row count of the sheet, page rows, width, expected API ranges)
+    stream_test_data = [
+        (
+            [["h1", "h2", "h3"], ["a", "b"], ["c"], [], ["d", "e", "f"]],
+            1000,
+            2,
+            3,
+            ["1:2", "3:4", "5:6", "7:8"],
+        ),
+        (
+            [["h1"], ["a"], ["b"], ["c"]],
+            4,
+            2,
+            2,
+            ["1:2", "3:4"],
+        ),
+        ([], 100, 10, 1, ["1:10"]),
+    ]
+
+
+class RunContextTestData:
+    """
+    Data for the RunContextTest
+    """
+
+    # (club name, days enabled, locations) of runs made at the same time
+    concurrent_runs_test_data = [
+        (
+            ("north", ["TUESDAY"], {
+                "NORTH": ["North Campus"]
+            }),
+            ("south", ["THURSDAY", "SUNDAY"], {
+                "SOUTH": ["South Campus"],
+                "EAST": ["East Campus"]
+            }),
+        ),
+    ]
+
+
+class RunMetricsTestData:
+    """
+    Data for the RunMetricsTest
+    """
+
+    # (phases to run as (outer, [inner phases]), expected (phase, calls))
+    phase_test_data = [
+        (
+            [("ingest", ["get_all_values", "parse_rows"]),
+             ("match", ["TUESDAY"]), ("match", ["THURSDAY"])],
+            [
+                ("ingest", 1),
+                ("ingest/get_all_values", 1),
+                ("ingest/parse_rows", 1),
+                ("match", 2),
+                ("match/TUESDAY", 1),
+                ("match/THURSDAY", 1),
+            ],
+        ),
+    ]
+
+
+class RunStoreTestData:
+    """
+    Data for the RunStoreTest
+    """
+
+    record_run_test_data = [
+        (
+            FairnessLedgerTestData.record_test_data[0][0],
+            FairnessLedgerTestData.record_test_data[0][1],
+            FairnessLedgerTestData.record_test_data[0][2],
+            ["2024-01-01", "2024-01-08", "2024-01-15"],
+            None,
+    # (email, name, rides)
+            [("r1@umich.edu", "r1", 3), ("r2@umich.edu", "r2", 2)],
+    # (email, name, drives, riders carried)
+            [("d@umich.edu", "d", 6, 5)],
+        ),
+        (
+            FairnessLedgerTestData.record_test_data[0][0],
+            FairnessLedgerTestData.record_test_data[0][1],
+            FairnessLedgerTestData.record_test_data[0][2],
+            ["2024-01-01", "2024-01-08", "2024-01-15"],
+            "2024-01-10",
+            [("r1@umich.edu", "r1", 2), ("r2@umich.edu", "r2", 1)],
+            [("d@umich.edu", "d", 3, 3)],
+        ),
+    ]
+
+
+class SnapshotTestData:
+    """
+    Data for the SnapshotTest
+    """
+
+    round_trip_test_data = [
+        (
+            CompatibilityMatrixTestData.pairwise_test_data[0][0],
+            CompatibilityMatrixTestData.pairwise_test_data[0][1],
+            ["MONDAY", "TUESDAY", "SUNDAY"],
+        ),
+        (
+            list(),
+            list(),
+            ["TUESDAY"],
+        ),
+    ]
+
 
 class UtilTestData:
     """
@@ -0,0 +1,38 @@
+from datetime import datetime
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import DayTestData as test_data
+
+from scheduler.gform_backend import parse_times
+import scheduler.classes.Day as Day
+
+
+class DayTest(TestCase):
+    """
+    Tests the time codes of Day.py
+    """
+
+    time_code_test_data = test_data.time_code_test_data
+    earliest_time_test_data = test_data.earliest_time_test_data
+    week_start_test_data = test_data.week_start_test_data
+
+    @params(*time_code_test_data)
+    def test_time_code(self, time, code):
+        self.assertEqual(parse_times(time), code)
+        self.assertEqual(Day.time_to_str(code), time)
+
+    @params(*earliest_time_test_data)
+    def test_earliest_time(self, rider_times, driver_times, check):
+        rider = Day.DayInfo(Day.DayName.TUESDAY, rider_times, [0])
+        driver = Day.DayInfo(Day.DayName.TUESDAY, driver_times, [0])
+
+        self.assertEqual(Day.earliest_time(rider.time_mask & driver.time_mask),
+                         check)
+
+    @params(*week_start_test_data)
+    def test_get_week_start(self, day, check):
+        day = datetime.strptime(day, "%Y-%m-%d").date()
+        check = datetime.strptime(check, "%Y-%m-%d").date()
+
+        self.assertEqual(Day.get_week_start(day), check)
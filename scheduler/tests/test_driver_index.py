@@ -0,0 +1,72 @@
+from unittest import TestCase
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import DriverIndexTestData as test_data
+
+from scheduler.classes.DriverIndex import DriverIndex
+import scheduler.classes.Day as Day
+import scheduler.generate_rides as generate_rides
+
+
+class DriverIndexTest(TestCase):
+    """
+    Tests DriverIndex
+    """
+
+    find_best_match_test_data = test_data.find_best_match_test_data
+    take_seat_test_data = test_data.take_seat_test_data
+    tolerance_test_data = test_data.tolerance_test_data
+
+    @params(find_best_match_test_data[0], find_best_match_test_data[1])
+    def test_find_best_match(self, rider, drivers, day, check):
+        index = DriverIndex(members_to_class(members=drivers, is_driver=True),
+                            Day.from_str(day))
+        result = index.find_best_match(members_to_class(member=rider))
+        self.assertEqual(result.name, check)
+
+    @params(take_seat_test_data[0])
+    def test_take_seat(self, rider, drivers, day, check):
+        index = DriverIndex(members_to_class(members=drivers, is_driver=True),
+                            Day.from_str(day))
+        rider = members_to_class(member=rider)
+
+        for name in check:
+            result = index.find_best_match(rider)
+            self.assertEqual(result.name if result else None, name)
+            if result:
+                index.take_seat(result)
+
+    @params(take_seat_test_data[0])
+    def test_copy(self, rider, drivers, day, check):
+        index = DriverIndex(members_to_class(members=drivers, is_driver=True),
+                            Day.from_str(day))
+        rider = members_to_class(member=rider)
+
+        # every copy starts with the seats the index was built with
+        for _ in range(2):
+            copy = index.copy()
+            for name in check:
+                result = copy.find_best_match(rider)
+                self.assertEqual(result.name if result else None, name)
+                if result:
+                    copy.take_seat(result)
+
+        self.assertEqual(index.find_best_match(rider).name, check[0])
+
+    @params(*tolerance_test_data)
+    def test_tolerance(self, rider, drivers, day, tolerance, check):
+        drivers = members_to_class(members=drivers, is_driver=True)
+        rider = members_to_class(member=rider)
+        index = DriverIndex(drivers, Day.from_str(day), tolerance=tolerance)
+
+        for name in check:
+            result = index.find_best_match(rider)
+            self.assertEqual(result.name if result else None, name)
+            if result:
+                index.take_seat(result)
+
+            # the slow path takes a seat of the driver it picks
+            driver, drivers = generate_rides.find_best_match(
+                rider, drivers, Day.from_str(day), tolerance)
+            self.assertEqual(driver.name if driver else None, name)
@@ -0,0 +1,104 @@
+import random
+from unittest import TestCase
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import FairnessLedgerTestData as test_data
+
+import scheduler.generate_rides as generate_rides
+
+from scheduler.classes.Car import Car
+from scheduler.classes.FairnessLedger import FairnessLedger
+import scheduler.classes.Day as Day
+
+
+class FairnessLedgerTest(TestCase):
+    """
+    Tests FairnessLedger
+    """
+
+    record_test_data = test_data.record_test_data
+
+    @params(record_test_data[0])
+    def test_record(self, riders, driver, runs, check):
+        riders = {r.name: r for r in members_to_class(members=riders)}
+        driver = members_to_class(member=driver, is_driver=True)
+
+        ledger = FairnessLedger(":memory:")
+
+        for run in runs:
+            schedule = list()
+            for (day, names) in run:
+                car = Car(driver)
+                car.riders = [riders[name] for name in names]
+                schedule.append((Day.from_str(day), [car]))
+
+            ledger.record(list(riders.values()), schedule)
+
+        for (name, history) in check.items():
+            self.assertEqual(tuple(ledger.get(riders[name].email)),
+                             tuple(history))
+            self.assertEqual(ledger.weight(riders[name].email),
+                             1.0 + history[3])
+
+        ledger.apply_weights(list(riders.values()))
+        for (name, history) in check.items():
+            self.assertEqual(riders[name].selection_weight, 1.0 + history[3])
+
+        ledger.close()
+
+    @params(record_test_data[0])
+    def test_record_previous(self, riders, driver, runs, check):
+        riders = {r.name: r for r in members_to_class(members=riders)}
+        driver = members_to_class(member=driver, is_driver=True)
+
+        schedules = list()
+        for run in runs:
+            schedule = list()
+            for (day, names) in run:
+                car = Car(driver)
+                car.riders = [riders[name] for name in names]
+                schedule.append((Day.from_str(day), [car]))
+            schedules.append(schedule)
+
+        expected = FairnessLedger(":memory:")
+        for schedule in schedules:
+            expected.record(list(riders.values()), schedule)
+
+        # the last run is first recorded with the schedule of the run before
+        # it, then replaced with its own
+        ledger = FairnessLedger(":memory:")
+        for schedule in schedules[:-1]:
+            ledger.record(list(riders.values()), schedule)
+        outcome = ledger.record(list(riders.values()), schedules[-2])
+        ledger.apply_weights(list(riders.values()), outcome)
+        weights = {r.name: r.selection_weight for r in riders.values()}
+        ledger.record(list(riders.values()), schedules[-1], outcome)
+
+        for rider in riders.values():
+            self.assertEqual(ledger.get(rider.email), expected.get(rider.email))
+
+        # the weights used for a rematch are the ones from before the run
+        expected_weights = FairnessLedger(":memory:")
+        for schedule in schedules[:-1]:
+            expected_weights.record(list(riders.values()), schedule)
+        for rider in riders.values():
+            self.assertEqual(weights[rider.name],
+                             expected_weights.weight(rider.email))
+
+        ledger.close()
+        expected.close()
+        expected_weights.close()
+
+    def test_order_riders(self):
+        riders = members_to_class(members=[{
+            "name": str(i),
+            "days": []
+        } for i in range(10)])
+        riders[7].selection_weight = 1e9
+
+        order = generate_rides.order_riders(riders, random.Random(1))
+
+        self.assertEqual(order[0], riders[7])
+        self.assertEqual(sorted(r.name for r in order),
+                         sorted(r.name for r in riders))
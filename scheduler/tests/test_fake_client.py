@@ -0,0 +1,152 @@
+import copy
+from unittest import TestCase
+from nose2.tools import params
+
+from gspread.exceptions import APIError, SpreadsheetNotFound
+
+from test_data import FakeClientTestData as test_data
+from test_data import FileBackendTestData
+
+import scheduler.generate_rides as generate_rides
+import scheduler.gform_backend as gform_backend
+import scheduler.synthetic as synthetic
+
+from scheduler.classes.AuthorizedClient import AuthorizedClient
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.FakeClient import FakeClient
+from scheduler.classes.RowStream import RowStream
+from scheduler.classes.RunContext import RunContext
+
+
+class FakeClientTest(TestCase):
+    """
+    Tests FakeClient
+    """
+
+    row_stream_test_data = test_data.row_stream_test_data
+    write_calls_test_data = test_data.write_calls_test_data
+
+    def get_context(self, client):
+        config = copy.deepcopy(Configuration.config())
+        config["mcc"]["days_enabled"] = ["TUESDAY"]
+
+        files = config["gform_backend"]["files"]
+        client.add_spreadsheet(files["responses_sheet"],
+                               FileBackendTestData.responses)
+        client.add_spreadsheet(files["dues_sheet"], FileBackendTestData.dues)
+
+        return RunContext(config, client=AuthorizedClient(client))
+
+    def test_round_trip(self):
+        client = FakeClient()
+        context = self.get_context(client)
+        (_, riders_check, drivers_check,
+         cars_check) = FileBackendTestData.members_from_files_test_data[0]
+
+        riders, drivers = gform_backend.members_from_sheet(context)
+
+        self.assertEqual([(r.name, r.is_dues_paying) for r in riders],
+                         riders_check)
+        self.assertEqual([(d.name, d.is_dues_paying, d.seats) for d in drivers],
+                         drivers_check)
+
+        schedule = generate_rides.generate_rides(riders,
+                                                 drivers,
+                                                 seed=1,
+                                                 context=context)
+        gform_backend.write_to_sheet(schedule, context=context)
+
+        with context.activate():
+            name = Configuration.config("gform_backend.files")["output_sheet"]
+        output = client.open(name)
+        worksheets = output.worksheets()
+
+        self.assertEqual([ws.title for ws in worksheets], ["TUESDAY"])
+
+        values = worksheets[0].get_all_values()
+        cars = {
+            row[1]: [r[1] for r in values[i + 1:] if r and r[0] == "Rider"]
+            for (i, row) in enumerate(values)
+            if row and row[0] == "Driver"
+        }
+        self.assertEqual(cars, cars_check)
+        self.assertGreater(client.calls["spreadsheets.values.batchUpdate"], 0)
+
+        # writing again replaces the output spreadsheet
+        gform_backend.write_to_sheet(schedule, context=context)
+        self.assertEqual(len(client.openall(name)), 1)
+
+    @params(*write_calls_test_data)
+    def test_write_calls(self, days, members, existing, calls_check):
+        client = FakeClient()
+        context = self.get_context(client)
+        context.config["mcc"]["days_enabled"] = days
+
+        with context.activate():
+            name = Configuration.config("gform_backend.files")["output_sheet"]
+        for _ in range(existing):
+            client.add_spreadsheet(name)
+
+        riders, drivers = synthetic.generate_population(members, seed=1)
+        schedule = generate_rides.generate_rides(riders,
+                                                 drivers,
+                                                 seed=1,
+                                                 context=context)
+
+        calls = client.total_calls
+        gform_backend.write_to_sheet(schedule, context=context)
+        self.assertEqual(client.total_calls - calls, calls_check)
+
+        # writing the schedule again to the same spreadsheet replaces its
+        # worksheets, even those with the same names
+        self.assertEqual(len(client.openall(name)), 1)
+        output = client.open(name)
+        gform_backend.write_schedule(schedule, output, context=context)
+
+        self.assertEqual([ws.title for ws in output.worksheets()], days)
+        self.assertTrue(all([ws.get_all_values() for ws in output.worksheets()
+                            ]))
+
+    def test_revision(self):
+        client = FakeClient()
+        context = self.get_context(client)
+
+        before = gform_backend.get_sheet_revision(context)
+        self.assertEqual(before, gform_backend.get_sheet_revision(context))
+
+        with context.activate():
+            name = Configuration.config("gform_backend.files")["dues_sheet"]
+        client.open(name).sheet1.update("A5", [["new"]])
+
+        self.assertNotEqual(before, gform_backend.get_sheet_revision(context))
+
+    @params(*row_stream_test_data)
+    def test_row_stream(self, rows, page_rows, calls_check):
+        client = FakeClient()
+        worksheet = client.add_spreadsheet("rows", rows).sheet1
+
+        stream = RowStream(worksheet, 3, page_rows=page_rows)
+
+        self.assertEqual(list(stream), [row + [""] for row in rows])
+        self.assertEqual(client.calls["spreadsheets.values.get"], calls_check)
+
+    def test_quota_errors(self):
+        client = FakeClient(quota_error_rate=1.0)
+        client.add_spreadsheet("sheet")
+
+        with self.assertRaises(APIError):
+            client.open("sheet")
+
+        client = FakeClient(quota_limit=2)
+        client.add_spreadsheet("sheet")
+
+        client.open("sheet")
+        client.open("sheet")
+        with self.assertRaises(APIError):
+            client.open("sheet")
+
+        self.assertEqual(client.total_calls, 3)
+
+    def test_not_found(self):
+        with self.assertRaises(SpreadsheetNotFound):
+            FakeClient().open("missing")
@@ -0,0 +1,89 @@
+import copy
+import csv
+import json
+import os
+import tempfile
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import FileBackendTestData as test_data
+
+import scheduler.file_backend as file_backend
+import scheduler.generate_rides as generate_rides
+
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.RunContext import RunContext
+
+
+def write_rows(filename, rows):
+    """
+    Writes rows to a file in the format of its extension
+    """
+
+    extension = os.path.splitext(filename)[1]
+
+    with open(filename, "w", newline="") as output:
+        if extension == ".csv":
+            csv.writer(output).writerows(rows)
+        elif extension == ".jsonl":
+            for row in rows:
+                output.write(json.dumps(row) + "\n")
+        else:
+            json.dump(rows, output)
+
+
+class FileBackendTest(TestCase):
+    """
+    Tests file_backend.py
+    """
+
+    members_from_files_test_data = test_data.members_from_files_test_data
+
+    @params(*members_from_files_test_data)
+    def test_members_from_files(self, extension, riders_check, drivers_check,
+                                cars_check):
+        with tempfile.TemporaryDirectory() as directory:
+            config = copy.deepcopy(Configuration.config())
+            config["mcc"]["days_enabled"] = ["TUESDAY"]
+            config["file_backend"] = {
+                "responses_file":
+                    os.path.join(directory, "responses" + extension),
+                "dues_file":
+                    os.path.join(directory, "dues" + extension),
+                "output_file":
+                    os.path.join(directory, "schedule.json"),
+            }
+            context = RunContext(config)
+
+            write_rows(config["file_backend"]["responses_file"],
+                       test_data.responses)
+            write_rows(config["file_backend"]["dues_file"], test_data.dues)
+
+            riders, drivers = file_backend.members_from_files(context)
+
+            self.assertEqual([(r.name, r.is_dues_paying) for r in riders],
+                             riders_check)
+            self.assertEqual(
+                [(d.name, d.is_dues_paying, d.seats) for d in drivers],
+                drivers_check)
+
+            with context.activate():
+                schedule = generate_rides.generate_rides(riders,
+                                                         drivers,
+                                                         seed=1)
+                file_backend.write_to_file(schedule)
+
+            with open(config["file_backend"]["output_file"]) as output:
+                days = json.load(output)
+
+        self.assertEqual([day["name"] for day in days], ["TUESDAY"])
+        self.assertEqual(
+            {
+                car["driver"]: [rider["name"] for rider in car["riders"]]
+                for car in days[0]["cars"]
+            }, cars_check)
+        self.assertEqual(days[0]["cars"][0]["departure_time"], "06:00 PM")
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            list(file_backend.read_rows("responses.txt"))
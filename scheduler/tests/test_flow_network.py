@@ -0,0 +1,26 @@
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import FlowNetworkTestData as test_data
+
+from scheduler.classes.FlowNetwork import FlowNetwork
+
+
+class FlowNetworkTest(TestCase):
+    """
+    Tests FlowNetwork
+    """
+
+    min_cost_max_flow_test_data = test_data.min_cost_max_flow_test_data
+
+    @params(min_cost_max_flow_test_data[0], min_cost_max_flow_test_data[1])
+    def test_min_cost_max_flow(self, node_count, edges, flow_check, cost_check,
+                               edge_flows_check):
+        network = FlowNetwork(node_count)
+        edge_ids = [network.add_edge(*e) for e in edges]
+
+        flow, cost = network.min_cost_max_flow(0, node_count - 1)
+
+        self.assertEqual(flow, flow_check)
+        self.assertEqual(cost, cost_check)
+        self.assertEqual([network.flow(e) for e in edge_ids], edge_flows_check)
@@ -6,9 +6,11 @@ from test_data import GenerateRidesTestData as test_data
 
 import scheduler.generate_rides as generate_rides
 
+from scheduler.classes.Configuration import Configuration
 from scheduler.classes.Driver import Driver
 from scheduler.classes.Member import Member
 from scheduler.classes.Rider import Rider
+from scheduler.classes.Schedule import Schedule
 import scheduler.classes.Day as Day
 
 
@@ -22,6 +24,10 @@ class GenerateRidesTest(TestCase):
     are_location_compatible_test_data = test_data.are_location_compatible_test_data
     time_compatibility_test_data = test_data.time_compatibility_test_data
     find_best_match_test_data = test_data.find_best_match_test_data
+    match_riders_test_data = test_data.match_riders_test_data
+    generate_rides_test_data = test_data.generate_rides_test_data
+    most_constrained_test_data = test_data.most_constrained_test_data
+    count_schedule_test_data = test_data.count_schedule_test_data
 
     @params(check_in_days_test_data[0], check_in_days_test_data[1])
     def test_check_in_days(self, member, day, check):
@@ -65,3 +71,77 @@ class GenerateRidesTest(TestCase):
             members_to_class(members=drivers, is_driver=True),
             Day.from_str(day))
         self.assertEqual(result.name, check)
+
+    @params(match_riders_test_data[0])
+    def test_match_riders(self, riders, drivers, day, check):
+        for (engine, cars_check) in check.items():
+            drivers_list = members_to_class(members=drivers, is_driver=True)
+            seats = {d: d.seats_remaining for d in drivers_list}
+
+            cars = generate_rides.get_engine(engine)(
+                members_to_class(members=riders), drivers_list,
+                Day.from_str(day), seats)
+
+            result = {
+                car.driver.name: [r.name for r in car.riders] for car in cars
+            }
+            self.assertEqual(result, cars_check)
+
+    @params(most_constrained_test_data[0])
+    def test_match_riders_most_constrained(self, riders, drivers, day, check):
+        drivers_list = members_to_class(members=drivers, is_driver=True)
+        seats = {d: d.seats_remaining for d in drivers_list}
+
+        cars = generate_rides.match_riders_most_constrained(
+            members_to_class(members=riders), drivers_list, Day.from_str(day),
+            seats)
+
+        result = {car.driver.name: [r.name for r in car.riders] for car in cars}
+        self.assertEqual(result, check)
+
+    @params(generate_rides_test_data[0])
+    def test_generate_rides_workers(self, riders, drivers, days, seed):
+        riders = members_to_class(members=riders)
+        drivers = members_to_class(members=drivers, is_driver=True)
+
+        mcc_config = Configuration.config("mcc")
+        saved = dict(mcc_config)
+
+        try:
+            mcc_config["days_enabled"] = days
+            mcc_config["seed"] = seed
+
+            schedules = list()
+            for workers in (1, len(days)):
+                mcc_config["workers"] = workers
+                schedules.append([(day, [
+                    (car.driver, car.riders) for car in cars
+                ]) for (day,
+                        cars) in generate_rides.generate_rides(riders, drivers)
+                                 ])
+        finally:
+            mcc_config.clear()
+            mcc_config.update(saved)
+
+        self.assertEqual(schedules[0], schedules[1])
+        self.assertEqual([day for (day, _) in schedules[0]],
+                         [Day.from_str(day) for day in days])
+
+    @params(count_schedule_test_data[0])
+    def test_count_schedule(self, riders, drivers, cars, check):
+        riders = members_to_class(members=riders)
+        drivers = members_to_class(members=drivers, is_driver=True)
+        riders_by_name = {r.name: r for r in riders}
+        drivers_by_name = {d.name: d for d in drivers}
+
+        schedule = Schedule()
+        for (day, day_cars) in cars.items():
+            schedule.add_day(Day.from_str(day))
+            for (driver, names) in day_cars.items():
+                for name in names:
+                    schedule.add_rider(Day.from_str(day),
+                                       drivers_by_name[driver],
+                                       riders_by_name[name])
+
+        self.assertEqual(
+            generate_rides.count_schedule(riders, drivers, schedule), check)
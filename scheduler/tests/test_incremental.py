@@ -0,0 +1,74 @@
+from datetime import date
+import os
+import tempfile
+from unittest import TestCase
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import IncrementalTestData as test_data
+
+import scheduler.incremental as incremental
+
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.Schedule import Schedule
+import scheduler.classes.Day as Day
+
+
+class IncrementalTest(TestCase):
+    """
+    Tests incremental.py
+    """
+
+    rematch_test_data = test_data.rematch_test_data
+
+    @params(*rematch_test_data)
+    def test_rematch(self, old_riders, new_riders, drivers, previous, check):
+        old_riders = {r.name: r for r in members_to_class(members=old_riders)}
+        new_riders = members_to_class(members=new_riders)
+        drivers = members_to_class(members=drivers, is_driver=True)
+        drivers_by_name = {d.name: d for d in drivers}
+
+        schedule = Schedule()
+        for (name, riders) in previous.items():
+            for rider in riders:
+                schedule.add_rider(Day.DayName.TUESDAY, drivers_by_name[name],
+                                   old_riders[rider])
+
+        mcc_config = Configuration.config("mcc")
+        saved = dict(mcc_config)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "state.json")
+
+            try:
+                mcc_config["days_enabled"] = ["TUESDAY"]
+
+                incremental.save_state(filename,
+                                       list(old_riders.values()),
+                                       drivers,
+                                       schedule,
+                                       week_start=date(2024, 1, 8))
+                state = incremental.load_state(filename)
+                self.assertEqual(incremental.get_week_start(state),
+                                 date(2024, 1, 8))
+
+                results = dict()
+                for engine in ("greedy", "flow"):
+                    mcc_config["engine"] = engine
+                    results[engine] = incremental.rematch(state,
+                                                          new_riders,
+                                                          drivers,
+                                                          seed=1)
+            finally:
+                mcc_config.clear()
+                mcc_config.update(saved)
+
+            self.assertIsNone(
+                incremental.load_state(os.path.join(directory, "none.json")))
+
+        for result in results.values():
+            self.assertEqual(
+                {
+                    car.driver.name: sorted(r.name for r in car.riders)
+                    for car in result.cars(Day.DayName.TUESDAY)
+                }, check)
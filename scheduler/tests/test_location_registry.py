@@ -0,0 +1,90 @@
+import os
+import tempfile
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import LocationRegistryTestData as test_data
+
+import scheduler.generate_rides as generate_rides
+
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.Driver import Driver
+from scheduler.classes.LocationRegistry import LocationRegistry
+from scheduler.classes.Rider import Rider
+import scheduler.classes.Day as Day
+
+
+class LocationRegistryTest(TestCase):
+    """
+    Tests LocationRegistry
+    """
+
+    parse_test_data = test_data.parse_test_data
+
+    @params(*parse_test_data)
+    def test_parse(self, locations, label, check):
+        registry = LocationRegistry(locations)
+
+        location = registry.parse(label)
+
+        self.assertEqual(registry.to_str(location), check)
+        self.assertEqual(registry.get_id(check), location)
+        self.assertEqual(list(locations.keys()), registry.names)
+
+    def test_unknown_location(self):
+        registry = LocationRegistry({"NORTH": ["North Campus"]})
+
+        with self.assertLogs("scheduler.classes.LocationRegistry", "WARNING"):
+            self.assertIsNone(registry.parse("Mars"))
+        self.assertRaises(ValueError, registry.get_id, "Mars")
+
+    def test_configured_locations(self):
+        registry = LocationRegistry.get_instance()
+
+        self.assertEqual(registry.get_id("NORTH"),
+                         registry.parse("North Campus (Pierpont Commons)"))
+        self.assertEqual(registry.get_id("CENTRAL"),
+                         registry.parse("Central Campus (The Cube)"))
+
+    def test_many_locations(self):
+        registry = LocationRegistry(
+            {"STOP {}".format(i): list() for i in range(100)})
+        day = Day.DayName.TUESDAY
+
+        rider = Rider(
+            "r", "r@umich.edu", "",
+            [Day.DayInfo(day, [1080], [registry.get_id("STOP 3"), 97])], True)
+        driver = Driver(
+            "d", "d@umich.edu", "",
+            [Day.DayInfo(day, [1080], [registry.get_id("STOP 97")])], True,
+            "car", 4)
+        other = Driver("o", "o@umich.edu", "",
+                       [Day.DayInfo(day, [1080], [registry.get_id("STOP 98")])],
+                       True, "car", 4)
+
+        self.assertEqual(rider.get_location_mask(day),
+                         registry.get_mask(["STOP 3", "STOP 97"]))
+        self.assertTrue(
+            generate_rides.are_location_compatible(rider, driver, day))
+        self.assertFalse(
+            generate_rides.are_location_compatible(rider, other, day))
+
+    def test_reset(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "club.toml")
+            with open(filename, "w") as club_config:
+                club_config.write('[locations]\nWEST = ["West Lot"]\n')
+
+            try:
+                Configuration.reset(filename)
+                LocationRegistry.reset()
+
+                registry = LocationRegistry.get_instance()
+                self.assertEqual(registry.names, ["WEST"])
+                self.assertEqual(registry.parse("West Lot"), 0)
+            finally:
+                Configuration.reset()
+                LocationRegistry.reset()
+
+        self.assertEqual(LocationRegistry.get_instance().names,
+                         ["NORTH", "CENTRAL"])
@@ -0,0 +1,88 @@
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+import tempfile
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import LogTestData as test_data
+
+import scheduler.log as log
+
+
+def log_in_worker(message: str) -> int:
+    logging.getLogger("scheduler.tests.test_log").info(message)
+    return os.getpid()
+
+
+class LogTest(TestCase):
+    """
+    Tests log.py
+    """
+
+    configure_logging_test_data = test_data.configure_logging_test_data
+
+    def setUp(self):
+        self.root_level = logging.getLogger().level
+
+    def tearDown(self):
+        log.stop_logging()
+        logging.getLogger().setLevel(self.root_level)
+
+    @params(*configure_logging_test_data)
+    def test_configure_logging(self, level, check):
+        logger = logging.getLogger("scheduler.tests.test_log")
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.log")
+
+            log.configure_logging({"level": level, "filename": filename})
+            logger.debug("debug message")
+            logger.info("info message")
+            logger.warning("warning message")
+            log.stop_logging()
+
+            with open(filename) as log_file:
+                messages = [line.split(" - ")[-1] for line in log_file]
+
+        self.assertEqual([m.strip() for m in messages], check)
+
+    def test_rotate_on_start(self):
+        logger = logging.getLogger("scheduler.tests.test_log")
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.log")
+
+            for run in ("first run", "second run"):
+                log.configure_logging({"filename": filename, "backup_count": 2})
+                logger.warning(run)
+                log.stop_logging()
+
+            with open(filename) as log_file:
+                self.assertIn("second run", log_file.read())
+            with open(filename + ".1") as log_file:
+                self.assertIn("first run", log_file.read())
+
+    def test_get_level(self):
+        self.assertEqual(log.get_level("debug"), logging.DEBUG)
+        self.assertEqual(log.get_level(logging.ERROR), logging.ERROR)
+        self.assertRaises(ValueError, log.get_level, "LOUD")
+
+    def test_worker_logging(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.log")
+
+            log.configure_logging({"filename": filename})
+            with ProcessPoolExecutor(
+                    max_workers=2,
+                    initializer=log.configure_worker_logging,
+                    initargs=(log.get_worker_queue(),
+                              logging.getLogger().level)) as executor:
+                pids = list(executor.map(log_in_worker, ["worker message"] * 4))
+            log.stop_logging()
+
+            with open(filename) as log_file:
+                messages = [line.split(" - ")[-1].strip() for line in log_file]
+
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(messages, ["worker message"] * 4)
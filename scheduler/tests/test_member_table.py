@@ -0,0 +1,127 @@
+import pickle
+from unittest import TestCase
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import GenerateRidesTestData, MemberTableTestData as test_data
+
+import scheduler.generate_rides as generate_rides
+
+from scheduler.classes.MemberTable import MemberTable
+from scheduler.classes.Rider import Rider
+import scheduler.classes.Day as Day
+
+
+class MemberTableTest(TestCase):
+    """
+    Tests MemberTable
+    """
+
+    views_test_data = test_data.views_test_data
+    many_values_test_data = test_data.many_values_test_data
+    match_riders_test_data = GenerateRidesTestData.match_riders_test_data
+
+    @params(views_test_data[0])
+    def test_views(self, riders, drivers, days):
+        riders = members_to_class(members=riders)
+        drivers = members_to_class(members=drivers, is_driver=True)
+        days = [Day.from_str(day) for day in days]
+
+        table = MemberTable.from_members(riders, drivers, days)
+
+        self.assertEqual(len(table), len(riders) + len(drivers))
+
+        for (member, view) in zip(riders + drivers,
+                                  table.riders() + table.drivers()):
+            self.assertEqual(view.name, member.name)
+            for day in days:
+                self.assertEqual(view.in_day(day), member.in_day(day))
+                self.assertEqual(sorted(view.get_times(day)),
+                                 sorted(member.get_times(day)))
+                self.assertEqual(set(view.get_locations(day)),
+                                 set(member.get_locations(day)))
+
+        for (driver, view) in zip(drivers, table.drivers()):
+            self.assertEqual(view.seats, driver.seats)
+            self.assertEqual(view.seats_remaining, driver.seats)
+
+    @params(*many_values_test_data)
+    def test_many_values(self, members, times, locations):
+        riders = [
+            Rider("r{}".format(i), "r{}@umich.edu".format(i), "", [
+                Day.DayInfo(Day.DayName.MONDAY,
+                            [t for t in range(times) if t % members == i],
+                            [l for l in range(locations) if l % members == i])
+            ], True) for i in range(members)
+        ]
+        table = MemberTable.from_members(riders, list(), [Day.DayName.MONDAY])
+
+        for (rider, view) in zip(riders, table.riders()):
+            day = rider.days[0]
+            self.assertEqual(view.get_times(Day.DayName.MONDAY), day.times)
+            self.assertEqual(view.get_locations(Day.DayName.MONDAY),
+                             day.locations)
+            self.assertEqual(view.get_time_mask(Day.DayName.MONDAY),
+                             day.time_mask)
+            self.assertEqual(view.get_location_mask(Day.DayName.MONDAY),
+                             day.location_mask)
+            self.assertEqual(view.get_times(Day.DayName.TUESDAY), list())
+
+    @params(match_riders_test_data[0])
+    def test_match_riders(self, riders, drivers, day, check):
+        table = MemberTable.from_members(
+            members_to_class(members=riders),
+            members_to_class(members=drivers, is_driver=True),
+            [Day.from_str(day)])
+
+        for (engine, cars_check) in check.items():
+            seats = {d: d.seats_remaining for d in table.drivers()}
+            cars = generate_rides.get_engine(engine)(table.riders(),
+                                                     table.drivers(),
+                                                     Day.from_str(day), seats)
+
+            result = {
+                car.driver.name: [r.name for r in car.riders] for car in cars
+            }
+            self.assertEqual(result, cars_check)
+
+    @params(views_test_data[0])
+    def test_shared_masks(self, riders, drivers, days):
+        riders = members_to_class(members=riders)
+        drivers = members_to_class(members=drivers, is_driver=True)
+        days = [Day.from_str(day) for day in days]
+
+        # every member answers twice, the second row keeps the first's masks
+        table = MemberTable.from_members(riders * 2, drivers * 2, days)
+
+        members = riders + drivers
+        self.assertEqual(
+            len(table.times),
+            len({0} | {m.get_time_mask(day) for m in members for day in days}))
+        self.assertEqual(
+            len(table.locations),
+            len({0} |
+                {m.get_location_mask(day) for m in members for day in days}))
+
+        views = table.riders()
+        for (first, second) in zip(views, views[len(riders):]):
+            for day in days:
+                self.assertIs(first.get_time_mask(day),
+                              second.get_time_mask(day))
+                self.assertIs(first.get_locations(day),
+                              second.get_locations(day))
+
+        for view in table.riders() + table.drivers():
+            self.assertFalse(hasattr(view, "__dict__"))
+
+        views[0].selection_weight = 2.0
+        self.assertEqual(views[0].selection_weight, 2.0)
+        self.assertEqual(views[1].selection_weight, 1.0)
+
+        # views are sent to worker processes
+        (rider,
+         driver) = pickle.loads(pickle.dumps((views[0], table.drivers()[0])))
+        self.assertEqual((rider.name, rider.selection_weight),
+                         (views[0].name, 2.0))
+        self.assertEqual(rider.get_times(days[0]), views[0].get_times(days[0]))
+        self.assertEqual(driver.seats_remaining, driver.seats)
@@ -0,0 +1,63 @@
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import RowStreamTestData as test_data
+
+from scheduler.classes.RowStream import RowStream
+
+
+class FakeWorksheet:
+    """
+    Worksheet answering get() like the Sheets API, trailing empty rows left out
+    """
+
+    def __init__(self, values, row_count, fail_at=None):
+        self.values = values
+        self.row_count = row_count
+        self.fail_at = fail_at
+        self.ranges = list()
+
+    def get(self, range_name):
+        self.ranges.append(range_name)
+        if range_name == self.fail_at:
+            raise IOError("quota exceeded")
+
+        start, end = [int(row) for row in range_name.split(":")]
+        page = self.values[start - 1:end]
+
+        while page and not page[-1]:
+            page.pop()
+
+        return page
+
+
+class RowStreamTest(TestCase):
+    """
+    Tests RowStream
+    """
+
+    stream_test_data = test_data.stream_test_data
+
+    @params(*stream_test_data)
+    def test_stream(self, values, row_count, page_rows, width, check):
+        worksheet = FakeWorksheet(values, row_count)
+
+        rows = list(
+            RowStream(worksheet, width, page_rows=page_rows, prefetch_pages=1))
+
+        # empty rows at the end of a page are left out by the API
+        self.assertEqual(
+            [row for row in rows if any(row)],
+            [row + [""] * (width - len(row)) for row in values if row])
+        self.assertEqual(worksheet.ranges, check)
+
+    def test_error(self):
+        worksheet = FakeWorksheet([["h"], ["a"], ["b"]], 100, fail_at="3:4")
+        stream = RowStream(worksheet, 1, page_rows=2)
+
+        rows = list()
+        with self.assertRaises(IOError):
+            for row in stream:
+                rows.append(row)
+
+        self.assertEqual(rows, [["h"], ["a"]])
@@ -0,0 +1,93 @@
+import copy
+import threading
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import RunContextTestData as test_data
+
+import scheduler.generate_rides as generate_rides
+
+from scheduler.classes.Configuration import Configuration
+from scheduler.classes.LocationRegistry import LocationRegistry
+from scheduler.classes.RunContext import RunContext
+from scheduler.classes.RunMetrics import RunMetrics
+import scheduler.classes.Day as Day
+
+
+class RunContextTest(TestCase):
+    """
+    Tests RunContext
+    """
+
+    concurrent_runs_test_data = test_data.concurrent_runs_test_data
+
+    def get_context(self, name, days_enabled, locations):
+        config = copy.deepcopy(Configuration.config())
+        config["mcc"]["days_enabled"] = days_enabled
+        config["locations"] = locations
+
+        return RunContext(config, name=name)
+
+    def test_default_context(self):
+        self.assertIsNone(RunContext.current())
+        self.assertIs(LocationRegistry.get_instance(),
+                      LocationRegistry.get_instance())
+
+        context = self.get_context("club", ["MONDAY"], {"WEST": []})
+        with context.activate():
+            self.assertIs(RunContext.current(), context)
+            self.assertEqual(Configuration.config("mcc.days_enabled"),
+                             ["MONDAY"])
+            self.assertEqual(LocationRegistry.get_instance().names, ["WEST"])
+
+            metrics = RunMetrics.reset()
+            self.assertIs(RunMetrics.get_instance(), metrics)
+
+        self.assertIsNone(RunContext.current())
+        self.assertIsNot(RunMetrics.get_instance(), metrics)
+        self.assertEqual(LocationRegistry.get_instance().names,
+                         ["NORTH", "CENTRAL"])
+
+    @params(concurrent_runs_test_data[0])
+    def test_concurrent_runs(self, *runs):
+        contexts = [self.get_context(*run) for run in runs]
+        barrier = threading.Barrier(len(contexts))
+        results = dict()
+
+        def run(context):
+            with context.activate():
+                RunMetrics.reset()
+                # both runs are inside their context at the same time
+                barrier.wait()
+                schedule = generate_rides.generate_rides(list(), list(), seed=1)
+                results[context.name] = (
+                    [Day.to_str(day) for (day, _) in schedule],
+                    LocationRegistry.get_instance().names,
+                    list(RunMetrics.get_instance().phases),
+                )
+
+        threads = [
+            threading.Thread(target=run, args=(context,))
+            for context in contexts
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for (name, days_enabled, locations) in runs:
+            self.assertEqual(results[name],
+                             (days_enabled, list(locations), days_enabled))
+
+    def test_context_argument(self):
+        context = self.get_context("club", ["SUNDAY"], dict())
+
+        schedule = generate_rides.generate_rides(list(),
+                                                 list(),
+                                                 seed=1,
+                                                 context=context)
+
+        self.assertEqual([day for (day, _) in schedule], [Day.DayName.SUNDAY])
+        self.assertEqual(list(context.instance(RunMetrics, RunMetrics).phases),
+                         ["SUNDAY"])
+        self.assertIsNone(RunContext.current())
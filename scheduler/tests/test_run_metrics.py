@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import RunMetricsTestData as test_data
+
+from scheduler.classes.RunMetrics import RunMetrics
+
+
+class RunMetricsTest(TestCase):
+    """
+    Tests RunMetrics
+    """
+
+    phase_test_data = test_data.phase_test_data
+
+    @params(phase_test_data[0])
+    def test_phase(self, phases, check):
+        metrics = RunMetrics()
+
+        for (outer, inner) in phases:
+            with metrics.phase(outer):
+                for name in inner:
+                    with metrics.phase(name):
+                        pass
+
+        self.assertEqual(
+            [(name, calls) for (name, (_, calls)) in metrics.phases.items()],
+            check)
+
+        for (name, (seconds, _)) in metrics.phases.items():
+            self.assertGreaterEqual(seconds, 0)
+
+    def test_report(self):
+        metrics = RunMetrics()
+
+        with metrics.phase("match"):
+            metrics.add_time("TUESDAY", 1.5)
+        metrics.count("riders", 3)
+        metrics.count("riders", 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "metrics.json")
+            metrics.write(filename)
+
+            with open(filename) as report_file:
+                report = json.load(report_file)
+
+        self.assertEqual(report["phases"]["match/TUESDAY"], {
+            "seconds": 1.5,
+            "calls": 1
+        })
+        self.assertEqual(report["counters"], {"riders": 5})
+        self.assertIn("TUESDAY", metrics.summary())
+
+    def test_get_instance(self):
+        metrics = RunMetrics.reset()
+
+        self.assertIs(RunMetrics.get_instance(), metrics)
+        self.assertIsNot(RunMetrics.reset(), metrics)
@@ -0,0 +1,99 @@
+from datetime import date, datetime, timedelta
+from unittest import TestCase
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import RunStoreTestData as test_data
+
+from scheduler.classes.Car import Car
+from scheduler.classes.RunStore import RunStore
+import scheduler.classes.Day as Day
+
+
+class RunStoreTest(TestCase):
+    """
+    Tests RunStore
+    """
+
+    record_run_test_data = test_data.record_run_test_data
+
+    @params(*record_run_test_data)
+    def test_record_run(self, riders, driver, runs, week_starts, since,
+                        riders_check, drivers_check):
+        riders = {r.name: r for r in members_to_class(members=riders)}
+        driver = members_to_class(member=driver, is_driver=True)
+        since = datetime.strptime(since, "%Y-%m-%d").date() if since else None
+
+        store = RunStore(":memory:")
+
+        for (run, week_start) in zip(runs, week_starts):
+            schedule = list()
+            for (day, names) in run:
+                car = Car(driver)
+                car.riders = [riders[name] for name in names]
+                schedule.append((Day.from_str(day), [car]))
+
+            store.record_run(list(riders.values()), [driver],
+                             schedule,
+                             club="mcc",
+                             week_start=datetime.strptime(
+                                 week_start, "%Y-%m-%d").date())
+
+        self.assertEqual(store.rides_per_rider(since), riders_check)
+        self.assertEqual(store.riders_per_driver(since), drivers_check)
+
+        self.assertEqual([run[3] for run in store.runs()],
+                         list(reversed(week_starts)))
+
+        rides = store.member_rides("R1@umich.edu", since)
+        self.assertEqual(len(rides), riders_check[0][2])
+        self.assertEqual({ride[2] for ride in rides}, {"rider"})
+        self.assertEqual({ride[3] for ride in rides}, {"d"})
+
+        store.close()
+
+    def test_runs(self):
+        store = RunStore(":memory:")
+
+        first = store.record_run(list(), list(), list(), club="a")
+        second = store.record_run(list(), list(), list(), club="b")
+
+        self.assertEqual([run[0] for run in store.runs()], [second, first])
+        self.assertEqual([run[2] for run in store.runs(limit=1)], ["b"])
+        self.assertEqual(store.runs(since=date(9999, 1, 1)), list())
+
+        store.close()
+
+    def test_record_week_again(self):
+        (riders, driver, runs) = test_data.record_run_test_data[0][:3]
+        riders = {r.name: r for r in members_to_class(members=riders)}
+        driver = members_to_class(member=driver, is_driver=True)
+
+        store = RunStore(":memory:")
+
+        # a rematch of the week replaces its run, other clubs keep theirs
+        for (club, run) in (("mcc", runs[0]), ("mcc", runs[1]), ("other",
+                                                                 runs[1])):
+            schedule = list()
+            for (day, names) in run:
+                car = Car(driver)
+                car.riders = [riders[name] for name in names]
+                schedule.append((Day.from_str(day), [car]))
+
+            store.record_run(list(riders.values()), [driver],
+                             schedule,
+                             club=club,
+                             started=datetime(2024, 1, 3, 12))
+
+        self.assertEqual([(run[2], run[3]) for run in store.runs()],
+                         [("other", "2024-01-08"), ("mcc", "2024-01-08")])
+
+        rides = store.member_rides("d@umich.edu")
+        self.assertEqual(len(rides), 2 * len(runs[1]))
+        self.assertEqual(
+            sorted({(ride[0], ride[1]) for ride in rides}),
+            sorted({((date(2024, 1, 8) +
+                      timedelta(days=Day.from_str(day).value)).isoformat(), day)
+                    for (day, _) in runs[1]}))
+
+        store.close()
@@ -0,0 +1,50 @@
+from unittest import TestCase
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import ScheduleTestData as test_data
+
+from scheduler.classes.Schedule import Schedule
+import scheduler.classes.Day as Day
+
+
+class ScheduleTest(TestCase):
+    """
+    Tests Schedule
+    """
+
+    schedule_test_data = test_data.schedule_test_data
+
+    @params(schedule_test_data[0])
+    def test_schedule(self, riders, drivers, rides, order_check,
+                      assignments_check):
+        riders = {r.name: r for r in members_to_class(members=riders)}
+        drivers = {
+            d.name: d for d in members_to_class(members=drivers, is_driver=True)
+        }
+
+        schedule = Schedule()
+        for (day, driver, rider) in rides:
+            schedule.add_rider(Day.from_str(day), drivers[driver],
+                               riders[rider])
+
+        result = [(Day.to_str(day), [car.driver.name
+                                     for car in cars])
+                  for (day, cars) in schedule]
+        self.assertEqual(result, order_check)
+        self.assertEqual(len(schedule), len(order_check))
+        self.assertEqual(Day.to_str(schedule[0][0]), order_check[0][0])
+
+        for (name, check) in assignments_check.items():
+            member = riders.get(name, drivers.get(name))
+            result = {
+                Day.to_str(day): car.driver.name
+                for (day, car) in schedule.get_assignments(member).items()
+            }
+            self.assertEqual(result, check)
+
+        tuesday = Day.from_str("TUESDAY")
+        self.assertEqual(
+            [r.name for r in schedule.get_car(tuesday, drivers["a"]).riders],
+            ["r1", "r2"])
+        self.assertIsNone(schedule.get_car(tuesday, drivers["c"]))
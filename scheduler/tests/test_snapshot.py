@@ -0,0 +1,95 @@
+import os
+import tempfile
+from unittest import TestCase
+from nose2.tools import params
+
+from util import members_to_class
+from test_data import SnapshotTestData as test_data
+
+import scheduler.snapshot as snapshot
+
+from scheduler.classes.MemberTable import MemberTable
+import scheduler.classes.Day as Day
+
+
+class SnapshotTest(TestCase):
+    """
+    Tests snapshot.py
+    """
+
+    round_trip_test_data = test_data.round_trip_test_data
+
+    def get_table(self):
+        riders, drivers, days = self.round_trip_test_data[0]
+        return MemberTable.from_members(
+            members_to_class(members=riders),
+            members_to_class(members=drivers, is_driver=True),
+            [Day.from_str(day) for day in days])
+
+    @params(*round_trip_test_data)
+    def test_round_trip(self, riders, drivers, days):
+        riders = members_to_class(members=riders)
+        drivers = members_to_class(members=drivers, is_driver=True)
+        days = [Day.from_str(day) for day in days]
+        table = MemberTable.from_members(riders, drivers, days)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "members.snapshot")
+            snapshot.save_snapshot(filename, table, "revision")
+            loaded = snapshot.load_snapshot(filename, "revision")
+
+        self.assertEqual(len(loaded), len(table))
+        self.assertEqual(loaded.days, days)
+
+        for (member, view) in zip(riders + drivers,
+                                  loaded.riders() + loaded.drivers()):
+            self.assertEqual(view.name, member.name)
+            self.assertEqual(view.email, member.email or "")
+            self.assertEqual(view.is_dues_paying, bool(member.is_dues_paying))
+            for day in days:
+                self.assertEqual(view.in_day(day), member.in_day(day))
+                self.assertEqual(sorted(view.get_times(day)),
+                                 sorted(member.get_times(day)))
+                self.assertEqual(set(view.get_locations(day)),
+                                 set(member.get_locations(day)))
+
+        for (driver, view) in zip(drivers, loaded.drivers()):
+            self.assertEqual(view.seats, driver.seats)
+            self.assertEqual(view.seats_remaining, driver.seats)
+
+    def test_other_revision(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "members.snapshot")
+            snapshot.save_snapshot(filename, self.get_table(), "revision")
+
+            self.assertIsNone(snapshot.load_snapshot(filename, "other"))
+
+    def test_damaged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "members.snapshot")
+            snapshot.save_snapshot(filename, self.get_table(), "revision")
+
+            with open(filename, "r+b") as snapshot_file:
+                snapshot_file.seek(-1, os.SEEK_END)
+                last = snapshot_file.read(1)
+                snapshot_file.seek(-1, os.SEEK_END)
+                snapshot_file.write(bytes([last[0] ^ 0xFF]))
+
+            self.assertIsNone(snapshot.load_snapshot(filename, "revision"))
+
+            with open(filename, "wb") as snapshot_file:
+                snapshot_file.write(b"not a snapshot")
+
+            self.assertIsNone(snapshot.load_snapshot(filename, "revision"))
+
+    def test_missing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "members.snapshot")
+
+            self.assertIsNone(snapshot.load_snapshot(filename, "revision"))
+
+    def test_get_revision(self):
+        self.assertEqual(snapshot.get_revision("file", [1, 2], {"a": 1}),
+                         snapshot.get_revision("file", [1, 2], {"a": 1}))
+        self.assertNotEqual(snapshot.get_revision("file", [1, 2]),
+                            snapshot.get_revision("file", [1, 3]))
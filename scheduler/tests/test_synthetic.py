@@ -0,0 +1,65 @@
+import contextlib
+import io
+from unittest import TestCase
+from nose2.tools import params
+
+from test_data import SyntheticTestData as test_data
+
+import scheduler.benchmark as benchmark
+import scheduler.synthetic as synthetic
+
+
+class SyntheticTest(TestCase):
+    """
+    Tests synthetic.py and benchmark.py
+    """
+
+    generate_population_test_data = test_data.generate_population_test_data
+    find_regressions_test_data = test_data.find_regressions_test_data
+
+    @params(generate_population_test_data[0])
+    def test_generate_population(self, members, seed, seats):
+        riders, drivers = synthetic.generate_population(members,
+                                                        seed=seed,
+                                                        seats=seats)
+        again = synthetic.generate_population(members, seed=seed, seats=seats)
+
+        self.assertEqual(len(riders) + len(drivers), members)
+        self.assertEqual([(r.email, repr(r.days)) for r in riders],
+                         [(r.email, repr(r.days)) for r in again[0]])
+
+        for member in riders + drivers:
+            self.assertTrue(member.days)
+            for day in member.days:
+                self.assertIn(day.day, synthetic.DEFAULT_DAYS)
+                self.assertTrue(day.locations)
+                self.assertTrue(day.times)
+
+        for driver in drivers:
+            self.assertIn(driver.seats, seats)
+            for day in driver.days:
+                self.assertEqual(len(day.times), 1)
+
+    @params(find_regressions_test_data[0], find_regressions_test_data[1])
+    def test_find_regressions(self, results, baseline, threshold, check):
+        regressions = benchmark.find_regressions({"results": results},
+                                                 {"results": baseline},
+                                                 threshold, threshold)
+
+        self.assertEqual(regressions, check)
+
+    def test_run_benchmarks(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report = benchmark.run_benchmarks([50], seed=1)
+
+        self.assertIn("50 members", output.getvalue())
+        self.assertIn("generate_rides", output.getvalue())
+
+        names = [result["benchmark"] for result in report["results"]]
+        self.assertIn("find_best_match", names)
+        self.assertIn("generate_rides", names)
+
+        for result in report["results"]:
+            self.assertEqual(result["members"], 50)
+            self.assertGreater(result["peak_memory_bytes"], 0)
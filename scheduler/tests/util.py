@@ -1,6 +1,7 @@
 """
 Test utilities
 """
+from scheduler.classes.LocationRegistry import LocationRegistry
 from scheduler.classes.Member import Member
 from scheduler.classes.Driver import Driver
 from scheduler.classes.Rider import Rider
@@ -23,11 +24,16 @@ def convert_days(days: list) -> list:
     """
 
     dayInfos = list()
+    registry = LocationRegistry.get_instance()
 
     for d in days:
+        locations = get_with_check(d, "locations")
+        if locations is not None:
+            locations = [registry.get_id(l) for l in locations]
+
         day = Day.DayInfo(day=Day.from_str(get_with_check(d, "day")),
                           times=get_with_check(d, "departure_times"),
-                          locations=get_with_check(d, "locations"))
+                          locations=locations)
 
         dayInfos.append(day)
 
@@ -20,6 +20,7 @@ setup(
     install_requires=[
         "gspread", "gspread-formatting", "oauth2client", "toml", "nose2"
     ],
+    extras_require={"numpy": ["numpy"]},
     include_package_data=True,
     entry_points={"console_scripts": ["scheduler = scheduler.__main__:main",]},
     test_suite="nose2.collector.collector",